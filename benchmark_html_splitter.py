@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark the lxml header sectioniser against LangChain's HTMLHeaderTextSplitter
+
+A corpus of Docling-style HTML exports (nested headers, paragraphs, lists
+and tables, mixed Chinese/English text) is generated into a temporary
+directory. Both sectionisers split every file; the benchmark reports
+sections per second and checks that they produce the same Documents.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from langchain.text_splitter import HTMLHeaderTextSplitter
+
+from rag_poc.document_processing.html_splitter import LxmlHeaderSectioniser
+
+HEADERS = [(f"h{level}", f"Header {level}") for level in range(1, 7)]
+
+WORDS = ["delivery", "pipeline", "maturity", "model", "software", "quality", "prompt", "agent",
+         "软件", "交付", "成熟度", "模型", "实践", "自动化", "评估", "流程"]
+
+
+def sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30))) + "."
+
+
+def generate_document(rng: random.Random, pages: int) -> str:
+    """Generate an HTML export of roughly `pages` pages"""
+    parts = ["<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Export</title>",
+             "<style>table { border-collapse: collapse; }</style></head><body>"]
+    for page in range(pages):
+        parts.append(f"<h1>Chapter {page + 1}</h1>")
+        for section in range(rng.randint(1, 3)):
+            parts.append(f"<h2>Section {page + 1}.{section + 1}</h2>")
+            for _ in range(rng.randint(2, 5)):
+                parts.append(f"<p>{sentence(rng)} <b>{rng.choice(WORDS)}</b> {sentence(rng)}</p>")
+            if rng.random() < 0.4:
+                parts.append("<h3>Details</h3><ul>")
+                parts.extend(f"<li>{sentence(rng)}</li>" for _ in range(rng.randint(2, 6)))
+                parts.append("</ul>")
+            if rng.random() < 0.3:
+                rows = "".join(
+                    "<tr>" + "".join(f"<td>{rng.choice(WORDS)} {rng.randint(0, 99)}</td>" for _ in range(4)) + "</tr>"
+                    for _ in range(rng.randint(3, 10))
+                )
+                parts.append(f"<table><tbody>{rows}</tbody></table>")
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def run_splitter(split, files):
+    """Split every file, returning (seconds, documents per file)"""
+    start = time.perf_counter()
+    outputs = [split(path) for path in files]
+    return time.perf_counter() - start, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare HTML header sectioniser throughput")
+    parser.add_argument('--files', type=int, default=20, help='Number of generated files (default: 20)')
+    parser.add_argument('--pages', type=int, default=300, help='Pages per generated file (default: 300)')
+    parser.add_argument('-n', '--runs', type=int, default=3, help='Timed runs per splitter (default: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the corpus (default: 0)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        files = []
+        for i in range(args.files):
+            path = Path(corpus_dir) / f"doc_{i}.html"
+            path.write_text(generate_document(rng, args.pages), encoding="utf-8")
+            files.append(path)
+        corpus_mb = sum(path.stat().st_size for path in files) / (1024 * 1024)
+        print(f"📄 Generated {args.files} files x {args.pages} pages ({corpus_mb:.1f} MB)")
+
+        langchain_splitter = HTMLHeaderTextSplitter(headers_to_split_on=HEADERS)
+        lxml_splitter = LxmlHeaderSectioniser(HEADERS)
+        splitters = {
+            "langchain (bs4)": lambda path: langchain_splitter.split_text(path.read_text(encoding="utf-8")),
+            "lxml iterparse": lxml_splitter.split_file,
+        }
+
+        results = {}
+        for name, split in splitters.items():
+            timings = []
+            for _ in range(args.runs):
+                seconds, outputs = run_splitter(split, files)
+                timings.append(seconds)
+            sections = sum(len(docs) for docs in outputs)
+            results[name] = (statistics.median(timings), sections, outputs)
+
+    print(f"\n  {'Splitter':<18} {'Sections':>9} {'Median':>9} {'Sections/s':>11} {'MB/s':>7}")
+    for name, (seconds, sections, _) in results.items():
+        print(f"  {name:<18} {sections:>9} {seconds:>8.2f}s {sections / seconds:>11.0f} {corpus_mb / seconds:>7.1f}")
+
+    (base_time, _, base_outputs), (new_time, _, new_outputs) = results.values()
+    identical = sum(
+        [(d.page_content, d.metadata) for d in a] == [(d.page_content, d.metadata) for d in b]
+        for a, b in zip(base_outputs, new_outputs)
+    )
+    print(f"\n  Speed-up: {base_time / new_time:.1f}x")
+    print(f"  Identical output: {identical}/{len(base_outputs)} files "
+          f"{'✅' if identical == len(base_outputs) else '⚠️'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Memory versus recall@k of quantised index types
+
+Every index type is built from the same vectors through FAISSVectorStore and
+searched with and without exact re-ranking from the original vectors.
+Recall@k is measured against an exhaustive search over the original vectors.
+The vectors come from an existing index (--index-path) or are synthetic,
+clustered vectors of embedding dimension.
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from langchain.schema import Document
+
+from rag_poc.vectorstore.faiss_store import FAISSVectorStore
+
+
+def load_vectors(index_path: str) -> np.ndarray:
+    """Read the vectors of a saved index (only exact index types can return the originals)"""
+    store = FAISSVectorStore(embeddings=None, index_path=index_path)
+    store.load_index()
+    ids = faiss.vector_to_array(store.index.id_map)
+    if store.raw_vectors is not None:
+        return store.raw_vectors.get(ids)
+    return store.index.reconstruct_batch(ids)
+
+
+def synthetic_vectors(count: int, dimension: int, seed: int = 0) -> np.ndarray:
+    """Clustered unit vectors, closer to embedding distributions than uniform noise"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(1, count // 100), dimension)).astype(np.float32)
+    vectors = centers[rng.integers(len(centers), size=count)]
+    vectors += 0.5 * rng.standard_normal((count, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def recall_at_k(store: FAISSVectorStore, queries: np.ndarray, truth: np.ndarray, k: int) -> tuple:
+    """Average share of the true top-k found, and search time per query in ms"""
+    start = time.perf_counter()
+    results = store.batch_similarity_search_by_vectors(queries, k=k)
+    elapsed = time.perf_counter() - start
+    found = [len({doc.metadata["row"] for doc, _ in rows} & set(true_rows.tolist()))
+             for rows, true_rows in zip(results, truth)]
+    return sum(found) / (k * len(queries)), 1000 * elapsed / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure index memory against recall@k for quantised index types")
+    parser.add_argument('--index-path', help='Benchmark the vectors of an existing index instead of synthetic ones')
+    parser.add_argument('-n', '--count', type=int, default=20000, help='Synthetic vectors (default: 20000)')
+    parser.add_argument('-d', '--dimension', type=int, default=1536, help='Synthetic dimension (default: 1536)')
+    parser.add_argument('-q', '--queries', type=int, default=200, help='Queries (default: 200)')
+    parser.add_argument('-k', type=int, default=10, help='Results per query (default: 10)')
+    parser.add_argument('--rerank', type=int, default=4,
+                        help='Candidates per result re-ranked by exact distance (default: 4)')
+    parser.add_argument('--specs', help='Index types separated by ";", e.g. "SQ8;IVF256,PQ64" '
+                                        '(default: Flat;SQfp16;SQ8;PQ<d/4>;PQ<d/8>)')
+    args = parser.parse_args()
+
+    vectors = load_vectors(args.index_path) if args.index_path else synthetic_vectors(args.count, args.dimension)
+    dimension = vectors.shape[1]
+    rng = np.random.default_rng(1)
+    # Queries near, but not on, indexed vectors
+    queries = vectors[rng.choice(len(vectors), args.queries, replace=False)]
+    queries = queries + 0.1 * rng.standard_normal(queries.shape).astype(np.float32) * queries.std()
+    _, truth = faiss.knn(queries, vectors, args.k)
+
+    specs = args.specs.split(";") if args.specs else ["Flat", "SQfp16", "SQ8", f"PQ{dimension // 4}",
+                                                      f"PQ{dimension // 8}"]
+    documents = [Document(page_content="", metadata={"row": i}) for i in range(len(vectors))]
+    flat_bytes = 4 * dimension
+
+    print(f"📐 {len(vectors)} vectors of dimension {dimension}, {args.queries} queries, recall@{args.k}")
+    print("=" * 92)
+    print(f"{'Index type':16} {'bytes/vec':>10} {'smaller':>8} {'build':>8} "
+          f"{'recall':>8} {'ms/query':>9} {f'recall x{args.rerank}':>11} {'ms/query':>9}")
+
+    for spec in specs:
+        work_dir = tempfile.mkdtemp(prefix="quant-bench-")
+        store = FAISSVectorStore(embeddings=None, index_path=str(Path(work_dir) / "index"), index_spec=spec)
+        try:
+            start = time.perf_counter()
+            store.add_embeddings(documents, vectors)
+            build_seconds = time.perf_counter() - start
+            bytes_per_vector = len(faiss.serialize_index(store.index)) / len(vectors)
+
+            store.rerank_factor = 1
+            recall, ms = recall_at_k(store, queries, truth, args.k)
+            row = (f"{spec:16} {bytes_per_vector:10.1f} {flat_bytes / bytes_per_vector:7.1f}x "
+                   f"{build_seconds:7.1f}s {recall:8.3f} {ms:9.2f}")
+            if store.raw_vectors is not None:
+                store.rerank_factor = args.rerank
+                recall, ms = recall_at_k(store, queries, truth, args.k)
+                row += f" {recall:11.3f} {ms:9.2f}"
+            print(row)
+        except ValueError as e:
+            print(f"{spec:16} ❌ {e}")
+        finally:
+            store.reset()
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("\nbytes/vec is the in-memory index size per vector (ids included); re-ranking reads")
+    print(f"the original vectors ({flat_bytes} bytes each) from disk through a memory map.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the search/info code path
+
+Each scenario runs in a fresh interpreter so that module import cost is
+measured from a cold start. The "eager converters" scenario reproduces the
+old behaviour, where importing RAGPipeline also imported every converter
+backend (and with them torch and docling).
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent / "src"
+
+SCENARIOS = {
+    "search (lazy converters)": """
+from rag_poc import RAGPipeline
+""",
+    "eager converters (old behaviour)": """
+from rag_poc import RAGPipeline
+for module in ("document_converter", "docling_mps_converter", "enhanced_docling_converter",
+               "simple_pdf_converter", "macos_ocr_converter"):
+    try:
+        __import__(f"rag_poc.document_processing.{module}")
+    except Exception:
+        pass
+""",
+}
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "torch_loaded": "torch" in sys.modules,
+    "docling_loaded": "docling" in sys.modules,
+}}))
+"""
+
+
+def run_scenario(body: str) -> dict:
+    """Run one scenario in a fresh interpreter and return its measurements"""
+    code = PROBE.format(src=str(SRC_DIR), body=body)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "probe failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the search path")
+    parser.add_argument('-n', '--runs', type=int, default=5, help='Runs per scenario (default: 5)')
+    args = parser.parse_args()
+
+    print(f"🚀 Cold-start benchmark ({args.runs} runs per scenario)")
+    print("=" * 80)
+    print(f"{'Scenario':36} {'median':>9} {'min':>9} {'torch':>7} {'docling':>8}")
+
+    for name, body in SCENARIOS.items():
+        try:
+            runs = [run_scenario(body) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{name:36} ❌ {e}")
+            continue
+
+        times = [r["seconds"] for r in runs]
+        print(f"{name:36} {statistics.median(times):8.3f}s {min(times):8.3f}s "
+              f"{str(runs[-1]['torch_loaded']):>7} {str(runs[-1]['docling_loaded']):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,19 @@ Command-line interface for document processing and vector search
 """
 
 import argparse
+import itertools
+import json
 import sys
+import time
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional
 import os
 
 # Add src to Python path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from rag_poc import RAGPipeline
+from rag_poc.streaming_ingest import print_ingest_stats
 
 
 def setup_argparser() -> argparse.ArgumentParser:
@@ -26,21 +30,71 @@ Examples:
   # Build index from documents (CPU mode - default)
   python main.py build -f document1.pdf document2.pptx -o data/output/html
 
+  # Build index converting documents in 8 worker processes
+  python main.py build -f data/input/*.pdf --workers 8 --timeout 600
+
+  # Build index converting each large scanned PDF in 8 parallel page ranges
+  python main.py build -f data/input/manual.pdf --page-workers 8
+
   # Build index with MPS acceleration (macOS only)
   python main.py build -f document1.pdf --device mps
 
   # Build index with macOS native OCR (best for scanned PDFs/images)
   python main.py build -f document1.pdf --device macos
 
+  # Build index streaming documents through conversion, embedding and indexing
+  python main.py build -f data/input/*.pdf --workers 4 --streaming
+  
+  # Build an approximate (HNSW) index for large corpora
+  python main.py build -f data/input/*.pdf --index-spec HNSW32
+
+  # Build an 8-bit scalar-quantised index (4x smaller), re-ranked from the original vectors on disk
+  python main.py build -f data/input/*.pdf --index-spec SQ8
+
+  # Split a large index into 8 shards that are built and searched in parallel
+  python main.py build -f data/input/*.pdf --shards 8
+
+  # Embed and index 4 partial indexes in parallel, then merge them
+  python main.py build -f data/input/*.pdf --build-workers 4
+
   # Search in existing index
   python main.py search -q "machine learning concepts" -k 3
 
+  # Search every query of a file (one per line or JSONL) and write JSONL results
+  python main.py search --queries-file eval/queries.jsonl -k 10 --output eval/results.jsonl
+
+  # Search an IVF index visiting 32 lists per query
+  python main.py search -q "machine learning concepts" --nprobe 32
+
+  # Combine keyword (BM25) and vector search, e.g. for product codes and version strings
+  python main.py search -q "RX-100 v2.3 安装步骤" --mode hybrid
+
+  # Search only within one document
+  python main.py search -q "installation steps" --filter source=data/output/html/manual.html
+
   # Add new documents to existing index
   python main.py add -f new_document.docx
+  
+  # Re-index one changed document, replacing its previous chunks
+  python main.py add -f data/input/manual.pdf --replace
+  
+  # Remove a document's chunks from the index
+  python main.py delete -s data/output/html/manual.html
+  
+  # Re-index only new/changed files of a document share and drop removed ones
+  python main.py sync -p data/input --workers 4
+  
+  # Keep the index loaded and answer queries over HTTP/JSON
+  python main.py serve --port 8000 --mmap
+  python main.py serve --reload-interval 30
+  curl -s localhost:8000/search -d '{"query": "machine learning concepts", "k": 3}'
+
+  # Show conversion cache size and hit rate
+  python main.py cache stats
 
   # Test Azure OpenAI connection
   python main.py test-connection
-        """
+"""
     )
     
     # Add global device argument
@@ -58,14 +112,43 @@ Examples:
     build_parser.add_argument('--index-path',
                              help='Path to save index (default: data/output/faiss_index)')
     build_parser.add_argument('--chunk-size', type=int, default=1000,
-                             help='Text chunk size (default: 1000)')
+                             help='Maximum chunk size in tokens (default: 1000)')
     build_parser.add_argument('--chunk-overlap', type=int, default=200,
-                             help='Text chunk overlap (default: 200)')
+                             help='Chunk overlap in tokens (default: 200)')
+    build_parser.add_argument('--no-embedding-cache', action='store_true',
+                             help='Re-embed every chunk instead of reusing cached embeddings')
+    build_parser.add_argument('--no-conversion-cache', action='store_true',
+                             help='Re-convert every document instead of reusing cached conversions')
+    build_parser.add_argument('-w', '--workers', type=int, default=1,
+                             help='Worker processes for document conversion (default: 1)')
+    build_parser.add_argument('--timeout', type=float,
+                             help='Per-file conversion timeout in seconds')
+    build_parser.add_argument('--page-workers', type=int, default=1,
+                             help='Worker processes converting page ranges of large PDFs (default: 1)')
+    build_parser.add_argument('--embedding-concurrency', type=int,
+                             help='Concurrent embedding requests (default: EMBEDDING_MAX_CONCURRENCY or 1)')
+    build_parser.add_argument('--in-memory', action='store_true',
+                             help='Split converted HTML in memory; with -o, HTML files are written in the background')
+    build_parser.add_argument('--streaming', action='store_true',
+                             help='Overlap conversion, splitting, embedding and indexing with bounded memory')
+    build_parser.add_argument('--index-spec', default='Flat',
+                             help='FAISS index type: Flat (default), HNSW32, IVF4096,Flat, SQ8, SQfp16, IVF4096,PQ64, ... '
+                                  '(quantised types keep the original vectors on disk for exact re-ranking)')
+    build_parser.add_argument('--shards', type=int,
+                             help='Partition the index into N shards searched in parallel '
+                                  '(default: layout of the existing index, else 1)')
+    build_parser.add_argument('--build-workers', type=int, default=1,
+                             help='Worker threads building partial indexes that are merged at the end; '
+                                  'a failed build resumes from the finished partials (default: 1)')
     
     # Search command
     search_parser = subparsers.add_parser('search', help='Search in vector index')
-    search_parser.add_argument('-q', '--query', required=True,
-                              help='Search query')
+    query_group = search_parser.add_mutually_exclusive_group(required=True)
+    query_group.add_argument('-q', '--query',
+                             help='Search query')
+    query_group.add_argument('--queries-file',
+                             help='File of queries (one per line, or JSONL objects with a "query" field) '
+                                  'searched in batches; results are written as JSONL')
     search_parser.add_argument('-k', '--top-k', type=int, default=5,
                               help='Number of results to return (default: 5)')
     search_parser.add_argument('--index-path',
@@ -74,6 +157,28 @@ Examples:
                               help='Show similarity scores')
     search_parser.add_argument('--score-threshold', type=float,
                               help='Minimum similarity score threshold')
+    search_parser.add_argument('--mmap', action='store_true',
+                              help='Memory-map the index instead of reading it into RAM')
+    search_parser.add_argument('--nprobe', type=int,
+                              help='IVF lists to visit per query (IVF indexes only)')
+    search_parser.add_argument('--ef-search', type=int,
+                              help='HNSW search beam width (HNSW indexes only)')
+    search_parser.add_argument('--rerank', type=int,
+                              help='Candidates per result re-ranked by exact distance on quantised indexes '
+                                   '(default: RERANK_FACTOR or 4; 1 disables re-ranking)')
+    search_parser.add_argument('--mode', choices=['vector', 'keyword', 'hybrid'], default='vector',
+                              help='vector: embeddings, keyword: BM25 (exact terms, codes), '
+                                   'hybrid: both fused by reciprocal rank (default: vector)')
+    search_parser.add_argument('--filter', action='append', metavar='FIELD=VALUE',
+                              help='Only search chunks whose metadata field equals the value, '
+                                   'e.g. source=data/output/html/manual.html (repeatable; repeating a field matches any value)')
+    search_parser.add_argument('--filter-json',
+                              help='Metadata filter as JSON, with operators $eq $ne $gt $gte $lt $lte $in $nin, '
+                                   'e.g. \'{"Header 1": {"$in": ["Setup", "FAQ"]}}\'')
+    search_parser.add_argument('--output',
+                              help='JSONL results file for --queries-file (default: <queries file>.results.jsonl)')
+    search_parser.add_argument('--batch-size', type=int, default=1024,
+                              help='Queries embedded and searched together with --queries-file (default: 1024)')
     
     # Add command
     add_parser = subparsers.add_parser('add', help='Add documents to existing index')
@@ -83,11 +188,88 @@ Examples:
                            help='Directory to save HTML files')
     add_parser.add_argument('--index-path',
                            help='Path to existing index (default: data/output/faiss_index)')
+    add_parser.add_argument('--no-embedding-cache', action='store_true',
+                           help='Re-embed every chunk instead of reusing cached embeddings')
+    add_parser.add_argument('--no-conversion-cache', action='store_true',
+                           help='Re-convert every document instead of reusing cached conversions')
+    add_parser.add_argument('-w', '--workers', type=int, default=1,
+                           help='Worker processes for document conversion (default: 1)')
+    add_parser.add_argument('--timeout', type=float,
+                           help='Per-file conversion timeout in seconds')
+    add_parser.add_argument('--page-workers', type=int, default=1,
+                           help='Worker processes converting page ranges of large PDFs (default: 1)')
+    add_parser.add_argument('--embedding-concurrency', type=int,
+                           help='Concurrent embedding requests (default: EMBEDDING_MAX_CONCURRENCY or 1)')
+    add_parser.add_argument('--in-memory', action='store_true',
+                           help='Split converted HTML in memory; with -o, HTML files are written in the background')
+    add_parser.add_argument('--streaming', action='store_true',
+                           help='Overlap conversion, splitting, embedding and indexing with bounded memory')
+    add_parser.add_argument('--replace', action='store_true',
+                           help='Replace previously indexed chunks of the same documents instead of adding duplicates')
+                           
+    # Delete command
+    delete_parser = subparsers.add_parser('delete', help='Delete documents from the index')
+    delete_parser.add_argument('-s', '--sources', nargs='+', required=True,
+                              help='Source paths as shown in search results')
+    delete_parser.add_argument('--index-path',
+                              help='Path to index (default: data/output/faiss_index)')
     
+    # Sync command
+    sync_parser = subparsers.add_parser('sync', help='Incrementally sync the index with files and directories')
+    sync_parser.add_argument('-p', '--paths', nargs='+', required=True,
+                            help='Document files and/or directories (searched recursively)')
+    sync_parser.add_argument('-o', '--output-html-dir',
+                            help='Directory to save HTML files')
+    sync_parser.add_argument('--index-path',
+                            help='Path to index (default: data/output/faiss_index)')
+    sync_parser.add_argument('--dry-run', action='store_true',
+                            help='Only show which files are new, changed or removed')
+    sync_parser.add_argument('--no-embedding-cache', action='store_true',
+                            help='Re-embed every chunk instead of reusing cached embeddings')
+    sync_parser.add_argument('--no-conversion-cache', action='store_true',
+                            help='Re-convert every document instead of reusing cached conversions')
+    sync_parser.add_argument('-w', '--workers', type=int, default=1,
+                            help='Worker processes for document conversion (default: 1)')
+    sync_parser.add_argument('--timeout', type=float,
+                            help='Per-file conversion timeout in seconds')
+    sync_parser.add_argument('--page-workers', type=int, default=1,
+                            help='Worker processes converting page ranges of large PDFs (default: 1)')
+    sync_parser.add_argument('--embedding-concurrency', type=int,
+                            help='Concurrent embedding requests (default: EMBEDDING_MAX_CONCURRENCY or 1)')
+    sync_parser.add_argument('--index-spec', default='Flat',
+                            help='FAISS index type if a new index is created (default: Flat)')
+                            
     # Info command
     info_parser = subparsers.add_parser('info', help='Show index information')
     info_parser.add_argument('--index-path',
                             help='Path to index (default: data/output/faiss_index)')
+    info_parser.add_argument('--mmap', action='store_true',
+                            help='Memory-map the index instead of reading it into RAM')
+    
+    # Serve command
+    serve_parser = subparsers.add_parser('serve', help='Serve searches over HTTP/JSON with the index kept in memory')
+    serve_parser.add_argument('--index-path',
+                             help='Path to index (default: data/output/faiss_index)')
+    serve_parser.add_argument('--host', default='127.0.0.1',
+                             help='Interface to bind (default: 127.0.0.1)')
+    serve_parser.add_argument('--port', type=int, default=8000,
+                             help='Port to listen on (default: 8000)')
+    serve_parser.add_argument('--max-concurrency', type=int, default=8,
+                             help='Maximum searches executed at the same time (default: 8)')
+    serve_parser.add_argument('--mmap', action='store_true',
+                             help='Memory-map the index instead of reading it into RAM')
+    serve_parser.add_argument('--reload-interval', type=float, default=0,
+                             help='Seconds between checks for a newly saved index version to hot-reload (default: 0, off)')
+    serve_parser.add_argument('--rerank', type=int,
+                             help='Candidates per result re-ranked by exact distance on quantised indexes '
+                                  '(default: RERANK_FACTOR or 4; 1 disables re-ranking)')
+                             
+    # Cache command
+    cache_parser = subparsers.add_parser('cache', help='Inspect or clear the document conversion cache')
+    cache_parser.add_argument('action', choices=['stats', 'clear'],
+                             help='stats: show size and hit rate, clear: remove all cached conversions')
+    cache_parser.add_argument('--cache-path',
+                             help='Path to cache (default: CONVERSION_CACHE_PATH or data/output/conversion_cache.sqlite)')
     
     # Test connection command
     subparsers.add_parser('test-connection', help='Test Azure OpenAI connection')
@@ -95,6 +277,16 @@ Examples:
     return parser
 
 
+def print_embedding_cache_stats(pipeline: RAGPipeline) -> None:
+    """Print embedding cache hit-rate statistics"""
+    stats = pipeline.get_embedding_cache_stats()
+    if stats is None:
+        return
+    
+    print(f"  - Embedding cache: {stats['hits']} hits, {stats['misses']} misses "
+          f"({stats['hit_rate']:.1%} hit rate, {stats['entries']} cached vectors)")
+
+
 def handle_build_command(args) -> None:
     """Handle build command"""
     print("Building vector index...")
@@ -104,7 +296,16 @@ def handle_build_command(args) -> None:
         index_path=args.index_path,
         chunk_size=args.chunk_size,
         chunk_overlap=args.chunk_overlap,
-        device=args.device
+        device=args.device,
+        use_embedding_cache=not args.no_embedding_cache,
+        use_conversion_cache=not args.no_conversion_cache,
+        conversion_workers=args.workers,
+        conversion_timeout=args.timeout,
+        page_workers=args.page_workers,
+        embedding_concurrency=args.embedding_concurrency,
+        index_spec=args.index_spec,
+        in_memory_handoff=args.in_memory,
+        num_shards=args.shards
     )
     
     # Validate files
@@ -127,46 +328,144 @@ def handle_build_command(args) -> None:
     
     try:
         # Build index
-        pipeline.build_vector_index(
+        ingest_stats = pipeline.build_vector_index(
             file_paths=valid_files,
-            output_html_dir=args.output_html_dir
+            output_html_dir=args.output_html_dir,
+            streaming=args.streaming,
+            build_workers=args.build_workers
         )
+        if ingest_stats:
+            print_ingest_stats(ingest_stats)
         
         # Show index info
         info = pipeline.get_index_info()
         print(f"Index built successfully!")
         print(f"  - Documents: {info['document_count']}")
         print(f"  - Index path: {info['index_path']}")
+        print_embedding_cache_stats(pipeline)
         
     except Exception as e:
         print(f"Error building index: {str(e)}")
         sys.exit(1)
 
 
+def parse_filter(args) -> Optional[Dict[str, Any]]:
+    """Build the metadata filter of --filter FIELD=VALUE pairs and --filter-json"""
+    metadata_filter: Dict[str, Any] = {}
+    if args.filter_json:
+        try:
+            metadata_filter = json.loads(args.filter_json)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid --filter-json: {e}")
+        if not isinstance(metadata_filter, dict):
+            raise ValueError("--filter-json must be a JSON object")
+            
+    for condition in args.filter or []:
+        field, sep, value = condition.partition('=')
+        if not sep or not field:
+            raise ValueError(f"Invalid --filter '{condition}', expected FIELD=VALUE")
+        if field in metadata_filter:
+            previous = metadata_filter[field]
+            metadata_filter[field] = (previous if isinstance(previous, list) else [previous]) + [value]
+        else:
+            metadata_filter[field] = value
+            
+    return metadata_filter or None
+
+
+def read_queries(queries_file: str) -> Iterator[Dict[str, Any]]:
+    """Yield query records from a plain-text (one query per line) or JSONL file"""
+    with open(queries_file, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('{'):
+                record = json.loads(line)
+                if not isinstance(record.get('query'), str):
+                    raise ValueError(f"{queries_file}:{line_number}: missing 'query' field")
+                yield record
+            else:
+                yield {'query': line}
+
+
+def run_batch_search(pipeline: RAGPipeline, args) -> None:
+    """Search every query of args.queries_file and write one JSONL result line per query"""
+    output_path = args.output or f"{os.path.splitext(args.queries_file)[0]}.results.jsonl"
+    metadata_filter = parse_filter(args)
+    total = 0
+    start_time = time.monotonic()
+    
+    with open(output_path, 'w', encoding='utf-8') as out:
+        records = read_queries(args.queries_file)
+        while True:
+            batch = list(itertools.islice(records, args.batch_size))
+            if not batch:
+                break
+                
+            results = pipeline.batch_search_documents(
+                [record['query'] for record in batch],
+                k=args.top_k,
+                nprobe=args.nprobe,
+                ef_search=args.ef_search,
+                mode=args.mode,
+                filter=metadata_filter
+            )
+            for record, hits in zip(batch, results):
+                if args.score_threshold is not None:
+                    hits = [(doc, score) for doc, score in hits if score >= args.score_threshold]
+                record['results'] = [{'content': doc.page_content, 'metadata': doc.metadata, 'score': score}
+                                     for doc, score in hits]
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                
+            total += len(batch)
+            elapsed = time.monotonic() - start_time
+            print(f"  - {total} queries searched ({total / elapsed:.0f} queries/s)")
+            
+    print(f"✅ Wrote results of {total} queries to {output_path}")
+
+
 def handle_search_command(args) -> None:
     """Handle search command"""
-    print(f"Searching for: '{args.query}'")
+    if args.queries_file:
+        print(f"Searching queries from: {args.queries_file}")
+    else:
+        print(f"Searching for: '{args.query}'")
     
     # Initialize RAG pipeline (no need for document converter in search)
-    pipeline = RAGPipeline(index_path=args.index_path, device=args.device, init_document_converter=False)
+    pipeline = RAGPipeline(index_path=args.index_path, device=args.device, init_document_converter=False,
+                           rerank_factor=args.rerank)
     
     try:
         # Load existing index
-        pipeline.load_existing_index()
+        pipeline.load_existing_index(mmap=args.mmap)
         
+        if args.queries_file:
+            run_batch_search(pipeline, args)
+            return
+            
         # Perform search
+        metadata_filter = parse_filter(args)
         if args.show_scores:
             results = pipeline.search_documents(
                 query=args.query,
                 k=args.top_k,
-                return_scores=True
+                return_scores=True,
+                nprobe=args.nprobe,
+                ef_search=args.ef_search,
+                mode=args.mode,
+                filter=metadata_filter
             )
         else:
             results = pipeline.search_documents(
                 query=args.query,
                 k=args.top_k,
                 score_threshold=args.score_threshold,
-                return_scores=False
+                return_scores=False,
+                nprobe=args.nprobe,
+                ef_search=args.ef_search,
+                mode=args.mode,
+                filter=metadata_filter
             )
         
         if not results:
@@ -201,8 +500,15 @@ def handle_add_command(args) -> None:
     print("Adding documents to existing index...")
     
     # Initialize RAG pipeline
-    pipeline = RAGPipeline(index_path=args.index_path, device=args.device)
-    
+    pipeline = RAGPipeline(index_path=args.index_path, device=args.device,
+                           use_embedding_cache=not args.no_embedding_cache,
+                           use_conversion_cache=not args.no_conversion_cache,
+                           conversion_workers=args.workers,
+                           conversion_timeout=args.timeout,
+                           page_workers=args.page_workers,
+                           embedding_concurrency=args.embedding_concurrency,
+                           in_memory_handoff=args.in_memory)
+                           
     # Load existing index
     try:
         pipeline.load_existing_index()
@@ -231,41 +537,168 @@ def handle_add_command(args) -> None:
     
     try:
         # Add documents
-        pipeline.add_documents_to_index(
+        ingest_stats = pipeline.add_documents_to_index(
             file_paths=valid_files,
-            output_html_dir=args.output_html_dir
+            output_html_dir=args.output_html_dir,
+            streaming=args.streaming,
+            replace=args.replace
         )
+        if ingest_stats:
+            print_ingest_stats(ingest_stats)
         
         # Show updated index info
         info = pipeline.get_index_info()
         print(f"Documents added successfully!")
         print(f"  - Total documents: {info['document_count']}")
+        print_embedding_cache_stats(pipeline)
         
     except Exception as e:
         print(f"Error adding documents: {str(e)}")
         sys.exit(1)
 
 
+def handle_delete_command(args) -> None:
+    """Handle delete command"""
+    print("Deleting documents from index...")
+    
+    # Initialize RAG pipeline (no need for document converter when deleting)
+    pipeline = RAGPipeline(index_path=args.index_path, device=args.device, init_document_converter=False)
+    
+    try:
+        pipeline.load_existing_index()
+        deleted = pipeline.delete_documents(args.sources)
+        
+        info = pipeline.get_index_info()
+        print(f"✅ Deleted {deleted} chunks")
+        print(f"  - Total documents: {info['document_count']}")
+        
+    except Exception as e:
+        print(f"Error deleting documents: {str(e)}")
+        sys.exit(1)
+
+
+def handle_sync_command(args) -> None:
+    """Handle sync command"""
+    print("Syncing index with documents...")
+    
+    # Initialize RAG pipeline
+    pipeline = RAGPipeline(index_path=args.index_path, device=args.device,
+                           use_embedding_cache=not args.no_embedding_cache,
+                           use_conversion_cache=not args.no_conversion_cache,
+                           conversion_workers=args.workers,
+                           conversion_timeout=args.timeout,
+                           page_workers=args.page_workers,
+                           embedding_concurrency=args.embedding_concurrency,
+                           index_spec=args.index_spec)
+                           
+    # Load existing index, or start a new one on the first sync
+    try:
+        pipeline.load_existing_index()
+    except FileNotFoundError:
+        print("No existing index found, a new index will be created.")
+    except Exception as e:
+        print(f"Error loading existing index: {str(e)}")
+        sys.exit(1)
+        
+    try:
+        summary = pipeline.sync_documents(
+            paths=args.paths,
+            output_html_dir=args.output_html_dir,
+            dry_run=args.dry_run
+        )
+        
+        if not args.dry_run:
+            info = pipeline.get_index_info()
+            print(f"  - Files: {summary['new']} new, {summary['changed']} changed, "
+                  f"{summary['removed']} removed, {summary['unchanged']} unchanged, {summary['failed']} failed")
+            print(f"  - Total documents: {info['document_count']}")
+            print_embedding_cache_stats(pipeline)
+            
+    except Exception as e:
+        print(f"Error syncing documents: {str(e)}")
+        sys.exit(1)
+
+
 def handle_info_command(args) -> None:
     """Handle info command"""
-    # Initialize RAG pipeline
-    pipeline = RAGPipeline(index_path=args.index_path, device=args.device)
+    # Initialize RAG pipeline (no need for document converter in info)
+    pipeline = RAGPipeline(index_path=args.index_path, device=args.device, init_document_converter=False)
     
     try:
         # Try to load index
-        pipeline.load_existing_index()
+        pipeline.load_existing_index(mmap=args.mmap)
         info = pipeline.get_index_info()
         
         print("Index Information:")
         print(f"  - Status: {info['status']}")
         print(f"  - Documents: {info['document_count']}")
         print(f"  - Embedding dimension: {info['embedding_dimension']}")
+        print(f"  - Index type: {info['index_spec']}")
+        if info.get('rerank_factor'):
+            print(f"  - Exact re-ranking: {info['rerank_factor']}x candidates from the original vectors")
         print(f"  - Index path: {info['index_path']}")
+        if info.get('shards'):
+            print(f"  - Shards: {info['num_shards']}")
+            for shard, shard_info in enumerate(info['shards']):
+                print(f"      shard {shard}: {shard_info['document_count']} documents, "
+                      f"version {shard_info['version'] or '-'}")
+        else:
+            print(f"  - Version: {info.get('version') or 'unversioned'}")
         
     except Exception as e:
         print(f"No index found at specified path: {str(e)}")
 
 
+def handle_serve_command(args) -> None:
+    """Handle serve command"""
+    from rag_poc.server import SearchServer
+    
+    # Initialize RAG pipeline once (no need for document converter when serving)
+    pipeline = RAGPipeline(index_path=args.index_path, device=args.device, init_document_converter=False,
+                           rerank_factor=args.rerank)
+    
+    try:
+        pipeline.load_existing_index(mmap=args.mmap)
+        server = SearchServer(pipeline, host=args.host, port=args.port, max_concurrency=args.max_concurrency,
+                              reload_interval=args.reload_interval)
+    except Exception as e:
+        print(f"Error starting server: {str(e)}")
+        sys.exit(1)
+        
+    server.serve_forever()
+
+
+def handle_cache_command(args) -> None:
+    """Handle cache command"""
+    from rag_poc.document_processing.conversion_cache import ConversionCache, get_default_cache_path
+    
+    cache_path = args.cache_path or get_default_cache_path()
+    if not os.path.exists(cache_path):
+        print(f"No conversion cache found at {cache_path}")
+        return
+        
+    cache = ConversionCache(cache_path)
+    try:
+        if args.action == 'clear':
+            entries = cache.get_stats()['entries']
+            cache.clear()
+            print(f"✅ Removed {entries} cached conversions from {cache_path}")
+            return
+            
+        stats = cache.get_stats()
+        print("Conversion Cache:")
+        print(f"  - Path: {stats['path']}")
+        print(f"  - Entries: {stats['entries']}")
+        print(f"  - Size: {stats['size_bytes'] / 1024 / 1024:.1f} MB of {stats['max_bytes'] / 1024 / 1024:.0f} MB "
+              f"({stats['html_bytes'] / 1024 / 1024:.1f} MB uncompressed HTML)")
+        print(f"  - Lookups: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.1%} hit rate)")
+        print(f"  - Evictions: {stats['evictions']}")
+        for converter, count in sorted(stats['by_converter'].items()):
+            print(f"  - {converter}: {count} entries")
+    finally:
+        cache.close()
+
+
 def handle_test_connection_command() -> None:
     """Handle test connection command"""
     print("Testing Azure OpenAI connection...")
@@ -312,8 +745,16 @@ def main():
             handle_search_command(args)
         elif args.command == 'add':
             handle_add_command(args)
+        elif args.command == 'delete':
+            handle_delete_command(args)
+        elif args.command == 'sync':
+            handle_sync_command(args)
         elif args.command == 'info':
             handle_info_command(args)
+        elif args.command == 'serve':
+            handle_serve_command(args)
+        elif args.command == 'cache':
+            handle_cache_command(args)
         elif args.command == 'test-connection':
             handle_test_connection_command()
         else:
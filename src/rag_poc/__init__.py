@@ -2,17 +2,32 @@
 RAG POC - Document Processing and Vector Search System
 """
 
-from .rag_pipeline import RAGPipeline
-from .document_processing.document_converter import DocumentToHTMLConverter
-from .document_processing.html_splitter import HTMLDocumentSplitter
-from .embedding.azure_openai_embeddings import AzureOpenAIEmbeddingManager
-from .vectorstore.faiss_store import FAISSVectorStore
+import importlib
 
 __version__ = "0.1.0"
 __all__ = [
     "RAGPipeline",
-    "DocumentToHTMLConverter", 
+    "DocumentToHTMLConverter",
     "HTMLDocumentSplitter",
     "AzureOpenAIEmbeddingManager",
     "FAISSVectorStore"
-]
\ No newline at end of file
+]
+
+# Exports are resolved on first access so that importing the package does not
+# pull in torch/docling (DocumentToHTMLConverter) unless it is actually used.
+_LAZY_EXPORTS = {
+    "RAGPipeline": ".rag_pipeline",
+    "DocumentToHTMLConverter": ".document_processing.document_converter",
+    "HTMLDocumentSplitter": ".document_processing.html_splitter",
+    "AzureOpenAIEmbeddingManager": ".embedding.azure_openai_embeddings",
+    "FAISSVectorStore": ".vectorstore.faiss_store",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
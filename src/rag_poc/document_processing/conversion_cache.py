@@ -0,0 +1,215 @@
+"""
+Content-addressed cache of converted HTML, shared by all converter backends
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+from ..document_sync import file_sha256
+
+# Default size bound of the cache in MB
+DEFAULT_MAX_MB = 2048
+
+
+class ConversionCache:
+    """SQLite store of zlib-compressed HTML keyed by file hash + converter + options, with LRU eviction"""
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None):
+        """
+        Initialize conversion cache
+
+        Args:
+            path: Path of the SQLite cache file
+            max_bytes: Size bound of the compressed HTML (default: CONVERSION_CACHE_MAX_MB or 2048 MB)
+        """
+        self.path = path
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("CONVERSION_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+
+        cache_dir = os.path.dirname(path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Worker processes share the file; wait for each other's write locks
+        self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS conversions (
+                cache_key TEXT PRIMARY KEY,
+                converter TEXT NOT NULL,
+                html BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                original_size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS conversions_lru ON conversions (last_access)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(file_path: str, converter: str, options: Dict[str, Any]) -> str:
+        """
+        Build the cache key of a conversion
+
+        Args:
+            file_path: Input document
+            converter: Converter identifier (class name)
+            options: Conversion options that change the output (OCR, languages, ...)
+
+        Returns:
+            Hex digest identifying file contents + converter + options
+        """
+        payload = json.dumps({"file": file_sha256(file_path), "converter": converter, "options": options},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _bump(self, name: str) -> None:
+        self._conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1", (name,)
+        )
+
+    def get(self, cache_key: str) -> Optional[str]:
+        """Return cached HTML, or None on a miss"""
+        with self._lock:
+            row = self._conn.execute("SELECT html FROM conversions WHERE cache_key = ?", (cache_key,)).fetchone()
+            if row is None:
+                self._bump("misses")
+            else:
+                self._bump("hits")
+                self._conn.execute("UPDATE conversions SET last_access = ? WHERE cache_key = ?",
+                                   (time.time(), cache_key))
+            self._conn.commit()
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+    def put(self, cache_key: str, converter: str, html_content: str) -> None:
+        """Store HTML and evict least recently used entries beyond the size bound"""
+        raw = html_content.encode("utf-8")
+        compressed = zlib.compress(raw, 6)
+        if len(compressed) > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO conversions "
+                "(cache_key, converter, html, size, original_size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (cache_key, converter, compressed, len(compressed), len(raw), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM conversions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for cache_key, size in self._conn.execute(
+                "SELECT cache_key, size FROM conversions ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM conversions WHERE cache_key = ?", (cache_key,))
+            total -= size
+            evicted += 1
+        self._conn.execute(
+            "INSERT INTO counters (name, value) VALUES ('evictions', ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + ?", (evicted, evicted)
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get entry counts, sizes and lifetime hit/miss counters"""
+        with self._lock:
+            entries, size, original_size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(original_size), 0) FROM conversions"
+            ).fetchone()
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+            by_converter = dict(self._conn.execute(
+                "SELECT converter, COUNT(*) FROM conversions GROUP BY converter"
+            ).fetchall())
+
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        lookups = hits + misses
+        return {
+            "path": self.path,
+            "entries": entries,
+            "size_bytes": size,
+            "html_bytes": original_size,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "evictions": counters.get("evictions", 0),
+            "by_converter": by_converter,
+        }
+
+    def clear(self) -> None:
+        """Remove all cached conversions and reset counters"""
+        with self._lock:
+            self._conn.execute("DELETE FROM conversions")
+            self._conn.execute("DELETE FROM counters")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+def get_default_cache_path() -> str:
+    """Conversion cache location (CONVERSION_CACHE_PATH or data/output/conversion_cache.sqlite)"""
+    return os.getenv("CONVERSION_CACHE_PATH", "data/output/conversion_cache.sqlite")
+
+
+def cached_convert_to_html(converter, file_path: str, convert: Callable[[], str]) -> str:
+    """
+    Return converted HTML from the converter's cache, converting and storing it on a miss
+
+    Args:
+        converter: Converter instance (uses its conversion_cache and _init_kwargs())
+        file_path: Input document
+        convert: Performs the actual conversion
+
+    Returns:
+        HTML content as string
+    """
+    cache = getattr(converter, "conversion_cache", None)
+    if cache is None:
+        return convert()
+
+    converter_name = type(converter).__name__
+    options = {k: v for k, v in converter._init_kwargs().items() if k != "cache_path"}
+    try:
+        cache_key = cache.make_key(file_path, converter_name, options)
+        html_content = cache.get(cache_key)
+    except (OSError, sqlite3.Error) as e:
+        print(f"⚠️  Conversion cache unavailable: {str(e)}")
+        return convert()
+
+    if html_content is not None:
+        print(f"♻️  Using cached conversion of {file_path}")
+        return html_content
+
+    html_content = convert()
+    try:
+        cache.put(cache_key, converter_name, html_content)
+    except sqlite3.Error as e:
+        print(f"⚠️  Could not cache conversion of {file_path}: {str(e)}")
+    return html_content
@@ -0,0 +1,94 @@
+"""
+Lazy registry of document converter backends
+
+Converter modules import heavy dependencies (torch, docling) at module level,
+so a backend module is only imported once its device is actually selected.
+"""
+
+import importlib
+from typing import Any, Dict, List, Tuple
+
+
+# Backend name -> (module, class name, default constructor kwargs)
+CONVERTER_BACKENDS: Dict[str, Tuple[str, str, Dict[str, Any]]] = {
+    "enhanced_docling": (".enhanced_docling_converter", "EnhancedDoclingConverter",
+                         {"use_ocr": True, "lang": ['en', 'zh']}),
+    "docling": (".document_converter", "DocumentToHTMLConverter", {}),
+    "docling_mps": (".docling_mps_converter", "DoclingMPSConverter", {"use_mps": True}),
+    "macos_ocr": (".macos_ocr_converter", "MacOSOCRConverter", {}),
+    "simple_pdf": (".simple_pdf_converter", "SimplePDFConverter", {}),
+}
+
+# Device -> backends tried in order until one initializes
+DEVICE_BACKENDS: Dict[str, List[str]] = {
+    "macos": ["macos_ocr", "simple_pdf"],
+    "mps": ["docling_mps", "simple_pdf"],
+    "cpu": ["enhanced_docling", "docling", "simple_pdf"],
+}
+
+
+def get_converter_class(backend: str) -> type:
+    """
+    Import and return the converter class for a backend
+
+    Args:
+        backend: Backend name (see CONVERTER_BACKENDS)
+
+    Returns:
+        Converter class
+    """
+    if backend not in CONVERTER_BACKENDS:
+        raise ValueError(f"Unknown converter backend: {backend}")
+
+    module_name, class_name, _ = CONVERTER_BACKENDS[backend]
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, class_name)
+
+
+def create_converter(backend: str, **kwargs):
+    """
+    Create a converter instance for a backend
+
+    Args:
+        backend: Backend name (see CONVERTER_BACKENDS)
+        **kwargs: Constructor arguments overriding the backend defaults
+
+    Returns:
+        Converter instance
+    """
+    converter_class = get_converter_class(backend)
+    init_kwargs = {**CONVERTER_BACKENDS[backend][2], **kwargs}
+    return converter_class(**init_kwargs)
+
+
+def create_converter_for_device(device: str = "cpu", **kwargs):
+    """
+    Create the best available converter for a device, falling back in order
+
+    Args:
+        device: Device to use ("cpu", "mps", or "macos")
+        **kwargs: Constructor arguments shared by all backends (e.g. cache_path)
+
+    Returns:
+        Converter instance
+    """
+    if device not in DEVICE_BACKENDS:
+        raise ValueError(f"Unknown device: {device}")
+
+    backends = DEVICE_BACKENDS[device]
+    last_error = None
+
+    for i, backend in enumerate(backends):
+        try:
+            converter = create_converter(backend, **kwargs)
+            print(f"✅ {CONVERTER_BACKENDS[backend][1]} initialized successfully")
+            return converter
+        except Exception as e:
+            last_error = e
+            if i + 1 < len(backends):
+                print(f"⚠️  {CONVERTER_BACKENDS[backend][1]} initialization failed, "
+                      f"falling back to {CONVERTER_BACKENDS[backends[i + 1]][1]}: {str(e)}")
+            if backend == "docling" and device == "cpu":
+                print("💡 To fix this, run: ./install_docling_macos_intel.sh")
+
+    raise RuntimeError(f"No document converter could be initialized for device '{device}': {last_error}")
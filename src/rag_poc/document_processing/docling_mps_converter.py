@@ -9,18 +9,30 @@ import torch
 from docling.document_converter import DocumentConverter
 from docling.datamodel.pipeline_options import PipelineOptions, EasyOcrOptions
 
+from .conversion_cache import ConversionCache, cached_convert_to_html
+from .page_ranges import DEFAULT_PAGES_PER_RANGE, convert_pdf_pages
+from .parallel_conversion import convert_batch_parallel
+
 
 class DoclingMPSConverter:
     """Convert documents using Docling with macOS MPS acceleration"""
     
-    def __init__(self, use_mps: bool = True):
+    def __init__(self, use_mps: bool = True, cache_path: Optional[str] = None,
+                 page_workers: int = 1, pages_per_range: int = DEFAULT_PAGES_PER_RANGE):
         """
         Initialize Docling converter with MPS acceleration
         
         Args:
             use_mps: Whether to use MPS acceleration (default: True on macOS)
+            cache_path: Conversion cache file (optional, disables caching when not set)
+            page_workers: Worker processes converting page ranges of large PDFs (default: 1, off)
+            pages_per_range: Pages per range when page_workers > 1
         """
         self.use_mps = use_mps and torch.backends.mps.is_available()
+        self.cache_path = cache_path
+        self.conversion_cache = ConversionCache(cache_path) if cache_path else None
+        self.page_workers = page_workers
+        self.pages_per_range = pages_per_range
         self.supported_formats = [
             '.pdf', '.docx', '.doc', '.pptx', '.ppt', 
             '.html', '.htm', '.png', '.jpg', '.jpeg'
@@ -81,14 +93,8 @@ class DoclingMPSConverter:
         Returns:
             Path to the generated HTML file
         """
-        # Set MPS environment
-        self.set_mps_environment()
-        
         input_path = Path(file_path)
         
-        if not input_path.exists():
-            raise FileNotFoundError(f"Input file not found: {file_path}")
-        
         # Set output directory
         if output_dir is None:
             output_dir = input_path.parent
@@ -96,15 +102,9 @@ class DoclingMPSConverter:
             output_dir = Path(output_dir)
             output_dir.mkdir(parents=True, exist_ok=True)
         
-        print(f"Converting {input_path.name} with {'MPS' if self.use_mps else 'CPU'} acceleration...")
+        html_content = self.convert_to_html(file_path)
         
         try:
-            # Convert document
-            result = self.converter.convert(input_path)
-            
-            # Generate HTML content
-            html_content = result.document.export_to_html()
-            
             # Save HTML file
             output_file = output_dir / f"{input_path.stem}.html"
             with open(output_file, 'w', encoding='utf-8') as f:
@@ -112,22 +112,69 @@ class DoclingMPSConverter:
             
             print(f"✅ Conversion completed: {output_file}")
             return str(output_file)
+        
+        except Exception as e:
+            print(f"❌ Error converting {file_path}: {str(e)}")
+            raise
+    
+    def convert_to_html(self, file_path: str) -> str:
+        """
+        Convert document to HTML content (without saving to file), reusing a cached conversion
+        
+        Args:
+            file_path: Path to the input file
+            
+        Returns:
+            HTML content as string
+        """
+        return cached_convert_to_html(self, file_path, lambda: convert_pdf_pages(self, file_path))
+    
+    def _convert_to_html(self, file_path: str, first_page: int = 1) -> str:
+        """Convert document (or a page range starting at first_page) to HTML content, bypassing the conversion cache"""
+        # Set MPS environment
+        self.set_mps_environment()
+        
+        input_path = Path(file_path)
+        
+        if not input_path.exists():
+            raise FileNotFoundError(f"Input file not found: {file_path}")
+        
+        print(f"Converting {input_path.name} with {'MPS' if self.use_mps else 'CPU'} acceleration...")
+        
+        try:
+            # Convert document
+            result = self.converter.convert(input_path)
+            
+            # Generate HTML content
+            return result.document.export_to_html()
             
         except Exception as e:
             print(f"❌ Error converting {file_path}: {str(e)}")
             raise
     
-    def convert_batch(self, file_paths: List[str], output_dir: Optional[str] = None) -> List[str]:
+    def convert_batch(self, 
+                      file_paths: List[str], 
+                      output_dir: Optional[str] = None,
+                      workers: int = 1,
+                      timeout: Optional[float] = None) -> List[str]:
         """
         Convert multiple files to HTML with MPS acceleration
         
         Args:
             file_paths: List of input file paths
             output_dir: Output directory
+            workers: Number of worker processes (1 converts serially in this process)
+            timeout: Per-file timeout in seconds (runs in worker processes when set)
             
         Returns:
             List of generated HTML file paths
         """
+        if workers > 1 or timeout is not None:
+            return convert_batch_parallel(
+                type(self), self._init_kwargs(), file_paths, output_dir,
+                workers=workers, timeout=timeout
+            )
+        
         html_files = []
         
         print(f"Starting batch conversion of {len(file_paths)} files...")
@@ -144,6 +191,10 @@ class DoclingMPSConverter:
         print(f"\n✅ Batch conversion completed: {len(html_files)}/{len(file_paths)} files successful")
         return html_files
     
+    def _init_kwargs(self) -> dict:
+        """Constructor arguments that rebuild this converter in a worker process"""
+        return {'use_mps': self.use_mps, 'cache_path': self.cache_path}
+    
     def is_supported_format(self, file_path: str) -> bool:
         """Check if file format is supported"""
         file_extension = Path(file_path).suffix.lower()
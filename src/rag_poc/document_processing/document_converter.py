@@ -7,12 +7,29 @@ from pathlib import Path
 from typing import Optional, List
 from docling.document_converter import DocumentConverter
 
+from .conversion_cache import ConversionCache, cached_convert_to_html
+from .page_ranges import DEFAULT_PAGES_PER_RANGE, convert_pdf_pages
+from .parallel_conversion import convert_batch_parallel
+
 
 class DocumentToHTMLConverter:
     """Convert documents (PPT, PDF, DOC, etc.) to HTML using Docling"""
     
-    def __init__(self):
+    def __init__(self, cache_path: Optional[str] = None,
+                 page_workers: int = 1, pages_per_range: int = DEFAULT_PAGES_PER_RANGE):
+        """
+        Initialize Docling converter
+        
+        Args:
+            cache_path: Conversion cache file (optional, disables caching when not set)
+            page_workers: Worker processes converting page ranges of large PDFs (default: 1, off)
+            pages_per_range: Pages per range when page_workers > 1
+        """
         self.converter = DocumentConverter()
+        self.cache_path = cache_path
+        self.conversion_cache = ConversionCache(cache_path) if cache_path else None
+        self.page_workers = page_workers
+        self.pages_per_range = pages_per_range
         self.supported_formats = [
             '.pdf', '.docx', '.doc', '.pptx', '.ppt', 
             '.html', '.htm', '.png', '.jpg', '.jpeg'
@@ -31,9 +48,6 @@ class DocumentToHTMLConverter:
         """
         input_path = Path(file_path)
         
-        if not input_path.exists():
-            raise FileNotFoundError(f"Input file not found: {file_path}")
-        
         # Set output directory
         if output_dir is None:
             output_dir = input_path.parent
@@ -41,11 +55,7 @@ class DocumentToHTMLConverter:
             output_dir = Path(output_dir)
             output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Convert document
-        result = self.converter.convert(input_path)
-        
-        # Generate HTML content
-        html_content = result.document.export_to_html()
+        html_content = self.convert_to_html(file_path)
         
         # Save HTML file
         output_file = output_dir / f"{input_path.stem}.html"
@@ -54,17 +64,54 @@ class DocumentToHTMLConverter:
         
         return str(output_file)
     
-    def convert_batch(self, file_paths: List[str], output_dir: Optional[str] = None) -> List[str]:
+    def convert_to_html(self, file_path: str) -> str:
+        """
+        Convert document to HTML content (without saving to file), reusing a cached conversion
+        
+        Args:
+            file_path: Path to the input file
+            
+        Returns:
+            HTML content as string
+        """
+        return cached_convert_to_html(self, file_path, lambda: convert_pdf_pages(self, file_path))
+    
+    def _convert_to_html(self, file_path: str, first_page: int = 1) -> str:
+        """Convert document (or a page range starting at first_page) to HTML content, bypassing the conversion cache"""
+        input_path = Path(file_path)
+        
+        if not input_path.exists():
+            raise FileNotFoundError(f"Input file not found: {file_path}")
+        
+        # Convert document
+        result = self.converter.convert(input_path)
+        
+        # Generate HTML content
+        return result.document.export_to_html()
+    
+    def convert_batch(self, 
+                      file_paths: List[str], 
+                      output_dir: Optional[str] = None,
+                      workers: int = 1,
+                      timeout: Optional[float] = None) -> List[str]:
         """
         Convert multiple files to HTML
         
         Args:
             file_paths: List of input file paths
             output_dir: Output directory
+            workers: Number of worker processes (1 converts serially in this process)
+            timeout: Per-file timeout in seconds (runs in worker processes when set)
             
         Returns:
             List of generated HTML file paths
         """
+        if workers > 1 or timeout is not None:
+            return convert_batch_parallel(
+                type(self), self._init_kwargs(), file_paths, output_dir,
+                workers=workers, timeout=timeout
+            )
+        
         html_files = []
         
         for file_path in file_paths:
@@ -78,6 +125,10 @@ class DocumentToHTMLConverter:
         
         return html_files
     
+    def _init_kwargs(self) -> dict:
+        """Constructor arguments that rebuild this converter in a worker process"""
+        return {'cache_path': self.cache_path}
+    
     def is_supported_format(self, file_path: str) -> bool:
         """Check if file format is supported"""
         file_extension = Path(file_path).suffix.lower()
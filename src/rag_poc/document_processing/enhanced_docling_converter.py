@@ -37,20 +37,36 @@ try:
 except ImportError:
     PYPDF2_AVAILABLE = False
 
+from .conversion_cache import ConversionCache, cached_convert_to_html
+from .ocr_triage import convert_with_ocr_triage
+from .page_ranges import DEFAULT_PAGES_PER_RANGE, convert_pdf_pages
+from .parallel_conversion import convert_batch_parallel
+
 
 class EnhancedDoclingConverter:
     """Enhanced Docling converter with fallback mechanisms"""
     
-    def __init__(self, use_ocr: bool = True, lang: List[str] = None):
+    def __init__(self, use_ocr: bool = True, lang: List[str] = None, cache_path: Optional[str] = None,
+                 page_workers: int = 1, pages_per_range: int = DEFAULT_PAGES_PER_RANGE,
+                 ocr_triage: bool = True):
         """
         Initialize enhanced Docling converter
         
         Args:
             use_ocr: Whether to use OCR (may require network)
             lang: Languages for OCR (default: ['en', 'zh'])
+            cache_path: Conversion cache file (optional, disables caching when not set)
+            page_workers: Worker processes converting page ranges of large PDFs (default: 1, off)
+            pages_per_range: Pages per range when page_workers > 1
+            ocr_triage: Only OCR PDF pages without a text layer (default: True)
         """
         self.use_ocr = use_ocr
+        self.ocr_triage = ocr_triage
         self.lang = lang or ['en', 'zh']
+        self.cache_path = cache_path
+        self.conversion_cache = ConversionCache(cache_path) if cache_path else None
+        self.page_workers = page_workers
+        self.pages_per_range = pages_per_range
         self.supported_formats = [
             '.pdf', '.docx', '.doc', '.pptx', '.ppt', 
             '.html', '.htm', '.png', '.jpg', '.jpeg'
@@ -61,6 +77,8 @@ class EnhancedDoclingConverter:
         
         # Initialize converter with retry mechanism
         self.converter = self._initialize_converter()
+        # No-OCR converter for pages with a text layer, created on first use
+        self.text_converter = None
         
         print(f"✅ Enhanced Docling converter initialized")
         print(f"   OCR enabled: {self.use_ocr}")
@@ -130,7 +148,26 @@ class EnhancedDoclingConverter:
             
             return None
     
-    def _extract_with_pypdf2(self, pdf_path: str) -> str:
+    def _get_text_converter(self) -> DocumentConverter:
+        """Get the DocumentConverter used for pages that already have a text layer"""
+        if self.text_converter is None:
+            self.text_converter = DocumentConverter(
+                pipeline_options=PipelineOptions(do_ocr=False, do_table_structure=True)
+            )
+        return self.text_converter
+    
+    def _docling_to_html(self, input_path: Path) -> str:
+        """Convert with Docling, running OCR only on scanned pages when triage is enabled"""
+        if not (self.use_ocr and self.ocr_triage):
+            return self.converter.convert(input_path).document.export_to_html()
+        
+        return convert_with_ocr_triage(
+            str(input_path),
+            lambda path: self.converter.convert(path).document.export_to_html(),
+            lambda path: self._get_text_converter().convert(path).document.export_to_html()
+        )
+    
+    def _extract_with_pypdf2(self, pdf_path: str, first_page: int = 1) -> str:
         """Fallback: Extract text using PyPDF2"""
         
         if not PYPDF2_AVAILABLE:
@@ -143,7 +180,7 @@ class EnhancedDoclingConverter:
                 pdf_reader = PyPDF2.PdfReader(file)
                 text_content = []
                 
-                for page_num, page in enumerate(pdf_reader.pages, 1):
+                for page_num, page in enumerate(pdf_reader.pages, first_page):
                     text = page.extract_text().strip()
                     if text:
                         text_content.append(f"<h2>Page {page_num}</h2>\n<div class='page-content'><p>{text}</p></div>")
@@ -169,12 +206,6 @@ class EnhancedDoclingConverter:
         """
         input_path = Path(file_path)
         
-        if not input_path.exists():
-            raise FileNotFoundError(f"Input file not found: {file_path}")
-        
-        if not self.is_supported_format(file_path):
-            raise ValueError(f"Unsupported file format: {input_path.suffix}")
-        
         # Set output directory
         if output_dir is None:
             output_dir = input_path.parent
@@ -182,6 +213,38 @@ class EnhancedDoclingConverter:
             output_dir = Path(output_dir)
             output_dir.mkdir(parents=True, exist_ok=True)
         
+        html_content = self.convert_to_html(file_path)
+        
+        # Save HTML file
+        output_file = output_dir / f"{input_path.stem}.html"
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        
+        print(f"✅ Conversion completed: {output_file}")
+        return str(output_file)
+    
+    def convert_to_html(self, file_path: str) -> str:
+        """
+        Convert document to HTML content (without saving to file), reusing a cached conversion
+        
+        Args:
+            file_path: Path to the input file
+            
+        Returns:
+            HTML content as string
+        """
+        return cached_convert_to_html(self, file_path, lambda: convert_pdf_pages(self, file_path))
+    
+    def _convert_to_html(self, file_path: str, first_page: int = 1) -> str:
+        """Convert document (or a page range starting at first_page) to HTML content, bypassing the conversion cache"""
+        input_path = Path(file_path)
+        
+        if not input_path.exists():
+            raise FileNotFoundError(f"Input file not found: {file_path}")
+        
+        if not self.is_supported_format(file_path):
+            raise ValueError(f"Unsupported file format: {input_path.suffix}")
+        
         print(f"Converting {input_path.name} with Enhanced Docling...")
         
         extracted_content = None
@@ -190,8 +253,7 @@ class EnhancedDoclingConverter:
         if self.converter is not None:
             try:
                 print("🔄 Using Docling DocumentConverter...")
-                result = self.converter.convert(input_path)
-                extracted_content = result.document.export_to_html()
+                extracted_content = self._docling_to_html(input_path)
                 print("✅ Docling conversion successful")
                 
             except Exception as e:
@@ -203,7 +265,7 @@ class EnhancedDoclingConverter:
         if extracted_content is None and input_path.suffix.lower() == '.pdf':
             try:
                 print("🔄 Falling back to PyPDF2...")
-                extracted_content = self._extract_with_pypdf2(str(input_path))
+                extracted_content = self._extract_with_pypdf2(str(input_path), first_page)
                 print("✅ PyPDF2 extraction successful")
                 
             except Exception as e:
@@ -213,7 +275,7 @@ class EnhancedDoclingConverter:
             raise RuntimeError(f"All conversion methods failed for {file_path}")
         
         # Generate complete HTML document
-        html_content = f"""<!DOCTYPE html>
+        return f"""<!DOCTYPE html>
 <html>
 <head>
 <title>{input_path.stem}</title>
@@ -224,26 +286,30 @@ class EnhancedDoclingConverter:
 {extracted_content}
 </body>
 </html>"""
-        
-        # Save HTML file
-        output_file = output_dir / f"{input_path.stem}.html"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        print(f"✅ Conversion completed: {output_file}")
-        return str(output_file)
     
-    def convert_batch(self, file_paths: List[str], output_dir: Optional[str] = None) -> List[str]:
+    def convert_batch(self, 
+                      file_paths: List[str], 
+                      output_dir: Optional[str] = None,
+                      workers: int = 1,
+                      timeout: Optional[float] = None) -> List[str]:
         """
         Convert multiple files to HTML
         
         Args:
             file_paths: List of input file paths
             output_dir: Output directory
+            workers: Number of worker processes (1 converts serially in this process)
+            timeout: Per-file timeout in seconds (runs in worker processes when set)
             
         Returns:
             List of generated HTML file paths
         """
+        if workers > 1 or timeout is not None:
+            return convert_batch_parallel(
+                type(self), self._init_kwargs(), file_paths, output_dir,
+                workers=workers, timeout=timeout
+            )
+        
         html_files = []
         
         print(f"Starting Enhanced Docling batch conversion of {len(file_paths)} files...")
@@ -260,6 +326,11 @@ class EnhancedDoclingConverter:
         print(f"\n✅ Enhanced Docling batch conversion completed: {len(html_files)}/{len(file_paths)} files successful")
         return html_files
     
+    def _init_kwargs(self) -> dict:
+        """Constructor arguments that rebuild this converter in a worker process"""
+        return {'use_ocr': self.use_ocr, 'lang': self.lang, 'cache_path': self.cache_path,
+                'ocr_triage': self.ocr_triage}
+    
     def is_supported_format(self, file_path: str) -> bool:
         """Check if file format is supported"""
         file_extension = Path(file_path).suffix.lower()
@@ -0,0 +1,74 @@
+"""
+Background writer for converted HTML files
+"""
+
+import hashlib
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+class AsyncHTMLWriter:
+    """Write converted HTML as a side output on a background thread, with collision-safe names"""
+
+    def __init__(self, output_dir: str):
+        """
+        Initialize HTML writer
+
+        Args:
+            output_dir: Directory to write HTML files into
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="html-writer")
+        self._futures: List[Tuple[str, Future]] = []
+        # Output file name -> absolute source path that claimed it
+        self._claimed: Dict[str, str] = {}
+
+    def output_path(self, source_path: str) -> Path:
+        """
+        Choose the output file for a source document
+
+        "{stem}.html" is used unless another source with the same stem (e.g.
+        report.pdf in a different folder) already claimed it in this run, in
+        which case a short hash of the source path is appended.
+        """
+        source = os.path.abspath(source_path)
+        stem = Path(source_path).stem
+        name = f"{stem}.html"
+        if self._claimed.setdefault(name, source) != source:
+            name = f"{stem}-{hashlib.sha1(source.encode('utf-8')).hexdigest()[:8]}.html"
+            self._claimed[name] = source
+        return self.output_dir / name
+
+    def submit(self, source_path: str, html_content: str) -> Path:
+        """Queue an HTML document for writing and return its output path"""
+        output_file = self.output_path(source_path)
+        self._futures.append((source_path, self._executor.submit(self._write, output_file, html_content)))
+        return output_file
+
+    @staticmethod
+    def _write(output_file: Path, html_content: str) -> str:
+        tmp_file = output_file.with_name(output_file.name + ".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        os.replace(tmp_file, output_file)
+        return str(output_file)
+
+    def close(self) -> List[str]:
+        """
+        Wait for pending writes
+
+        Returns:
+            Paths of the HTML files written
+        """
+        written = []
+        for source_path, future in self._futures:
+            try:
+                written.append(future.result())
+            except Exception as e:
+                print(f"⚠️  Could not write HTML for {source_path}: {str(e)}")
+        self._executor.shutdown(wait=True)
+        self._futures = []
+        return written
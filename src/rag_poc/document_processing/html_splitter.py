@@ -1,27 +1,146 @@
 """
-HTML document splitter using LangChain's HTML splitter
+HTML document splitter with an lxml header sectioniser and LangChain fallback
 """
 
-from typing import List, Optional
-from langchain.text_splitter import HTMLHeaderTextSplitter
+import io
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from langchain.text_splitter import HTMLHeaderTextSplitter, RecursiveCharacterTextSplitter
 from langchain.schema import Document
+from lxml import etree
 from pathlib import Path
 
+from ..utils.tokens import EMBEDDING_ENCODING, get_token_counter
+
+
+class LxmlHeaderSectioniser:
+    """
+    Split HTML into header sections in a single lxml iterparse pass
+    
+    Produces the same Documents as LangChain's HTMLHeaderTextSplitter: one
+    Document per header holding the header text, and one per run of text
+    between headers, each with the active header hierarchy as metadata
+    (HTML comments are skipped rather than treated as text). Elements are
+    discarded as soon as their text has been read, so no DOM of the whole
+    file is kept.
+    """
+    
+    def __init__(self, headers_to_split_on: List[Tuple[str, str]]):
+        """
+        Initialize sectioniser
+        
+        Args:
+            headers_to_split_on: (tag, metadata key) pairs, e.g. ("h1", "Header 1")
+        """
+        self.header_mapping = dict(headers_to_split_on)
+        self.header_levels = {tag: int(tag[1:]) if tag[1:].isdigit() else 9999 for tag in self.header_mapping}
+    
+    def split_text(self, html_content: str) -> List[Document]:
+        """Split an HTML string"""
+        return list(self._generate_documents(io.BytesIO(html_content.encode("utf-8"))))
+    
+    def split_file(self, html_file_path: Union[str, Path]) -> List[Document]:
+        """Split an HTML file, parsing it incrementally from disk"""
+        return list(self._generate_documents(str(html_file_path)))
+    
+    @staticmethod
+    def _iter_elements(source: Any) -> Iterator[Tuple[str, str, int]]:
+        """
+        Yield (tag, own text, depth) for every element of the body in document order
+        
+        An element's own text is its leading text plus the tails of its
+        children, which are only known at its end event; a slot reserved at
+        the start event keeps the output in document order.
+        """
+        records: List[Optional[Tuple[str, str, int]]] = []
+        open_slots: List[Optional[int]] = []
+        in_body = False
+        
+        for event, element in etree.iterparse(source, events=("start", "end"), html=True,
+                                              encoding="utf-8", remove_comments=True, remove_pis=True):
+            if event == "start":
+                if element.tag == "body":
+                    in_body = True
+                if in_body:
+                    records.append(None)
+                    open_slots.append(len(records) - 1)
+                else:
+                    open_slots.append(None)
+                continue
+                
+            slot = open_slots.pop()
+            if slot is not None:
+                pieces = [element.text] + [child.tail for child in element]
+                text = " ".join(piece.strip() for piece in pieces if piece and piece.strip())
+                records[slot] = (element.tag, text, len(open_slots))
+            if element.tag == "body":
+                in_body = False
+            # Children's text and tails have been consumed
+            for child in list(element):
+                element.remove(child)
+                
+        for record in records:
+            yield record
+    
+    def _generate_documents(self, source: Any) -> Iterator[Document]:
+        # Active headers: metadata key -> (header text, level, depth)
+        active_headers: Dict[str, Tuple[str, int, int]] = {}
+        current_chunk: List[str] = []
+        
+        def finalize_chunk() -> Optional[Document]:
+            if not current_chunk:
+                return None
+            final_text = "  \n".join(line for line in current_chunk if line.strip())
+            current_chunk.clear()
+            if not final_text.strip():
+                return None
+            return Document(page_content=final_text, metadata={k: v[0] for k, v in active_headers.items()})
+            
+        for tag, text, depth in self._iter_elements(source):
+            if not text:
+                continue
+                
+            if tag in self.header_mapping:
+                doc = finalize_chunk()
+                if doc:
+                    yield doc
+                    
+                level = self.header_levels[tag]
+                for key in [k for k, (_, lvl, _) in active_headers.items() if lvl >= level]:
+                    del active_headers[key]
+                active_headers[self.header_mapping[tag]] = (text, level, depth)
+                yield Document(page_content=text, metadata={k: v[0] for k, v in active_headers.items()})
+            else:
+                # Leaving the container of a header ends its scope
+                for key in [k for k, (_, _, d) in active_headers.items() if depth < d]:
+                    del active_headers[key]
+                current_chunk.append(text)
+                
+        doc = finalize_chunk()
+        if doc:
+            yield doc
+
 
 class HTMLDocumentSplitter:
-    """Split HTML documents by sections using LangChain's HTML splitter"""
+    """Split HTML documents by sections, then split long sections to a token budget"""
+    
+    # Paragraph, line and sentence boundaries (including CJK punctuation) before words
+    SEPARATORS = ["\n\n", "\n", "。", "！", "？", "；", ". ", "! ", "? ", "; ", "，", ", ", " ", ""]
     
     def __init__(self, 
                  chunk_size: int = 1000, 
                  chunk_overlap: int = 200,
-                 headers_to_split_on: Optional[List[tuple]] = None):
+                 headers_to_split_on: Optional[List[tuple]] = None,
+                 encoding_name: str = EMBEDDING_ENCODING,
+                 backend: str = "lxml"):
         """
         Initialize HTML splitter
         
         Args:
-            chunk_size: Maximum size of each chunk
-            chunk_overlap: Overlap between chunks
+            chunk_size: Maximum size of each chunk in tokens
+            chunk_overlap: Overlap between consecutive chunks of a section in tokens
             headers_to_split_on: HTML headers to split on (h1, h2, etc.)
+            encoding_name: tiktoken encoding of the embedding model
+            backend: Header sectioniser, "lxml" (default) or "langchain"
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
@@ -40,16 +159,53 @@ class HTMLDocumentSplitter:
             self.headers_to_split_on = headers_to_split_on
         
         # Initialize the HTML splitter
-        self.html_splitter = HTMLHeaderTextSplitter(
-            headers_to_split_on=self.headers_to_split_on
+        if backend == "lxml":
+            self.html_splitter = LxmlHeaderSectioniser(self.headers_to_split_on)
+        elif backend == "langchain":
+            self.html_splitter = HTMLHeaderTextSplitter(
+                headers_to_split_on=self.headers_to_split_on
+            )
+        else:
+            raise ValueError(f"Unknown HTML splitter backend: {backend}")
+        self.backend = backend
+        
+        # Secondary splitter enforcing chunk_size/chunk_overlap within a section
+        self.count_tokens = get_token_counter(encoding_name)
+        self.text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=self.count_tokens,
+            separators=self.SEPARATORS,
+            keep_separator="end"
         )
     
-    def split_html_file(self, html_file_path: str) -> List[Document]:
+    def _split_sections(self, html_content: Optional[str] = None, html_path: Optional[Path] = None) -> List[Document]:
+        """Split HTML by headers, then split sections longer than chunk_size tokens"""
+        if html_path is not None and isinstance(self.html_splitter, LxmlHeaderSectioniser):
+            sections = self.html_splitter.split_file(html_path)
+        else:
+            if html_content is None:
+                with open(html_path, 'r', encoding='utf-8') as f:
+                    html_content = f.read()
+            sections = self.html_splitter.split_text(html_content)
+            
+        chunks = []
+        for section in sections:
+            if self.count_tokens(section.page_content) <= self.chunk_size:
+                chunks.append(section)
+                continue
+            # Every piece keeps the section's header metadata
+            chunks.extend(self.text_splitter.create_documents([section.page_content], [section.metadata]))
+        return chunks
+    
+    def split_html_file(self, html_file_path: str, source_name: Optional[str] = None) -> List[Document]:
         """
         Split HTML file into chunks
         
         Args:
             html_file_path: Path to HTML file
+            source_name: Source recorded in the chunks, normally the document the HTML
+                was converted from (default: the HTML file path)
             
         Returns:
             List of Document objects
@@ -59,17 +215,13 @@ class HTMLDocumentSplitter:
         if not html_path.exists():
             raise FileNotFoundError(f"HTML file not found: {html_file_path}")
         
-        # Read HTML content
-        with open(html_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        
-        # Split HTML content
-        html_docs = self.html_splitter.split_text(html_content)
+        # Split HTML content (the lxml sectioniser streams the file from disk)
+        html_docs = self._split_sections(html_path=html_path)
         
         # Add metadata to documents
         for i, doc in enumerate(html_docs):
             doc.metadata.update({
-                'source': str(html_path),
+                'source': source_name or str(html_path),
                 'chunk_id': i,
                 'total_chunks': len(html_docs)
             })
@@ -88,7 +240,7 @@ class HTMLDocumentSplitter:
             List of Document objects
         """
         # Split HTML content
-        html_docs = self.html_splitter.split_text(html_content)
+        html_docs = self._split_sections(html_content)
         
         # Add metadata to documents
         for i, doc in enumerate(html_docs):
@@ -136,21 +288,24 @@ class HTMLDocumentSplitter:
         
         return all_docs
     
-    def split_multiple_files(self, html_file_paths: List[str]) -> List[Document]:
+    def split_multiple_files(self,
+                             html_file_paths: List[str],
+                             source_names: Optional[List[str]] = None) -> List[Document]:
         """
         Split multiple HTML files
         
         Args:
             html_file_paths: List of HTML file paths
+            source_names: Source recorded for each file's chunks (default: the HTML file paths)
             
         Returns:
             List of all Document objects from all files
         """
         all_docs = []
         
-        for html_file_path in html_file_paths:
+        for i, html_file_path in enumerate(html_file_paths):
             try:
-                docs = self.split_html_file(html_file_path)
+                docs = self.split_html_file(html_file_path, source_names[i] if source_names else None)
                 all_docs.extend(docs)
                 print(f"Split {html_file_path} into {len(docs)} chunks")
             except Exception as e:
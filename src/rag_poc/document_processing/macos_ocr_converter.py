@@ -29,16 +29,28 @@ try:
 except ImportError:
     PyPDF2 = None
 
+from .conversion_cache import ConversionCache, cached_convert_to_html
+from .ocr_triage import convert_with_ocr_triage
+from .page_ranges import DEFAULT_PAGES_PER_RANGE, convert_pdf_pages
+from .parallel_conversion import convert_batch_parallel
+
 
 class MacOSOCRConverter:
     """Convert documents using Docling with macOS Vision framework OCR"""
     
-    def __init__(self, force_full_page_ocr: bool = True, lang: List[str] = None):
+    def __init__(self, force_full_page_ocr: bool = True, lang: List[str] = None,
+                 cache_path: Optional[str] = None,
+                 page_workers: int = 1, pages_per_range: int = DEFAULT_PAGES_PER_RANGE,
+                 ocr_triage: bool = True):
         """Initialize macOS OCR converter with Docling and OcrMacOptions
         
         Args:
             force_full_page_ocr: Whether to force OCR on entire page (default: True)
             lang: Languages for OCR (default: ['en-US', 'zh-Hans', 'zh-Hant'])
+            cache_path: Conversion cache file (optional, disables caching when not set)
+            page_workers: Worker processes converting page ranges of large PDFs (default: 1, off)
+            pages_per_range: Pages per range when page_workers > 1
+            ocr_triage: Only OCR PDF pages without a text layer (default: True)
         """
         self.supported_formats = [
             '.pdf', '.docx', '.doc', '.pptx', '.ppt', 
@@ -58,9 +70,16 @@ class MacOSOCRConverter:
         # Set default languages (prioritize English and Chinese)
         self.lang = lang or ['en-US', 'zh-Hans', 'zh-Hant', 'fr-FR', 'de-DE', 'es-ES']
         self.force_full_page_ocr = force_full_page_ocr
+        self.ocr_triage = ocr_triage
+        self.cache_path = cache_path
+        self.conversion_cache = ConversionCache(cache_path) if cache_path else None
+        self.page_workers = page_workers
+        self.pages_per_range = pages_per_range
         
         # Initialize Docling converter with macOS OCR options
         self.converter = self._initialize_converter()
+        # No-OCR converter for pages with a text layer, created on first use
+        self.text_converter = None
         
         print(f"✅ macOS OCR converter initialized with Docling")
         print(f"   Force full page OCR: {self.force_full_page_ocr}")
@@ -104,7 +123,26 @@ class MacOSOCRConverter:
         except Exception as e:
             raise RuntimeError(f"Failed to initialize macOS OCR converter: {e}")
     
-    def _fallback_extract_pdf_text(self, pdf_path: str) -> Optional[str]:
+    def _get_text_converter(self) -> DocumentConverter:
+        """Get the DocumentConverter used for pages that already have a text layer"""
+        if self.text_converter is None:
+            self.text_converter = DocumentConverter(
+                pipeline_options=PipelineOptions(do_ocr=False, do_table_structure=True)
+            )
+        return self.text_converter
+    
+    def _docling_to_html(self, input_path: Path) -> str:
+        """Convert with Docling, running OCR only on scanned pages when triage is enabled"""
+        if not self.ocr_triage:
+            return self.converter.convert(input_path).document.export_to_html()
+        
+        return convert_with_ocr_triage(
+            str(input_path),
+            lambda path: self.converter.convert(path).document.export_to_html(),
+            lambda path: self._get_text_converter().convert(path).document.export_to_html()
+        )
+    
+    def _fallback_extract_pdf_text(self, pdf_path: str, first_page: int = 1) -> Optional[str]:
         """Fallback: Try to extract text directly from PDF using PyPDF2"""
         if not PyPDF2:
             return None
@@ -115,7 +153,7 @@ class MacOSOCRConverter:
                 pdf_reader = PyPDF2.PdfReader(file)
                 all_text = []
                 
-                for page_num, page in enumerate(pdf_reader.pages, 1):
+                for page_num, page in enumerate(pdf_reader.pages, first_page):
                     text = page.extract_text().strip()
                     if text:
                         all_text.append(f"<h2>Page {page_num}</h2>\n<div class='page-content'><p>{text}</p></div>")
@@ -145,19 +183,45 @@ class MacOSOCRConverter:
         """
         input_path = Path(file_path)
         
-        if not input_path.exists():
-            raise FileNotFoundError(f"Input file not found: {file_path}")
-        
-        if not self.is_supported_format(file_path):
-            raise ValueError(f"Unsupported file format: {input_path.suffix}")
-        
         # Set output directory
         if output_dir is None:
             output_dir = input_path.parent
         else:
             output_dir = Path(output_dir)
             output_dir.mkdir(parents=True, exist_ok=True)
+            
+        html_content = self.convert_to_html(file_path)
+        
+        # Save HTML file
+        output_file = output_dir / f"{input_path.stem}.html"
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+            
+        print(f"✅ macOS OCR conversion completed: {output_file}")
+        return str(output_file)
+    
+    def convert_to_html(self, file_path: str) -> str:
+        """
+        Convert document to HTML content (without saving to file), reusing a cached conversion
         
+        Args:
+            file_path: Path to the input file
+            
+        Returns:
+            HTML content as string
+        """
+        return cached_convert_to_html(self, file_path, lambda: convert_pdf_pages(self, file_path))
+    
+    def _convert_to_html(self, file_path: str, first_page: int = 1) -> str:
+        """Convert document (or a page range starting at first_page) to HTML content, bypassing the conversion cache"""
+        input_path = Path(file_path)
+        
+        if not input_path.exists():
+            raise FileNotFoundError(f"Input file not found: {file_path}")
+            
+        if not self.is_supported_format(file_path):
+            raise ValueError(f"Unsupported file format: {input_path.suffix}")
+            
         print(f"Converting {input_path.name} using Docling with macOS OCR...")
         
         extracted_content = None
@@ -165,8 +229,7 @@ class MacOSOCRConverter:
         # Try Docling with macOS OCR first
         try:
             print("🔄 Using Docling with macOS Vision OCR...")
-            result = self.converter.convert(input_path)
-            extracted_content = result.document.export_to_html()
+            extracted_content = self._docling_to_html(input_path)
             print("✅ Docling macOS OCR conversion successful")
             
         except Exception as e:
@@ -174,14 +237,14 @@ class MacOSOCRConverter:
             
             # Fallback to PyPDF2 for PDFs only
             if input_path.suffix.lower() == '.pdf':
-                extracted_content = self._fallback_extract_pdf_text(str(input_path))
+                extracted_content = self._fallback_extract_pdf_text(str(input_path), first_page)
         
         if extracted_content is None:
             raise RuntimeError(f"All conversion methods failed for {file_path}")
         
         # Generate complete HTML document if needed
         if not extracted_content.strip().startswith('<!DOCTYPE html>'):
-            html_content = f"""<!DOCTYPE html>
+            return f"""<!DOCTYPE html>
 <html>
 <head>
 <title>{input_path.stem}</title>
@@ -192,28 +255,31 @@ class MacOSOCRConverter:
 {extracted_content}
 </body>
 </html>"""
-        else:
-            html_content = extracted_content
-        
-        # Save HTML file
-        output_file = output_dir / f"{input_path.stem}.html"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        print(f"✅ macOS OCR conversion completed: {output_file}")
-        return str(output_file)
+        return extracted_content
     
-    def convert_batch(self, file_paths: List[str], output_dir: Optional[str] = None) -> List[str]:
+    def convert_batch(self, 
+                      file_paths: List[str], 
+                      output_dir: Optional[str] = None,
+                      workers: int = 1,
+                      timeout: Optional[float] = None) -> List[str]:
         """
         Convert multiple files to HTML using macOS OCR via Docling
         
         Args:
             file_paths: List of input file paths
             output_dir: Output directory
+            workers: Number of worker processes (1 converts serially in this process)
+            timeout: Per-file timeout in seconds (runs in worker processes when set)
             
         Returns:
             List of generated HTML file paths
         """
+        if workers > 1 or timeout is not None:
+            return convert_batch_parallel(
+                type(self), self._init_kwargs(), file_paths, output_dir,
+                workers=workers, timeout=timeout
+            )
+        
         html_files = []
         
         print(f"Starting Docling macOS OCR batch conversion of {len(file_paths)} files...")
@@ -230,6 +296,11 @@ class MacOSOCRConverter:
         print(f"\n✅ Docling macOS OCR batch conversion completed: {len(html_files)}/{len(file_paths)} files successful")
         return html_files
     
+    def _init_kwargs(self) -> dict:
+        """Constructor arguments that rebuild this converter in a worker process"""
+        return {'force_full_page_ocr': self.force_full_page_ocr, 'lang': self.lang, 'cache_path': self.cache_path,
+                'ocr_triage': self.ocr_triage}
+    
     def is_supported_format(self, file_path: str) -> bool:
         """Check if file format is supported"""
         file_extension = Path(file_path).suffix.lower()
@@ -267,55 +338,3 @@ class MacOSOCRConverter:
                 info["docling_version"] = 'unknown'
         
         return info
-    
-    def convert_to_html(self, file_path: str) -> str:
-        """
-        Convert document to HTML content (without saving to file)
-        
-        Args:
-            file_path: Path to input document
-            
-        Returns:
-            HTML content as string
-        """
-        if not self.is_supported_format(file_path):
-            raise ValueError(f"File format not supported: {file_path}")
-        
-        input_path = Path(file_path)
-        if not input_path.exists():
-            raise FileNotFoundError(f"Input file not found: {file_path}")
-        
-        try:
-            # Convert using Docling
-            conv_result = self.converter.convert(input_path)
-            html_content = conv_result.document.export_to_html()
-            print(f"✅ Docling macOS OCR conversion successful: {file_path}")
-            return html_content
-            
-        except Exception as e:
-            print(f"⚠️  Docling conversion failed for {file_path}: {str(e)}")
-            
-            # Try fallback for PDFs
-            if input_path.suffix.lower() == '.pdf' and PyPDF2:
-                try:
-                    fallback_text = self._fallback_extract_pdf_text(str(input_path))
-                    if fallback_text:
-                        html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <title>{input_path.stem}</title>
-    <meta charset='utf-8'>
-</head>
-<body>
-    <h1>{input_path.stem}</h1>
-    <div class='content'>
-        {''.join(f'<p>{para}</p>' for para in fallback_text.split('\n\n') if para.strip())}
-    </div>
-</body>
-</html>"""
-                        print(f"✅ PyPDF2 fallback conversion successful: {file_path}")
-                        return html_content
-                except Exception as fallback_e:
-                    print(f"❌ PyPDF2 fallback also failed: {str(fallback_e)}")
-            
-            raise Exception(f"All conversion methods failed for {file_path}: {str(e)}")
\ No newline at end of file
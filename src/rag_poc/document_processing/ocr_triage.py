@@ -0,0 +1,115 @@
+"""
+Per-page OCR triage of PDFs based on their embedded text layer
+
+Born-digital pages carry a text layer that Docling can read directly, so only
+image-only (scanned) pages need OCR. A PyPDF2 pre-pass classifies every page;
+consecutive pages of the same kind are converted together, text pages without
+OCR and scanned pages with it, and the results are joined in page order.
+"""
+
+import tempfile
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+from .page_ranges import stitch_html, write_pdf_pages
+
+# Letters/digits a page's text layer needs to skip OCR (page numbers and
+# running headers alone do not count)
+MIN_TEXT_CHARS = 64
+
+# Text runs shorter than this between scanned pages are OCRed with their
+# neighbours instead of paying for a separate conversion
+MIN_TEXT_RUN = 3
+
+
+def page_has_text_layer(page) -> bool:
+    """Check whether a PyPDF2 page has enough extractable text to skip OCR"""
+    try:
+        text = page.extract_text() or ""
+    except Exception:
+        return False
+    return sum(ch.isalnum() for ch in text) >= MIN_TEXT_CHARS
+
+
+def group_pages(has_text: List[bool]) -> List[Tuple[int, int, bool]]:
+    """
+    Group pages into runs that are converted together
+
+    Args:
+        has_text: Per-page text layer flags
+
+    Returns:
+        List of (start, end, has_text) page index ranges [start, end) in page order
+    """
+    runs: List[List] = []
+    for index, flag in enumerate(has_text):
+        if runs and runs[-1][2] == flag:
+            runs[-1][1] = index + 1
+        else:
+            runs.append([index, index + 1, flag])
+
+    # Fold short text runs into the surrounding OCR runs
+    merged: List[List] = []
+    for start, end, flag in runs:
+        if flag and end - start < MIN_TEXT_RUN and 0 < start and end < len(has_text):
+            flag = False
+        if merged and merged[-1][2] == flag:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end, flag])
+    return [tuple(run) for run in merged]
+
+
+def convert_with_ocr_triage(file_path: str,
+                            convert_ocr: Callable[[Path], str],
+                            convert_text: Callable[[Path], str]) -> str:
+    """
+    Convert a PDF, running OCR only on pages without a text layer
+
+    Args:
+        file_path: Input PDF
+        convert_ocr: Converts a PDF to HTML with OCR
+        convert_text: Converts a PDF to HTML from its text layer (no OCR)
+
+    Returns:
+        HTML content as string
+    """
+    input_path = Path(file_path)
+    if PyPDF2 is None or input_path.suffix.lower() != '.pdf':
+        return convert_ocr(input_path)
+
+    try:
+        with open(input_path, 'rb') as f:
+            reader = PyPDF2.PdfReader(f)
+            has_text = [page_has_text_layer(page) for page in reader.pages]
+    except Exception as e:
+        print(f"⚠️  Could not inspect text layer of {input_path.name}, using OCR: {str(e)}")
+        return convert_ocr(input_path)
+
+    text_pages = sum(has_text)
+    print(f"🔎 {input_path.name}: {text_pages}/{len(has_text)} pages have a text layer")
+    if text_pages == len(has_text):
+        print("⚡ Skipping OCR (text layer on every page)")
+        return convert_text(input_path)
+    if text_pages == 0:
+        return convert_ocr(input_path)
+
+    runs = group_pages(has_text)
+    ocr_pages = sum(end - start for start, end, flag in runs if not flag)
+    print(f"⚡ OCR on {ocr_pages} pages, text layer on {len(has_text) - ocr_pages} pages ({len(runs)} runs)")
+
+    parts = []
+    with tempfile.TemporaryDirectory(prefix="rag_poc_triage_") as run_dir, open(input_path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        for index, (start, end, flag) in enumerate(runs):
+            # Same file name as the input so converters title every run alike
+            run_path = Path(run_dir) / f"{index:04d}" / input_path.name
+            write_pdf_pages(reader, start, end, run_path)
+            parts.append(convert_text(run_path) if flag else convert_ocr(run_path))
+
+    return stitch_html(parts, input_path.stem)
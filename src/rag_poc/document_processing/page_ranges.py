@@ -0,0 +1,154 @@
+"""
+Page-range parallel conversion of large PDFs
+
+A PDF with more pages than one range is split into page-range PDFs that are
+converted by a pool of worker processes. The body contents of the converted
+ranges are concatenated in page order inside the first range's document, so
+text at the start of a range stays under the last header of the previous
+range when the HTML is split into sections.
+"""
+
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+from .parallel_conversion import run_in_worker_pool
+
+# Pages converted per task; small enough to balance work across workers
+DEFAULT_PAGES_PER_RANGE = 20
+
+_BODY_RE = re.compile(r"<body[^>]*>(.*)</body>", re.IGNORECASE | re.DOTALL)
+
+
+def count_pdf_pages(file_path: str) -> int:
+    """Return the page count of a PDF, or 0 if it cannot be read"""
+    if PyPDF2 is None or Path(file_path).suffix.lower() != '.pdf':
+        return 0
+    try:
+        with open(file_path, 'rb') as f:
+            return len(PyPDF2.PdfReader(f).pages)
+    except Exception:
+        return 0
+
+
+def write_pdf_pages(reader, start: int, end: int, output_path: Path) -> None:
+    """Write pages [start, end) of an open PdfReader to a new PDF file"""
+    writer = PyPDF2.PdfWriter()
+    for page in reader.pages[start:end]:
+        writer.add_page(page)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'wb') as out:
+        writer.write(out)
+
+
+def split_pdf(file_path: str, pages_per_range: int, output_dir: str) -> List[Tuple[str, int]]:
+    """
+    Write consecutive page ranges of a PDF to separate files
+
+    Every range keeps the original file name in its own sub-directory, so
+    converters title each range like the whole document.
+
+    Args:
+        file_path: Input PDF
+        pages_per_range: Pages per output file
+        output_dir: Directory to write the ranges into
+
+    Returns:
+        List of (range file path, 1-based number of its first page) in page order
+    """
+    ranges = []
+    with open(file_path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        total = len(reader.pages)
+        for index, start in enumerate(range(0, total, pages_per_range)):
+            range_path = Path(output_dir) / f"{index:04d}" / Path(file_path).name
+            write_pdf_pages(reader, start, start + pages_per_range, range_path)
+            ranges.append((str(range_path), start + 1))
+    return ranges
+
+
+def stitch_html(parts: List[str], title: str) -> str:
+    """
+    Join converted page ranges into one HTML document
+
+    Args:
+        parts: HTML of each range, in page order
+        title: Document title; a leading "<h1>{title}</h1>" added by the
+            converter is kept only once
+
+    Returns:
+        HTML content as string
+    """
+    title_re = re.compile(r"\s*<h1>" + re.escape(title) + r"</h1>")
+    bodies = []
+    for i, html_content in enumerate(parts):
+        match = _BODY_RE.search(html_content)
+        body = match.group(1) if match else html_content
+        title_match = title_re.match(body) if i > 0 else None
+        if title_match:
+            body = body[title_match.end():]
+        if body.strip():
+            bodies.append(body.strip("\n"))
+
+    first = _BODY_RE.search(parts[0])
+    if first is None:
+        return "\n".join(bodies)
+    return parts[0][:first.start(1)] + "\n" + "\n".join(bodies) + "\n" + parts[0][first.end(1):]
+
+
+def convert_pdf_pages(converter, file_path: str) -> str:
+    """
+    Convert a document with the converter, splitting large PDFs into page ranges
+
+    PDFs with more than converter.pages_per_range pages are converted range by
+    range in converter.page_workers worker processes; everything else goes
+    straight to converter._convert_to_html.
+
+    Args:
+        converter: Converter instance (uses page_workers, pages_per_range,
+            _convert_to_html and _init_kwargs())
+        file_path: Input document
+
+    Returns:
+        HTML content as string
+    """
+    page_workers = getattr(converter, "page_workers", 1)
+    pages_per_range = getattr(converter, "pages_per_range", DEFAULT_PAGES_PER_RANGE)
+    page_count = count_pdf_pages(file_path) if page_workers > 1 else 0
+    if page_count <= pages_per_range:
+        return converter._convert_to_html(file_path)
+
+    name = Path(file_path).name
+    start_time = time.monotonic()
+    with tempfile.TemporaryDirectory(prefix="rag_poc_pages_") as range_dir:
+        ranges = split_pdf(file_path, pages_per_range, range_dir)
+        print(f"📑 Converting {name} as {len(ranges)} page ranges with {page_workers} workers...")
+
+        def report(task_index: int, success: bool, value) -> None:
+            first_page = ranges[task_index][1]
+            last_page = min(first_page + pages_per_range - 1, page_count)
+            status = "✅" if success else f"❌ {value}"
+            print(f"   [{task_index + 1}/{len(ranges)}] pages {first_page}-{last_page} {status}")
+
+        results = run_in_worker_pool(
+            type(converter),
+            converter._init_kwargs(),
+            "_convert_to_html",
+            ranges,
+            workers=page_workers,
+            on_result=report
+        )
+
+    failed = [f"pages {ranges[i][1]}+: {value}" for i, (success, value) in enumerate(results) if not success]
+    if failed:
+        raise RuntimeError(f"Page-range conversion failed for {file_path}: {'; '.join(failed)}")
+
+    print(f"✅ Converted {len(ranges)} page ranges of {name} in {time.monotonic() - start_time:.1f}s")
+    return stitch_html([value for _, value in results], Path(file_path).stem)
@@ -0,0 +1,239 @@
+"""
+Parallel document conversion across a pool of worker processes
+
+Each worker process builds its converter once and then converts one file at a
+time. The parent tracks which file every worker is busy with, so a worker that
+crashes (e.g. a segfault inside a native PDF library) or exceeds the per-file
+timeout only fails that file: the worker is replaced and the batch continues.
+"""
+
+import multiprocessing
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Seconds between liveness/timeout checks while waiting for results
+POLL_INTERVAL = 0.5
+
+
+def _worker_main(converter_class: type, init_kwargs: Dict[str, Any], method: str, conn) -> None:
+    """Worker process entry point: build the converter once, then serve tasks"""
+    try:
+        converter = converter_class(**init_kwargs)
+    except Exception as e:
+        conn.send(("init_error", f"{type(e).__name__}: {e}"))
+        return
+
+    conn.send(("ready", None))
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+
+        try:
+            result = getattr(converter, method)(*task)
+            conn.send(("ok", result))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    """Handle on one worker process and the task it is currently running"""
+
+    def __init__(self, context, converter_class: type, init_kwargs: Dict[str, Any], method: str):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(converter_class, init_kwargs, method, child_conn),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.task_index: Optional[int] = None
+        self.started_at = 0.0
+
+    @property
+    def busy(self) -> bool:
+        return self.task_index is not None
+
+    def assign(self, task_index: int, args: Tuple) -> None:
+        self.conn.send(args)
+        self.task_index = task_index
+        self.started_at = time.monotonic()
+
+    def stop(self, force: bool = False) -> None:
+        if force:
+            self.process.terminate()
+        else:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def run_in_worker_pool(converter_class: type,
+                       init_kwargs: Dict[str, Any],
+                       method: str,
+                       task_args: List[Tuple],
+                       workers: int,
+                       timeout: Optional[float] = None,
+                       on_result: Optional[Callable[[int, bool, Any], None]] = None) -> List[Tuple[bool, Any]]:
+    """
+    Run converter method calls in a pool of worker processes
+
+    Args:
+        converter_class: Converter class, instantiated once per worker
+        init_kwargs: Constructor arguments for the converter
+        method: Name of the converter method to call for each task
+        task_args: Positional arguments of each call
+        workers: Number of worker processes
+        timeout: Per-task timeout in seconds (optional)
+        on_result: Callback invoked as (task_index, success, result_or_error) when a task finishes
+
+    Returns:
+        List of (success, result_or_error) tuples in task order
+    """
+    context = multiprocessing.get_context("spawn")
+    results: List[Optional[Tuple[bool, Any]]] = [None] * len(task_args)
+    pending = deque(range(len(task_args)))
+
+    def finish(task_index: int, success: bool, value: Any) -> None:
+        results[task_index] = (success, value)
+        if on_result is not None:
+            on_result(task_index, success, value)
+
+    pool = [_Worker(context, converter_class, init_kwargs, method)
+            for _ in range(max(1, min(workers, len(task_args))))]
+    init_errors: List[str] = []
+
+    try:
+        while pending or any(w.busy for w in pool):
+            if not pool:
+                # Every worker failed to initialize; nothing can run the remaining tasks
+                reason = init_errors[-1] if init_errors else "no workers available"
+                while pending:
+                    finish(pending.popleft(), False, f"Converter initialization failed: {reason}")
+                break
+
+            for worker in pool:
+                if worker.ready and not worker.busy and pending:
+                    task_index = pending.popleft()
+                    worker.assign(task_index, task_args[task_index])
+
+            wait([w.conn for w in pool] + [w.process.sentinel for w in pool], timeout=POLL_INTERVAL)
+
+            for worker in list(pool):
+                if worker.conn.poll():
+                    try:
+                        status, value = worker.conn.recv()
+                    except EOFError:
+                        status, value = "crashed", None
+                else:
+                    status, value = None, None
+
+                if status == "ready":
+                    worker.ready = True
+                    continue
+                if status == "init_error":
+                    init_errors.append(value)
+                    worker.stop(force=True)
+                    pool.remove(worker)
+                    continue
+                if status in ("ok", "error"):
+                    task_index = worker.task_index
+                    worker.task_index = None
+                    finish(task_index, status == "ok", value)
+                    continue
+
+                crashed = status == "crashed" or not worker.process.is_alive()
+                timed_out = (worker.busy and timeout is not None
+                             and time.monotonic() - worker.started_at > timeout)
+                if not (crashed or timed_out):
+                    continue
+
+                if not worker.ready:
+                    # Died while building its converter; replacing it would just crash again
+                    init_errors.append(f"worker exited with code {worker.process.exitcode}")
+                    worker.stop(force=True)
+                    pool.remove(worker)
+                    continue
+
+                # Isolate the failure to the current task and replace the worker
+                task_index = worker.task_index
+                worker.stop(force=True)
+                pool.remove(worker)
+                if task_index is not None:
+                    if timed_out:
+                        finish(task_index, False, f"Timed out after {timeout:.0f}s")
+                    else:
+                        finish(task_index, False,
+                               f"Worker process crashed (exit code {worker.process.exitcode})")
+                if pending:
+                    pool.append(_Worker(context, converter_class, init_kwargs, method))
+    finally:
+        interrupted = any(w.busy for w in pool)
+        for worker in pool:
+            worker.stop(force=interrupted)
+
+    return results
+
+
+def convert_batch_parallel(converter_class: type,
+                           init_kwargs: Dict[str, Any],
+                           file_paths: List[str],
+                           output_dir: Optional[str] = None,
+                           workers: int = 1,
+                           timeout: Optional[float] = None) -> List[str]:
+    """
+    Convert multiple files to HTML in parallel worker processes
+
+    Args:
+        converter_class: Converter class, instantiated once per worker
+        init_kwargs: Constructor arguments for the converter
+        file_paths: List of input file paths
+        output_dir: Output directory
+        workers: Number of worker processes
+        timeout: Per-file timeout in seconds (optional)
+
+    Returns:
+        List of generated HTML file paths, in input order
+    """
+    if not file_paths:
+        return []
+
+    total = len(file_paths)
+    print(f"Starting parallel conversion of {total} files with {workers} workers...")
+    start_time = time.monotonic()
+
+    def report(task_index: int, success: bool, value: Any) -> None:
+        if success:
+            print(f"[{task_index + 1}/{total}] ✅ Converted: {file_paths[task_index]} -> {value}")
+        else:
+            print(f"[{task_index + 1}/{total}] ❌ Error converting {file_paths[task_index]}: {value}")
+
+    results = run_in_worker_pool(
+        converter_class,
+        init_kwargs,
+        "convert_file",
+        [(file_path, output_dir) for file_path in file_paths],
+        workers=workers,
+        timeout=timeout,
+        on_result=report
+    )
+
+    html_files = [value for success, value in results if success]
+    elapsed = time.monotonic() - start_time
+    print(f"\n✅ Parallel conversion completed: {len(html_files)}/{total} files successful in {elapsed:.1f}s")
+    return html_files
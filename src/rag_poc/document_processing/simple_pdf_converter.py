@@ -10,14 +10,31 @@ try:
 except ImportError:
     PyPDF2 = None
 
+from .conversion_cache import ConversionCache, cached_convert_to_html
+from .page_ranges import DEFAULT_PAGES_PER_RANGE, convert_pdf_pages
+from .parallel_conversion import convert_batch_parallel
+
 
 class SimplePDFConverter:
     """Simple PDF to text converter without OCR"""
     
-    def __init__(self):
+    def __init__(self, cache_path: Optional[str] = None,
+                 page_workers: int = 1, pages_per_range: int = DEFAULT_PAGES_PER_RANGE):
+        """
+        Initialize simple PDF converter
+        
+        Args:
+            cache_path: Conversion cache file (optional, disables caching when not set)
+            page_workers: Worker processes converting page ranges of large PDFs (default: 1, off)
+            pages_per_range: Pages per range when page_workers > 1
+        """
         if PyPDF2 is None:
             raise ImportError("PyPDF2 not installed. Run: pip install PyPDF2")
         self.supported_formats = ['.pdf']
+        self.cache_path = cache_path
+        self.conversion_cache = ConversionCache(cache_path) if cache_path else None
+        self.page_workers = page_workers
+        self.pages_per_range = pages_per_range
     
     def convert_file(self, file_path: str, output_dir: Optional[str] = None) -> str:
         """
@@ -45,11 +62,7 @@ class SimplePDFConverter:
             output_dir = Path(output_dir)
             output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Extract text from PDF
-        text_content = self._extract_text_from_pdf(input_path)
-        
-        # Convert to simple HTML
-        html_content = self._text_to_html(text_content, input_path.stem)
+        html_content = self.convert_to_html(file_path)
         
         # Save HTML file
         output_file = output_dir / f"{input_path.stem}.html"
@@ -58,7 +71,7 @@ class SimplePDFConverter:
         
         return str(output_file)
     
-    def _extract_text_from_pdf(self, pdf_path: Path) -> str:
+    def _extract_text_from_pdf(self, pdf_path: Path, first_page: int = 1) -> str:
         """Extract text from PDF using PyPDF2"""
         text_content = ""
         
@@ -66,7 +79,7 @@ class SimplePDFConverter:
             with open(pdf_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 
-                for page_num, page in enumerate(pdf_reader.pages):
+                for page_num, page in enumerate(pdf_reader.pages, first_page - 1):
                     page_text = page.extract_text()
                     if page_text.strip():
                         text_content += f"\n\n=== Page {page_num + 1} ===\n\n"
@@ -128,17 +141,29 @@ class SimplePDFConverter:
         
         return "\n".join(html_paragraphs)
     
-    def convert_batch(self, file_paths: List[str], output_dir: Optional[str] = None) -> List[str]:
+    def convert_batch(self, 
+                      file_paths: List[str], 
+                      output_dir: Optional[str] = None,
+                      workers: int = 1,
+                      timeout: Optional[float] = None) -> List[str]:
         """
         Convert multiple PDF files to HTML
         
         Args:
             file_paths: List of input file paths
             output_dir: Output directory
+            workers: Number of worker processes (1 converts serially in this process)
+            timeout: Per-file timeout in seconds (runs in worker processes when set)
             
         Returns:
             List of generated HTML file paths
         """
+        if workers > 1 or timeout is not None:
+            return convert_batch_parallel(
+                type(self), self._init_kwargs(), file_paths, output_dir,
+                workers=workers, timeout=timeout
+            )
+        
         html_files = []
         
         for file_path in file_paths:
@@ -152,6 +177,10 @@ class SimplePDFConverter:
         
         return html_files
     
+    def _init_kwargs(self) -> dict:
+        """Constructor arguments that rebuild this converter in a worker process"""
+        return {'cache_path': self.cache_path}
+    
     def is_supported_format(self, file_path: str) -> bool:
         """Check if file format is supported"""
         file_extension = Path(file_path).suffix.lower()
@@ -159,14 +188,18 @@ class SimplePDFConverter:
     
     def convert_to_html(self, file_path: str) -> str:
         """
-        Convert PDF file to HTML content (without saving to file)
+        Convert document to HTML content (without saving to file), reusing a cached conversion
         
         Args:
-            file_path: Path to PDF file
+            file_path: Path to the input file
             
         Returns:
             HTML content as string
         """
+        return cached_convert_to_html(self, file_path, lambda: convert_pdf_pages(self, file_path))
+    
+    def _convert_to_html(self, file_path: str, first_page: int = 1) -> str:
+        """Convert document (or a page range starting at first_page) to HTML content, bypassing the conversion cache"""
         if not self.is_supported_format(file_path):
             raise ValueError(f"File format not supported: {file_path}")
         
@@ -175,7 +208,7 @@ class SimplePDFConverter:
             raise FileNotFoundError(f"PDF file not found: {file_path}")
         
         # Extract text from PDF
-        text_content = self._extract_text_from_pdf(pdf_path)
+        text_content = self._extract_text_from_pdf(pdf_path, first_page)
         
         # Convert to HTML
         html_content = self._text_to_html(text_content, pdf_path.stem)
@@ -0,0 +1,111 @@
+"""
+Change detection for incremental index sync against a content-hash manifest
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+
+def file_sha256(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """Hash file contents in blocks so large documents are not read into memory at once"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def scan_sources(paths: List[str], is_supported: Callable[[str], bool]) -> Tuple[List[str], List[str]]:
+    """
+    Expand files and directories into the supported documents they contain
+
+    Args:
+        paths: Files and/or directories (searched recursively)
+        is_supported: Predicate deciding whether a file can be converted
+
+    Returns:
+        Tuple of (absolute document paths, absolute directories that were scanned)
+    """
+    files = []
+    directories = []
+    for path in paths:
+        path = Path(path).resolve()
+        if path.is_dir():
+            directories.append(str(path))
+            files.extend(str(p) for p in sorted(path.rglob("*")) if p.is_file() and is_supported(str(p)))
+        elif path.is_file() and is_supported(str(path)):
+            files.append(str(path))
+    return list(dict.fromkeys(files)), directories
+
+
+class SyncPlan:
+    """Files to add, re-index, drop or leave alone in one sync run"""
+
+    def __init__(self):
+        self.new: List[str] = []
+        self.changed: List[str] = []
+        self.removed: List[str] = []
+        self.unchanged: List[str] = []
+        # Files whose mtime moved but whose content hash did not
+        self.touched: Dict[str, Dict] = {}
+        self.hashes: Dict[str, str] = {}
+
+    @property
+    def to_index(self) -> List[str]:
+        return self.new + self.changed
+
+    def summary(self) -> Dict[str, int]:
+        return {"new": len(self.new), "changed": len(self.changed), "removed": len(self.removed),
+                "unchanged": len(self.unchanged) + len(self.touched)}
+
+
+def plan_sync(files: List[str],
+              directories: List[str],
+              explicit_files: List[str],
+              manifest: Dict[str, Dict]) -> SyncPlan:
+    """
+    Compare the current files against the manifest
+
+    A file whose size and mtime match its manifest entry is assumed unchanged
+    without reading it; otherwise its content hash decides.
+
+    Args:
+        files: Documents currently present
+        directories: Scanned directories; manifest entries under them that are no
+            longer present count as removed
+        explicit_files: Files named directly; removed if they no longer exist
+        manifest: Manifest entries by document path
+
+    Returns:
+        SyncPlan describing the delta
+    """
+    plan = SyncPlan()
+    present = set(files)
+
+    for file_path in files:
+        entry = manifest.get(file_path)
+        stat = os.stat(file_path)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            plan.unchanged.append(file_path)
+            continue
+
+        content_hash = file_sha256(file_path)
+        plan.hashes[file_path] = content_hash
+        if entry is None:
+            plan.new.append(file_path)
+        elif entry["content_hash"] != content_hash:
+            plan.changed.append(file_path)
+        else:
+            plan.touched[file_path] = {"mtime": stat.st_mtime, "size": stat.st_size}
+
+    prefixes = [os.path.join(directory, "") for directory in directories]
+    explicit = {str(Path(p).resolve()) for p in explicit_files}
+    for file_path in manifest:
+        if file_path in present:
+            continue
+        if file_path in explicit or any(file_path.startswith(prefix) for prefix in prefixes):
+            plan.removed.append(file_path)
+
+    return plan
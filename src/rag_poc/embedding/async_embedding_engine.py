@@ -0,0 +1,355 @@
+"""
+Concurrent asyncio embedding engine with a rate-limit-aware request scheduler
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from langchain.embeddings.base import Embeddings
+from openai import AsyncAzureOpenAI, APIConnectionError, APIStatusError, RateLimitError
+
+from ..utils.tokens import get_token_counter
+
+
+class RateLimitWindow:
+    """
+    Sliding one-minute window over requests and tokens (RPM/TPM quotas)
+
+    The window is guarded by a thread lock and waiters sleep on their own
+    event loop, so one window can be shared by calls running on several
+    threads and loops.
+    """
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None):
+        """
+        Initialize rate limit window
+
+        Args:
+            requests_per_minute: Request quota per minute (None for unlimited)
+            tokens_per_minute: Token quota per minute (None for unlimited)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._events: Deque[Tuple[float, int]] = deque()
+        self._tokens_in_window = 0
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        while self._events and now - self._events[0][0] >= self.WINDOW_SECONDS:
+            _, tokens = self._events.popleft()
+            self._tokens_in_window -= tokens
+
+    def _has_capacity(self, tokens: int) -> bool:
+        if self.requests_per_minute is not None and len(self._events) + 1 > self.requests_per_minute:
+            return False
+        if (self.tokens_per_minute is not None and self._events
+                and self._tokens_in_window + tokens > self.tokens_per_minute):
+            # A single request larger than the whole quota is let through on an empty window
+            return False
+        return True
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until one request of `tokens` tokens fits in the window, then record it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._prune(now)
+                if self._has_capacity(tokens):
+                    self._events.append((now, tokens))
+                    self._tokens_in_window += tokens
+                    return
+                delay = self.WINDOW_SECONDS - (now - self._events[0][0])
+            # Spread the waiters released by the same expiring request
+            await asyncio.sleep(delay + random.uniform(0.01, 0.1))
+
+    def get_usage(self) -> Dict[str, int]:
+        """Get requests and tokens used in the current window"""
+        with self._lock:
+            self._prune(time.monotonic())
+            return {"requests": len(self._events), "tokens": self._tokens_in_window}
+
+
+class AsyncEmbeddingEngine:
+    """
+    Embed large text collections with concurrent, rate-limited Azure OpenAI requests
+
+    The RPM/TPM window, the adaptive in-flight limit and the 429 pause belong
+    to the engine, so they hold across calls, including calls made at the
+    same time from several threads.
+    """
+
+    # Interval at which a request waiting for an in-flight slot checks again
+    SLOT_POLL_SECONDS = 0.01
+
+    def __init__(self,
+                 api_key: str,
+                 azure_endpoint: str,
+                 api_version: str,
+                 deployment_name: str,
+                 max_concurrency: int = 8,
+                 max_batch_tokens: int = 100_000,
+                 max_batch_size: int = 2048,
+                 requests_per_minute: Optional[int] = None,
+                 tokens_per_minute: Optional[int] = None,
+                 max_retries: int = 8,
+                 request_timeout: float = 60.0):
+        """
+        Initialize async embedding engine
+
+        Args:
+            api_key: Azure OpenAI API key
+            azure_endpoint: Azure OpenAI endpoint URL (or a local stub server)
+            api_version: API version
+            deployment_name: Deployment name for the embedding model
+            max_concurrency: Maximum number of in-flight requests
+            max_batch_tokens: Token budget of a single request
+            max_batch_size: Maximum number of inputs in a single request
+            requests_per_minute: Request quota per minute (None for unlimited)
+            tokens_per_minute: Token quota per minute (None for unlimited)
+            max_retries: Retries per batch on 429, 5xx and connection errors
+            request_timeout: Timeout of a single request in seconds
+        """
+        self.api_key = api_key
+        self.azure_endpoint = azure_endpoint
+        self.api_version = api_version
+        self.deployment_name = deployment_name
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.request_timeout = request_timeout
+
+        self.count_tokens = get_token_counter()
+        self.stats = self._empty_stats()
+
+        # Shared by every call; _lock guards the slot state and stats
+        self._lock = threading.Lock()
+        self._window = RateLimitWindow(requests_per_minute, tokens_per_minute)
+        # Adaptive concurrency: halve the in-flight limit on 429, grow it back on success
+        self._limit = self.max_concurrency
+        self._in_flight = 0
+        self._paused_until = 0.0
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        return {"requests": 0, "texts": 0, "tokens": 0, "rate_limited": 0, "retries": 0,
+                "elapsed_seconds": 0.0}
+
+    def pack_batches(self, texts: List[str]) -> List[Tuple[List[int], int]]:
+        """
+        Pack texts into request batches bounded by token budget and batch size
+
+        Args:
+            texts: List of input texts
+
+        Returns:
+            List of (text indices, token count) per batch
+        """
+        batches = []
+        current: List[int] = []
+        current_tokens = 0
+
+        for i, text in enumerate(texts):
+            tokens = self.count_tokens(text)
+            if current and (current_tokens + tokens > self.max_batch_tokens
+                            or len(current) >= self.max_batch_size):
+                batches.append((current, current_tokens))
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+
+        if current:
+            batches.append((current, current_tokens))
+        return batches
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Whether a request error is transient (429, 5xx, connection errors)"""
+        status = getattr(error, "status_code", None)
+        return isinstance(error, APIConnectionError) or status == 429 or (status or 0) >= 500
+
+    @staticmethod
+    def _retry_after_seconds(error: APIStatusError) -> Optional[float]:
+        """Read the server's requested delay from Retry-After / retry-after-ms headers"""
+        headers = error.response.headers if error.response is not None else {}
+        try:
+            if headers.get("retry-after-ms"):
+                return float(headers["retry-after-ms"]) / 1000.0
+            if headers.get("retry-after"):
+                return float(headers["retry-after"])
+        except ValueError:
+            pass
+        return None
+
+    def _record(self, **counts: float) -> None:
+        with self._lock:
+            for key, value in counts.items():
+                self.stats[key] += value
+
+    async def _wait_for_pause(self) -> None:
+        """Sleep through the shared 429 pause, waking at a random offset so waiters do not retry together"""
+        while True:
+            with self._lock:
+                delay = self._paused_until - time.monotonic()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay + random.uniform(0, min(2.0, delay)))
+
+    async def _acquire_slot(self) -> None:
+        """Take an in-flight slot once one is free and no 429 pause is running"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                paused = self._paused_until > now
+                if not paused and self._in_flight < self._limit:
+                    self._in_flight += 1
+                    return
+            if paused:
+                await self._wait_for_pause()
+            else:
+                await asyncio.sleep(self.SLOT_POLL_SECONDS)
+
+    def _release_slot(self, throttled: bool, retry_after: float = 0.0) -> None:
+        """Free a slot; a throttled request halves the limit and pauses all requests, a successful one grows it"""
+        with self._lock:
+            self._in_flight -= 1
+            if throttled:
+                self._limit = max(1, self._limit // 2)
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            elif self._limit < self.max_concurrency:
+                self._limit += 1
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts concurrently
+
+        Args:
+            texts: List of input texts
+
+        Returns:
+            List of embedding vectors aligned with texts
+        """
+        if not texts:
+            return []
+
+        start_time = time.monotonic()
+        batches = self.pack_batches(texts)
+        results: List[Optional[List[float]]] = [None] * len(texts)
+
+        client = AsyncAzureOpenAI(
+            api_key=self.api_key,
+            azure_endpoint=self.azure_endpoint,
+            api_version=self.api_version,
+            max_retries=0,
+            timeout=self.request_timeout,
+        )
+
+        async def run_batch(indices: List[int], tokens: int) -> None:
+            batch_texts = [texts[i] for i in indices]
+
+            for attempt in range(self.max_retries + 1):
+                # Honour a shared pause set by any throttled request, here or in another call
+                await self._wait_for_pause()
+                await self._window.acquire(tokens)
+                await self._acquire_slot()
+
+                throttled = False
+                backoff = 0.0
+                try:
+                    response = await client.embeddings.create(model=self.deployment_name, input=batch_texts)
+                    self._record(requests=1)
+                    for item in response.data:
+                        results[indices[item.index]] = item.embedding
+                    return
+                except (RateLimitError, APIStatusError, APIConnectionError) as e:
+                    if not self._is_retryable(e) or attempt == self.max_retries:
+                        raise
+
+                    backoff = min(60.0, 2 ** attempt) * (0.5 + random.random() / 2)
+                    if isinstance(e, RateLimitError) or getattr(e, "status_code", None) == 429:
+                        throttled = True
+                        backoff = self._retry_after_seconds(e) or backoff
+                        self._record(rate_limited=1)
+                    self._record(retries=1)
+                finally:
+                    self._release_slot(throttled, backoff)
+
+                # Back off without holding a slot; throttled requests wait out the shared pause
+                if throttled:
+                    await self._wait_for_pause()
+                else:
+                    await asyncio.sleep(backoff)
+
+        try:
+            outcomes = await asyncio.gather(*(run_batch(indices, tokens) for indices, tokens in batches),
+                                            return_exceptions=True)
+            # Keep the finished batches; give the ones that ran out of retries a last, sequential round
+            failed = []
+            for batch, outcome in zip(batches, outcomes):
+                if isinstance(outcome, BaseException):
+                    if not isinstance(outcome, Exception) or not self._is_retryable(outcome):
+                        raise outcome
+                    failed.append(batch)
+            if failed:
+                with self._lock:
+                    self._limit = 1
+                for indices, tokens in failed:
+                    await run_batch(indices, tokens)
+        finally:
+            await client.close()
+
+        self._record(texts=len(texts), tokens=sum(tokens for _, tokens in batches),
+                     elapsed_seconds=time.monotonic() - start_time)
+        return results
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Synchronous wrapper around aembed"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.aembed(texts))
+
+        # Called from inside an event loop: run on a separate thread's loop
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.aembed(texts)).result()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request, token and throttling statistics"""
+        with self._lock:
+            return dict(self.stats)
+
+
+class ConcurrentEmbeddings(Embeddings):
+    """LangChain embeddings adapter that embeds documents through AsyncEmbeddingEngine"""
+
+    def __init__(self, engine: AsyncEmbeddingEngine, query_embeddings: Embeddings):
+        """
+        Initialize concurrent embeddings
+
+        Args:
+            engine: Engine used for document embeddings
+            query_embeddings: Embedding model used for single search queries
+        """
+        self.engine = engine
+        self.query_embeddings = query_embeddings
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents with concurrent requests"""
+        return self.engine.embed(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a search query"""
+        return self.query_embeddings.embed_query(text)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of search queries with concurrent requests"""
+        return self.engine.embed(texts)
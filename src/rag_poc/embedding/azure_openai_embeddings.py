@@ -8,6 +8,10 @@ from dotenv import load_dotenv
 from langchain_openai import AzureOpenAIEmbeddings
 from langchain.schema import Document
 
+from .embedding_cache import EmbeddingCache, CachedEmbeddings
+from .query_cache import QueryEmbeddingCache, CachedQueryEmbeddings
+from .async_embedding_engine import AsyncEmbeddingEngine, ConcurrentEmbeddings
+
 # Load environment variables
 load_dotenv()
 
@@ -19,7 +23,11 @@ class AzureOpenAIEmbeddingManager:
                  api_key: Optional[str] = None,
                  azure_endpoint: Optional[str] = None,
                  api_version: Optional[str] = None,
-                 deployment_name: Optional[str] = None):
+                 deployment_name: Optional[str] = None,
+                 cache_path: Optional[str] = None,
+                 use_cache: bool = True,
+                 max_concurrency: Optional[int] = None,
+                 use_query_cache: bool = True):
         """
         Initialize Azure OpenAI embeddings
         
@@ -28,6 +36,11 @@ class AzureOpenAIEmbeddingManager:
             azure_endpoint: Azure OpenAI endpoint URL
             api_version: API version
             deployment_name: Deployment name for the embedding model
+            cache_path: Path of the on-disk embedding cache
+            use_cache: Whether to cache document embeddings on disk
+            max_concurrency: Concurrent embedding requests for documents (1 uses a single
+                synchronous LangChain call)
+            use_query_cache: Whether to keep recent query embeddings in an in-process LRU
         """
         # Use provided values or get from environment
         self.api_key = api_key or os.getenv("AZURE_OPENAI_API_KEY")
@@ -44,7 +57,7 @@ class AzureOpenAIEmbeddingManager:
             )
         
         # Initialize Azure OpenAI embeddings
-        self.embeddings = AzureOpenAIEmbeddings(
+        self.azure_embeddings = AzureOpenAIEmbeddings(
             azure_deployment=self.deployment_name,
             openai_api_version=self.api_version,
             azure_endpoint=self.azure_endpoint,
@@ -53,6 +66,59 @@ class AzureOpenAIEmbeddingManager:
         
         # Embedding dimension for text-embedding-ada-002
         self.embedding_dimension = int(os.getenv("VECTOR_DIMENSION", "1536"))
+        
+        # Embed documents with concurrent, rate-limited requests when requested
+        self.max_concurrency = max_concurrency or int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "1"))
+        self.embedding_engine: Optional[AsyncEmbeddingEngine] = None
+        document_embeddings = self.azure_embeddings
+        if self.max_concurrency > 1:
+            self.embedding_engine = self.create_embedding_engine()
+            document_embeddings = ConcurrentEmbeddings(self.embedding_engine, self.azure_embeddings)
+        
+        # Wrap with the on-disk cache so unchanged chunks are never re-embedded
+        self.embedding_cache: Optional[EmbeddingCache] = None
+        if use_cache:
+            self.embedding_cache = EmbeddingCache(
+                path=cache_path or os.getenv("EMBEDDING_CACHE_PATH", "data/output/embedding_cache.sqlite"),
+                deployment_name=self.deployment_name,
+                dimension=self.embedding_dimension
+            )
+            self.embeddings = CachedEmbeddings(document_embeddings, self.embedding_cache)
+        else:
+            self.embeddings = document_embeddings
+        
+        # Serve repeated search queries without a round trip to Azure
+        self.query_cache: Optional[QueryEmbeddingCache] = None
+        if use_query_cache:
+            self.query_cache = QueryEmbeddingCache(
+                deployment_name=self.deployment_name,
+                dimension=self.embedding_dimension
+            )
+            self.embeddings = CachedQueryEmbeddings(self.embeddings, self.query_cache)
+    
+    def create_embedding_engine(self, max_concurrency: Optional[int] = None) -> AsyncEmbeddingEngine:
+        """
+        Create an async embedding engine for this deployment
+        
+        Rate limits are read from EMBEDDING_RPM / EMBEDDING_TPM (the deployment's quota).
+        
+        Args:
+            max_concurrency: Maximum number of in-flight requests
+            
+        Returns:
+            AsyncEmbeddingEngine instance
+        """
+        rpm = os.getenv("EMBEDDING_RPM")
+        tpm = os.getenv("EMBEDDING_TPM")
+        return AsyncEmbeddingEngine(
+            api_key=self.api_key,
+            azure_endpoint=self.azure_endpoint,
+            api_version=self.api_version,
+            deployment_name=self.deployment_name,
+            max_concurrency=max_concurrency or self.max_concurrency,
+            requests_per_minute=int(rpm) if rpm else None,
+            tokens_per_minute=int(tpm) if tpm else None,
+        )
     
     def embed_text(self, text: str) -> List[float]:
         """
@@ -95,6 +161,18 @@ class AzureOpenAIEmbeddingManager:
         """Get the dimension of the embedding vectors"""
         return self.embedding_dimension
     
+    def get_cache_stats(self) -> Optional[dict]:
+        """Get embedding cache statistics (None if caching is disabled)"""
+        if self.embedding_cache is None:
+            return None
+        return self.embedding_cache.get_stats()
+    
+    def get_query_cache_stats(self) -> Optional[dict]:
+        """Get query embedding cache statistics (None if query caching is disabled)"""
+        if self.query_cache is None:
+            return None
+        return self.query_cache.get_stats()
+    
     def test_connection(self) -> bool:
         """
         Test the connection to Azure OpenAI
@@ -103,8 +181,8 @@ class AzureOpenAIEmbeddingManager:
             True if connection is successful
         """
         try:
-            # Test with a simple text
-            test_embedding = self.embed_text("test connection")
+            # Test with a simple text (bypassing the query cache)
+            test_embedding = self.azure_embeddings.embed_query("test connection")
             return len(test_embedding) == self.embedding_dimension
         except Exception as e:
             print(f"Connection test failed: {str(e)}")
@@ -0,0 +1,174 @@
+"""
+Persistent embedding cache keyed by chunk content hash
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain.embeddings.base import Embeddings
+
+from .query_cache import embed_queries
+
+
+class EmbeddingCache:
+    """SQLite-backed store of embedding vectors keyed by sha256(text) + deployment + dimension"""
+
+    # SQLite limits the number of bound parameters per statement
+    LOOKUP_BATCH_SIZE = 500
+
+    def __init__(self, path: str, deployment_name: str, dimension: int):
+        """
+        Initialize embedding cache
+
+        Args:
+            path: Path of the SQLite cache file
+            deployment_name: Embedding deployment the vectors belong to
+            dimension: Dimension of the embedding vectors
+        """
+        self.path = path
+        self.deployment_name = deployment_name
+        self.dimension = dimension
+        self.hits = 0
+        self.misses = 0
+
+        cache_dir = os.path.dirname(path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                content_hash TEXT NOT NULL,
+                deployment TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (content_hash, deployment, dimension)
+            )
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Return the sha256 hex digest of a text"""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look up cached vectors for multiple texts
+
+        Args:
+            texts: List of input texts
+
+        Returns:
+            List of vectors aligned with texts, None where the text is not cached
+        """
+        hashes = [self.content_hash(text) for text in texts]
+        found: Dict[str, List[float]] = {}
+        unique_hashes = list(dict.fromkeys(hashes))
+
+        with self._lock:
+            for start in range(0, len(unique_hashes), self.LOOKUP_BATCH_SIZE):
+                batch = unique_hashes[start:start + self.LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT content_hash, vector FROM embeddings "
+                    f"WHERE deployment = ? AND dimension = ? AND content_hash IN ({placeholders})",
+                    [self.deployment_name, self.dimension, *batch]
+                ).fetchall()
+                for content_hash, blob in rows:
+                    found[content_hash] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+        results = [found.get(h) for h in hashes]
+        hit_count = sum(1 for vector in results if vector is not None)
+        self.hits += hit_count
+        self.misses += len(results) - hit_count
+        return results
+
+    def put_many(self, texts: List[str], vectors: List[List[float]]) -> None:
+        """
+        Store vectors for multiple texts
+
+        Args:
+            texts: List of input texts
+            vectors: Embedding vectors aligned with texts
+        """
+        rows = [
+            (self.content_hash(text), self.deployment_name, self.dimension,
+             np.asarray(vector, dtype=np.float32).tobytes())
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (content_hash, deployment, dimension, vector) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit-rate statistics for this session and the cache size"""
+        with self._lock:
+            entries = self._conn.execute(
+                "SELECT COUNT(*) FROM embeddings WHERE deployment = ? AND dimension = ?",
+                (self.deployment_name, self.dimension)
+            ).fetchone()[0]
+
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain embeddings wrapper that only sends cache misses to the API"""
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache):
+        """
+        Initialize cached embeddings
+
+        Args:
+            embeddings: Underlying embedding model
+            cache: Embedding cache to consult before calling the model
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, serving cached vectors and embedding only the misses"""
+        vectors = self.cache.get_many(texts)
+
+        # Embed each distinct missing text once
+        missing_texts = list(dict.fromkeys(
+            text for text, vector in zip(texts, vectors) if vector is None
+        ))
+        if missing_texts:
+            new_vectors = self.embeddings.embed_documents(missing_texts)
+            self.cache.put_many(missing_texts, new_vectors)
+            embedded = dict(zip(missing_texts, new_vectors))
+            vectors = [vector if vector is not None else embedded[text]
+                       for text, vector in zip(texts, vectors)]
+
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a search query (queries are not cached)"""
+        return self.embeddings.embed_query(text)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed search queries (queries are not cached)"""
+        return embed_queries(self.embeddings, texts)
@@ -0,0 +1,233 @@
+"""
+In-process LRU cache of search query embeddings with optional on-disk persistence
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain.embeddings.base import Embeddings
+
+# Default bounds: ~25 MB of 1536-dim float32 vectors, entries valid for a day
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def embed_queries(embeddings: Embeddings, queries: List[str]) -> List[List[float]]:
+    """
+    Embed several search queries in one batch, bypassing document caches
+
+    The cache wrappers provide embed_queries, which consults the query cache
+    and skips the document cache. A raw model has no document cache, so its
+    embed_documents sends all queries in one API call.
+
+    Args:
+        embeddings: Embedding model
+        queries: Search queries
+
+    Returns:
+        One vector per query, in query order
+    """
+    if hasattr(embeddings, "embed_queries"):
+        return embeddings.embed_queries(queries)
+    return embeddings.embed_documents(list(queries))
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU of query vectors keyed by the normalised query text, with per-entry TTL"""
+
+    def __init__(self,
+                 deployment_name: str,
+                 dimension: int,
+                 max_entries: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None,
+                 path: Optional[str] = None):
+        """
+        Initialize query embedding cache
+
+        Args:
+            deployment_name: Embedding deployment the vectors belong to
+            dimension: Dimension of the embedding vectors
+            max_entries: Maximum cached queries (default: QUERY_CACHE_SIZE or 4096)
+            ttl_seconds: Seconds a vector stays valid, 0 for no expiry (default: QUERY_CACHE_TTL or 1 day)
+            path: SQLite file persisting vectors across restarts (default: QUERY_CACHE_PATH, unset keeps
+                the cache in memory only)
+        """
+        self.deployment_name = deployment_name
+        self.dimension = dimension
+        self.max_entries = max_entries if max_entries is not None else int(
+            os.getenv("QUERY_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(
+            os.getenv("QUERY_CACHE_TTL", DEFAULT_TTL_SECONDS))
+        self.path = path or os.getenv("QUERY_CACHE_PATH") or None
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+        # Normalised query -> (vector, time it was embedded), least recently used first
+        self._entries: "OrderedDict[str, Tuple[np.ndarray, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path:
+            self._open_store()
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Collapse whitespace and case so trivially different queries share an entry"""
+        return _WHITESPACE_RE.sub(" ", query).strip().casefold()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def _open_store(self) -> None:
+        """Open the persistence file and warm the LRU with its most recent live entries"""
+        cache_dir = os.path.dirname(self.path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS query_embeddings (
+                query TEXT NOT NULL,
+                deployment TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (query, deployment, dimension)
+            )
+        """)
+        now = time.time()
+        if self.ttl_seconds > 0:
+            self._conn.execute("DELETE FROM query_embeddings WHERE created_at < ?", (now - self.ttl_seconds,))
+        self._conn.commit()
+
+        rows = self._conn.execute(
+            "SELECT query, vector, created_at FROM query_embeddings WHERE deployment = ? AND dimension = ? "
+            "ORDER BY created_at DESC LIMIT ?",
+            (self.deployment_name, self.dimension, self.max_entries)
+        ).fetchall()
+        for query, blob, created_at in reversed(rows):
+            self._entries[query] = (np.frombuffer(blob, dtype=np.float32), created_at)
+
+        # Keep the file as bounded as the LRU: drop rows that did not make the cut
+        if len(rows) == self.max_entries and rows:
+            self._conn.execute(
+                "DELETE FROM query_embeddings WHERE deployment = ? AND dimension = ? AND created_at < ?",
+                (self.deployment_name, self.dimension, rows[-1][2])
+            )
+            self._conn.commit()
+
+    def get(self, query: str) -> Optional[List[float]]:
+        """Return the cached vector of a query, or None on a miss or expired entry"""
+        key = self.normalize(query)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[1], now):
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry[0].tolist()
+
+    def put(self, query: str, vector: List[float]) -> None:
+        """Cache the vector of a query, evicting the least recently used entries beyond the bound"""
+        if self.max_entries <= 0:
+            return
+        key = self.normalize(query)
+        array = np.asarray(vector, dtype=np.float32)
+        now = time.time()
+        with self._lock:
+            self._entries[key] = (array, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO query_embeddings (query, deployment, dimension, vector, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, self.deployment_name, self.dimension, array.tobytes(), now)
+                )
+                self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the current size"""
+        with self._lock:
+            entries = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "path": self.path,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        """Close the persistence file, if any"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """LangChain embeddings wrapper that serves repeated search queries from a QueryEmbeddingCache"""
+
+    def __init__(self, embeddings: Embeddings, cache: QueryEmbeddingCache):
+        """
+        Initialize cached query embeddings
+
+        Args:
+            embeddings: Underlying embedding model
+            cache: Query embedding cache to consult before calling the model
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts (documents are not held in the query cache)"""
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a search query, reusing the vector of an earlier identical query"""
+        vector = self.cache.get(text)
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self.cache.put(text, vector)
+        return vector
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed search queries, reusing cached vectors and embedding the distinct misses in one batch"""
+        vectors = [self.cache.get(text) for text in texts]
+        missing = {}
+        for text, vector in zip(texts, vectors):
+            if vector is None:
+                missing.setdefault(self.cache.normalize(text), text)
+        if missing:
+            new_vectors = embed_queries(self.embeddings, list(missing.values()))
+            embedded = dict(zip(missing, new_vectors))
+            for key, text in missing.items():
+                self.cache.put(text, embedded[key])
+            vectors = [vector if vector is not None else embedded[self.cache.normalize(text)]
+                       for text, vector in zip(texts, vectors)]
+        return vectors
@@ -7,14 +7,19 @@ from pathlib import Path
 from typing import List, Optional, Tuple, Dict, Any
 from langchain.schema import Document
 
-from .document_processing.docling_mps_converter import DoclingMPSConverter
-from .document_processing.document_converter import DocumentToHTMLConverter
-from .document_processing.enhanced_docling_converter import EnhancedDoclingConverter
-from .document_processing.simple_pdf_converter import SimplePDFConverter
-from .document_processing.macos_ocr_converter import MacOSOCRConverter
+from .document_processing.conversion_cache import get_default_cache_path
+from .document_processing.converter_registry import create_converter_for_device
+from .document_processing.html_output import AsyncHTMLWriter
 from .document_processing.html_splitter import HTMLDocumentSplitter
+from .document_processing.parallel_conversion import run_in_worker_pool
+from .document_sync import file_sha256, plan_sync, scan_sources
 from .embedding.azure_openai_embeddings import AzureOpenAIEmbeddingManager
+from .streaming_ingest import StreamingIngestor
 from .vectorstore.faiss_store import FAISSVectorStore
+from .vectorstore.sharded_store import ShardedVectorStore, is_sharded_index, read_shard_config
+
+# Retrieval modes of search_documents: dense vectors, BM25 keywords, or both fused
+SEARCH_MODES = ("vector", "keyword", "hybrid")
 
 
 class RAGPipeline:
@@ -25,51 +30,59 @@ class RAGPipeline:
                  chunk_size: int = 1000,
                  chunk_overlap: int = 200,
                  device: str = "cpu",
-                 init_document_converter: bool = True):
+                 init_document_converter: bool = True,
+                 use_embedding_cache: bool = True,
+                 conversion_workers: int = 1,
+                 conversion_timeout: Optional[float] = None,
+                 embedding_concurrency: Optional[int] = None,
+                 index_spec: str = "Flat",
+                 in_memory_handoff: bool = False,
+                 use_conversion_cache: bool = True,
+                 page_workers: int = 1,
+                 num_shards: Optional[int] = None,
+                 rerank_factor: Optional[int] = None):
         """
         Initialize RAG pipeline
         
         Args:
             index_path: Path to save/load FAISS index
-            chunk_size: Size of text chunks
-            chunk_overlap: Overlap between chunks
+            chunk_size: Maximum size of text chunks in tokens
+            chunk_overlap: Overlap between chunks in tokens
             device: Device to use ("cpu", "mps", or "macos")
             init_document_converter: Whether to initialize document converter
+            use_embedding_cache: Whether to reuse cached embeddings of unchanged chunks
+            conversion_workers: Number of worker processes for document conversion
+            conversion_timeout: Per-file conversion timeout in seconds (optional)
+            embedding_concurrency: Concurrent embedding requests (default: EMBEDDING_MAX_CONCURRENCY or 1)
+            index_spec: FAISS index type for new indexes ("Flat", "HNSW32", "IVF4096,Flat", "IVF4096,PQ64", ...)
+            in_memory_handoff: Pass converted HTML straight to the splitter instead of through files
+            use_conversion_cache: Whether to reuse cached conversions of unchanged documents
+            page_workers: Worker processes converting page ranges of one large PDF
+            num_shards: Shards to partition a new index into (default: the layout of an
+                existing index at index_path, else a single index)
+            rerank_factor: Candidates per result re-ranked by exact distance on quantised
+                indexes (default: RERANK_FACTOR or 4; 1 disables re-ranking)
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.device = device
+        self.conversion_workers = conversion_workers
+        self.conversion_timeout = conversion_timeout
+        self.in_memory_handoff = in_memory_handoff
         
-        # Initialize document converter based on device (only if needed)
+        # Initialize document converter based on device (only if needed).
+        # Converter backends are imported lazily so that search-only
+        # pipelines never pay the torch/docling import cost.
         if init_document_converter:
             if device == "macos":
                 print("🍎 Using macOS native OCR for document processing")
-                try:
-                    self.document_converter = MacOSOCRConverter()
-                except Exception as e:
-                    print(f"⚠️  macOS OCR initialization failed, falling back to simple PDF converter: {str(e)}")
-                    self.document_converter = SimplePDFConverter()
             elif device == "mps":
                 print("🚀 Using MPS acceleration for document processing")
-                try:
-                    self.document_converter = DoclingMPSConverter(use_mps=True)
-                except Exception as e:
-                    print(f"⚠️  MPS initialization failed, falling back to simple PDF converter: {str(e)}")
-                    self.document_converter = SimplePDFConverter()
             else:
                 print("🖥️  Using CPU for document processing with Enhanced Docling")
-                try:
-                    self.document_converter = EnhancedDoclingConverter(use_ocr=True, lang=['en', 'zh'])
-                    print("✅ Enhanced Docling converter initialized successfully")
-                except Exception as e:
-                    print(f"⚠️  Enhanced Docling initialization failed, trying standard Docling: {str(e)}")
-                    try:
-                        self.document_converter = DocumentToHTMLConverter()
-                        print("✅ Standard Docling DocumentConverter initialized")
-                    except Exception as e2:
-                        print(f"⚠️  All Docling methods failed, falling back to simple PDF converter: {str(e2)}")
-                        print("💡 To fix this, run: ./install_docling_macos_intel.sh")
-                        self.document_converter = SimplePDFConverter()
+            cache_path = get_default_cache_path() if use_conversion_cache else None
+            self.document_converter = create_converter_for_device(device, cache_path=cache_path,
+                                                                  page_workers=page_workers)
         else:
             self.document_converter = None
             
@@ -77,15 +90,42 @@ class RAGPipeline:
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap
         )
-        self.embedding_manager = AzureOpenAIEmbeddingManager()
-        self.vector_store = FAISSVectorStore(
-            embeddings=self.embedding_manager.embeddings,
-            index_path=index_path,
-            embedding_dimension=self.embedding_manager.get_embedding_dimension()
+        self.embedding_manager = AzureOpenAIEmbeddingManager(
+            use_cache=use_embedding_cache,
+            max_concurrency=embedding_concurrency
         )
+        self.index_spec = index_spec
+        self.rerank_factor = rerank_factor
+        self.vector_store = self._create_vector_store(index_path, num_shards)
         
         print("RAG Pipeline initialized successfully")
     
+    def _create_vector_store(self,
+                             index_path: Optional[str],
+                             num_shards: Optional[int] = None) -> FAISSVectorStore | ShardedVectorStore:
+        """Create a single or sharded vector store, following the layout of an existing index"""
+        path = index_path or "data/output/faiss_index"
+        if num_shards is None and is_sharded_index(path):
+            num_shards = read_shard_config(path)["num_shards"]
+            
+        if num_shards is not None and num_shards > 1:
+            print(f"Using a {num_shards}-shard index")
+            return ShardedVectorStore(
+                embeddings=self.embedding_manager.embeddings,
+                index_path=path,
+                embedding_dimension=self.embedding_manager.get_embedding_dimension(),
+                index_spec=self.index_spec,
+                num_shards=num_shards,
+                rerank_factor=self.rerank_factor
+            )
+        return FAISSVectorStore(
+            embeddings=self.embedding_manager.embeddings,
+            index_path=index_path,
+            embedding_dimension=self.embedding_manager.get_embedding_dimension(),
+            index_spec=self.index_spec,
+            rerank_factor=self.rerank_factor
+        )
+    
     def process_documents(self, 
                          file_paths: List[str], 
                          output_html_dir: Optional[str] = None) -> List[Document]:
@@ -101,16 +141,20 @@ class RAGPipeline:
         """
         print(f"Processing {len(file_paths)} documents...")
         
+        if self.in_memory_handoff:
+            return self._process_documents_in_memory(file_paths, output_html_dir)
+            
         # Step 1: Convert documents to HTML
         print("Step 1: Converting documents to HTML...")
-        html_files = self.document_converter.convert_batch(file_paths, output_html_dir)
+        html_files = self._convert_to_html_files(file_paths, output_html_dir)
         
         if not html_files:
             raise ValueError("No documents were successfully converted to HTML")
         
-        # Step 2: Split HTML documents into chunks
+        # Step 2: Split HTML documents into chunks, recording the original documents as their sources
         print("Step 2: Splitting HTML documents into chunks...")
-        all_documents = self.html_splitter.split_multiple_files(html_files)
+        all_documents = self.html_splitter.split_multiple_files(list(html_files.values()),
+                                                                source_names=list(html_files))
         
         if not all_documents:
             raise ValueError("No chunks were created from HTML documents")
@@ -118,10 +162,193 @@ class RAGPipeline:
         print(f"Created {len(all_documents)} document chunks")
         return all_documents
     
+    def stream_documents_to_index(self,
+                                  file_paths: List[str],
+                                  output_html_dir: Optional[str] = None,
+                                  save_index: bool = True,
+                                  queue_size: int = 8,
+                                  embed_batch_size: int = 256) -> Dict[str, Any]:
+        """
+        Convert, split, embed and index documents as overlapping streaming stages
+        
+        Chunks are embedded and inserted in batches while later files are still
+        being converted, so only a bounded number of files and batches is held
+        in memory at any time. Creates the index if none is loaded.
+        
+        Args:
+            file_paths: List of document file paths
+            output_html_dir: Directory to save HTML files
+            save_index: Whether to save the index to disk
+            queue_size: Maximum items buffered between two stages
+            embed_batch_size: Chunks per embedding call and index insertion
+            
+        Returns:
+            Per-stage throughput statistics
+        """
+        ingestor = StreamingIngestor(
+            self.document_converter,
+            self.html_splitter,
+            self.embedding_manager.embeddings,
+            self.vector_store,
+            queue_size=queue_size,
+            embed_batch_size=embed_batch_size,
+            conversion_workers=self.conversion_workers,
+            conversion_timeout=self.conversion_timeout
+        )
+        stats = ingestor.run(file_paths, output_html_dir)
+        
+        if stats["chunks"] == 0:
+            raise ValueError("No chunks were created from the documents")
+            
+        self._record_sources(file_paths)
+        if save_index:
+            print("Saving vector index...")
+            self.vector_store.save_index()
+            
+        return stats
+    
+    def _convert_to_html_files(self,
+                               file_paths: List[str],
+                               output_html_dir: Optional[str] = None) -> Dict[str, str]:
+        """
+        Convert documents to HTML files, keeping track of which input each file came from
+        
+        Args:
+            file_paths: List of document file paths
+            output_html_dir: Directory to save HTML files (default: next to each input)
+            
+        Returns:
+            HTML file path of every successfully converted document, in input file order
+        """
+        html_files: Dict[int, str] = {}
+        total = len(file_paths)
+        
+        def handle(task_index: int, success: bool, value: Any) -> None:
+            if success:
+                html_files[task_index] = value
+                print(f"[{task_index + 1}/{total}] ✅ Converted: {file_paths[task_index]} -> {value}")
+            else:
+                print(f"[{task_index + 1}/{total}] ❌ Error converting {file_paths[task_index]}: {value}")
+                
+        if self.conversion_workers > 1 or self.conversion_timeout is not None:
+            run_in_worker_pool(
+                type(self.document_converter),
+                self.document_converter._init_kwargs(),
+                "convert_file",
+                [(file_path, output_html_dir) for file_path in file_paths],
+                workers=self.conversion_workers,
+                timeout=self.conversion_timeout,
+                on_result=handle
+            )
+        else:
+            for i, file_path in enumerate(file_paths):
+                try:
+                    html_file = self.document_converter.convert_file(file_path, output_html_dir)
+                except Exception as e:
+                    handle(i, False, str(e))
+                    continue
+                handle(i, True, html_file)
+                
+        return {file_paths[i]: html_files[i] for i in sorted(html_files)}
+    
+    def _process_documents_in_memory(self,
+                                     file_paths: List[str],
+                                     output_html_dir: Optional[str] = None) -> List[Document]:
+        """
+        Convert and split documents without reading HTML back from disk
+        
+        Each converted HTML string is split as soon as its conversion finishes
+        and then dropped. If output_html_dir is given, the HTML is also written
+        there on a background thread, named so that same-named inputs from
+        different folders do not overwrite each other.
+        
+        Args:
+            file_paths: List of document file paths
+            output_html_dir: Directory to also save HTML files to (optional)
+            
+        Returns:
+            List of processed Document objects, in input file order
+        """
+        print("Converting and splitting documents in memory...")
+        chunks_by_file = self._convert_and_split(file_paths, output_html_dir)
+        if not chunks_by_file:
+            raise ValueError("No documents were successfully converted to HTML")
+            
+        all_documents = [doc for chunks in chunks_by_file.values() for doc in chunks]
+        if not all_documents:
+            raise ValueError("No chunks were created from HTML documents")
+            
+        print(f"Created {len(all_documents)} document chunks")
+        return all_documents
+    
+    def _convert_and_split(self,
+                           file_paths: List[str],
+                           output_html_dir: Optional[str] = None) -> Dict[str, List[Document]]:
+        """
+        Convert documents to HTML and split each HTML string as soon as it is ready
+        
+        Chunks carry the original document path as their source. HTML files are
+        only written (in the background) when output_html_dir is given, named so
+        that same-named inputs from different folders do not overwrite each other.
+        
+        Args:
+            file_paths: List of document file paths
+            output_html_dir: Directory to also save HTML files to (optional)
+            
+        Returns:
+            Chunks of every successfully processed file, in input file order
+        """
+        writer = AsyncHTMLWriter(output_html_dir) if output_html_dir else None
+        chunks_by_file: Dict[int, List[Document]] = {}
+        total = len(file_paths)
+        
+        def handle(task_index: int, success: bool, value: Any) -> None:
+            file_path = file_paths[task_index]
+            if not success:
+                print(f"[{task_index + 1}/{total}] ❌ Error converting {file_path}: {value}")
+                return
+            if writer is not None:
+                writer.submit(file_path, value)
+            try:
+                chunks = self.html_splitter.split_html_content(value, source_name=file_path)
+            except Exception as e:
+                print(f"[{task_index + 1}/{total}] ❌ Error splitting {file_path}: {str(e)}")
+                return
+            chunks_by_file[task_index] = chunks
+            print(f"[{task_index + 1}/{total}] ✅ {file_path}: {len(chunks)} chunks")
+            
+        try:
+            if self.conversion_workers > 1 or self.conversion_timeout is not None:
+                run_in_worker_pool(
+                    type(self.document_converter),
+                    self.document_converter._init_kwargs(),
+                    "convert_to_html",
+                    [(file_path,) for file_path in file_paths],
+                    workers=self.conversion_workers,
+                    timeout=self.conversion_timeout,
+                    on_result=handle
+                )
+            else:
+                for i, file_path in enumerate(file_paths):
+                    try:
+                        html_content = self.document_converter.convert_to_html(file_path)
+                    except Exception as e:
+                        handle(i, False, str(e))
+                        continue
+                    handle(i, True, html_content)
+        finally:
+            if writer is not None:
+                written = writer.close()
+                print(f"Wrote {len(written)} HTML files to {output_html_dir}")
+                
+        return {file_paths[i]: chunks_by_file[i] for i in sorted(chunks_by_file)}
+    
     def build_vector_index(self, 
                           file_paths: List[str], 
                           output_html_dir: Optional[str] = None,
-                          save_index: bool = True) -> None:
+                          save_index: bool = True,
+                          streaming: bool = False,
+                          build_workers: int = 1) -> Optional[Dict[str, Any]]:
         """
         Build vector index from document files
         
@@ -129,13 +356,29 @@ class RAGPipeline:
             file_paths: List of document file paths
             output_html_dir: Directory to save HTML files
             save_index: Whether to save the index to disk
+            streaming: Overlap conversion, splitting, embedding and indexing with bounded memory
+            build_workers: Workers embedding and indexing partial indexes that are merged at the end
+            
+        Returns:
+            Per-stage throughput statistics in streaming mode, otherwise None
         """
+        if streaming:
+            self.vector_store.reset()
+            stats = self.stream_documents_to_index(file_paths, output_html_dir, save_index)
+            print("Vector index built successfully!")
+            return stats
+            
         # Process documents
         documents = self.process_documents(file_paths, output_html_dir)
         
         # Step 3: Create vector index
         print("Step 3: Creating vector index...")
-        self.vector_store.create_index(documents)
+        if build_workers > 1 and isinstance(self.vector_store, FAISSVectorStore):
+            self.vector_store.create_index_parallel(documents, workers=build_workers)
+        else:
+            # Sharded indexes already build their shards in parallel
+            self.vector_store.create_index(documents)
+        self._record_sources(file_paths)
         
         # Step 4: Save index if requested
         if save_index:
@@ -147,7 +390,9 @@ class RAGPipeline:
     def add_documents_to_index(self, 
                               file_paths: List[str], 
                               output_html_dir: Optional[str] = None,
-                              save_index: bool = True) -> None:
+                              save_index: bool = True,
+                              streaming: bool = False,
+                              replace: bool = False) -> Optional[Dict[str, Any]]:
         """
         Add new documents to existing index
         
@@ -155,13 +400,30 @@ class RAGPipeline:
             file_paths: List of document file paths
             output_html_dir: Directory to save HTML files
             save_index: Whether to save the updated index
+            streaming: Overlap conversion, splitting, embedding and indexing with bounded memory
+            replace: Replace the previously indexed chunks of the same sources instead of adding duplicates
+            
+        Returns:
+            Per-stage throughput statistics in streaming mode, otherwise None
         """
+        if streaming and replace:
+            raise ValueError("Replacing documents is not supported in streaming mode")
+        if streaming:
+            stats = self.stream_documents_to_index(file_paths, output_html_dir, save_index)
+            print("Documents added to index successfully!")
+            return stats
+            
         # Process new documents
         documents = self.process_documents(file_paths, output_html_dir)
         
         # Add to existing index
-        print("Adding documents to existing index...")
-        self.vector_store.add_documents(documents)
+        if replace:
+            print("Replacing documents in existing index...")
+            self.vector_store.upsert_documents(documents)
+        else:
+            print("Adding documents to existing index...")
+            self.vector_store.add_documents(documents)
+        self._record_sources(file_paths)
         
         # Save updated index if requested
         if save_index:
@@ -170,11 +432,161 @@ class RAGPipeline:
         
         print("Documents added to index successfully!")
     
+    def _record_sources(self, file_paths: List[str]) -> None:
+        """
+        Record sync manifest entries for documents indexed by build or add
+        
+        Without them a later sync would take the documents for new files and
+        index their chunks a second time.
+        
+        Args:
+            file_paths: Document file paths, as recorded in their chunks' source
+        """
+        if not isinstance(self.vector_store, FAISSVectorStore) or self.vector_store.chunk_store is None:
+            return
+        chunk_store = self.vector_store.chunk_store
+        for file_path in file_paths:
+            ids = chunk_store.ids_for_source(file_path)
+            if not ids:
+                # Failed to convert, or produced no chunks
+                continue
+            stat = os.stat(file_path)
+            chunk_store.set_source(str(Path(file_path).resolve()), file_sha256(file_path), stat.st_mtime,
+                                   stat.st_size, ids)
+    
+    def delete_documents(self, sources: List[str], save_index: bool = True) -> int:
+        """
+        Delete the chunks of source documents from the index
+        
+        Args:
+            sources: Source paths as stored in the chunks' metadata
+            save_index: Whether to save the updated index
+            
+        Returns:
+            Number of chunks deleted
+        """
+        deleted = 0
+        for source in sources:
+            removed = self.vector_store.delete_by_source(source)
+            print(f"  - {source}: {removed} chunks deleted")
+            deleted += removed
+            
+        if save_index and deleted:
+            print("Saving updated index...")
+            self.vector_store.save_index()
+        return deleted
+    
+    def sync_documents(self,
+                       paths: List[str],
+                       output_html_dir: Optional[str] = None,
+                       save_index: bool = True,
+                       dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Bring the index in line with a set of files and directories
+        
+        A manifest of source path, content hash, mtime and FAISS ids is kept in
+        the chunk store. Only new or changed files are converted, split and
+        embedded; the vectors of changed and removed files are deleted. Files
+        that fail to convert keep their previous vectors. Build and add record
+        manifest entries too; chunks of a document without one are replaced.
+        
+        Args:
+            paths: Document files and/or directories (searched recursively)
+            output_html_dir: Directory to save HTML files
+            save_index: Whether to save the updated index
+            dry_run: Only report what would change
+            
+        Returns:
+            Dict with counts of new, changed, removed, unchanged and failed files
+            and of chunks added and deleted
+        """
+        if isinstance(self.vector_store, ShardedVectorStore):
+            raise ValueError("sync is not supported for sharded indexes; use add --replace and delete instead")
+            
+        files, directories = scan_sources(paths, self.document_converter.is_supported_format)
+        explicit_files = [p for p in paths if not Path(p).is_dir()]
+        chunk_store = self.vector_store.chunk_store
+        manifest = chunk_store.get_sources() if chunk_store is not None else {}
+        if chunk_store is not None:
+            # Documents indexed without a manifest entry (by build/add before they recorded one):
+            # their chunks are found by source and replaced like those of a changed file
+            for file_path in files:
+                if file_path not in manifest:
+                    ids = chunk_store.ids_for_source(file_path) + chunk_store.ids_for_source(os.path.relpath(file_path))
+                    if ids:
+                        manifest[file_path] = {"content_hash": None, "mtime": None, "size": None,
+                                               "chunk_ids": list(dict.fromkeys(ids))}
+        plan = plan_sync(files, directories, explicit_files, manifest)
+        
+        summary = plan.summary()
+        print(f"Sync plan: {summary['new']} new, {summary['changed']} changed, "
+              f"{summary['removed']} removed, {summary['unchanged']} unchanged")
+        summary.update({"failed": 0, "chunks_added": 0, "chunks_deleted": 0})
+        if dry_run:
+            for label, group in (("new", plan.new), ("changed", plan.changed), ("removed", plan.removed)):
+                for file_path in group:
+                    print(f"  [{label}] {file_path}")
+            return summary
+            
+        # Convert and split new/changed files in memory, remembering which chunks came from where
+        chunks_by_file = self._convert_and_split(plan.to_index, output_html_dir)
+        documents = [doc for chunks in chunks_by_file.values() for doc in chunks]
+        chunk_counts = {file_path: len(chunks) for file_path, chunks in chunks_by_file.items()}
+        summary["failed"] = len(plan.to_index) - len(chunk_counts)
+        
+        if documents:
+            print(f"Embedding {len(documents)} chunks from {len(chunk_counts)} files...")
+            vectors = self.embedding_manager.embeddings.embed_documents([doc.page_content for doc in documents])
+            ids = self.vector_store.add_embeddings(documents, vectors)
+            summary["chunks_added"] = len(ids)
+        else:
+            ids = []
+            
+        chunk_store = self.vector_store.chunk_store
+        if chunk_store is None:
+            if plan.to_index:
+                raise ValueError("No chunks were created from the documents")
+            return summary
+            
+        # Drop the previous vectors of re-indexed and removed files
+        stale_ids = [i for file_path in plan.removed for i in manifest[file_path]["chunk_ids"]]
+        stale_ids += [i for file_path in plan.changed if file_path in chunk_counts
+                      for i in manifest[file_path]["chunk_ids"]]
+        if stale_ids:
+            summary["chunks_deleted"] = self.vector_store.delete(stale_ids)
+            
+        # Update the manifest
+        offset = 0
+        for file_path, count in chunk_counts.items():
+            stat = os.stat(file_path)
+            chunk_store.set_source(file_path, plan.hashes[file_path], stat.st_mtime, stat.st_size,
+                                   ids[offset:offset + count])
+            offset += count
+        for file_path, stat in plan.touched.items():
+            entry = manifest[file_path]
+            chunk_store.set_source(file_path, entry["content_hash"], stat["mtime"], stat["size"],
+                                   entry["chunk_ids"])
+        for file_path in plan.removed:
+            chunk_store.delete_source(file_path)
+            
+        changed_anything = documents or stale_ids or plan.touched or plan.removed
+        if save_index and changed_anything:
+            print("Saving updated index...")
+            self.vector_store.save_index()
+            
+        print(f"Sync complete: +{summary['chunks_added']} / -{summary['chunks_deleted']} chunks, "
+              f"{summary['failed']} files failed")
+        return summary
+    
     def search_documents(self, 
                         query: str, 
                         k: int = 5,
                         score_threshold: Optional[float] = None,
-                        return_scores: bool = False) -> List[Document] | List[Tuple[Document, float]]:
+                        return_scores: bool = False,
+                        nprobe: Optional[int] = None,
+                        ef_search: Optional[int] = None,
+                        mode: str = "vector",
+                        filter: Optional[Dict[str, Any]] = None) -> List[Document] | List[Tuple[Document, float]]:
         """
         Search for similar documents
         
@@ -183,23 +595,79 @@ class RAGPipeline:
             k: Number of results to return
             score_threshold: Minimum similarity score
             return_scores: Whether to return scores with documents
+            nprobe: IVF lists to visit per query (IVF indexes only)
+            ef_search: HNSW search beam width (HNSW indexes only)
+            mode: "vector" (L2 distance), "keyword" (BM25 score) or "hybrid"
+                (reciprocal rank fusion of both, fused score)
+            filter: Only search chunks whose metadata matches, e.g. {"source": "a.html"}
             
         Returns:
             List of similar documents or (document, score) tuples
         """
+        self._check_search_mode(mode)
+        if mode != "vector":
+            if mode == "keyword":
+                results = self.vector_store.keyword_search(query, k=k, filter=filter)
+            else:
+                results = self.vector_store.hybrid_search(query, k=k, nprobe=nprobe, ef_search=ef_search,
+                                                          filter=filter)
+            if return_scores:
+                return results
+            return [doc for doc, score in results if score_threshold is None or score >= score_threshold]
+            
         if return_scores:
-            return self.vector_store.similarity_search_with_scores(query, k=k)
+            return self.vector_store.similarity_search_with_scores(query, k=k, nprobe=nprobe, ef_search=ef_search,
+                                                                   filter=filter)
         else:
-            return self.vector_store.similarity_search(query, k=k, score_threshold=score_threshold)
+            return self.vector_store.similarity_search(query, k=k, score_threshold=score_threshold,
+                                                       nprobe=nprobe, ef_search=ef_search, filter=filter)
     
-    def load_existing_index(self, index_path: Optional[str] = None) -> None:
+    def batch_search_documents(self,
+                               queries: List[str],
+                               k: int = 5,
+                               nprobe: Optional[int] = None,
+                               ef_search: Optional[int] = None,
+                               mode: str = "vector",
+                               filter: Optional[Dict[str, Any]] = None) -> List[List[Tuple[Document, float]]]:
+        """
+        Search for similar documents of many queries with one embedding call and one index search
+        
+        Args:
+            queries: Search queries
+            k: Number of results to return per query
+            nprobe: IVF lists to visit per query (IVF indexes only)
+            ef_search: HNSW search beam width (HNSW indexes only)
+            mode: "vector", "keyword" or "hybrid" (see search_documents)
+            filter: Only search chunks whose metadata matches (applies to every query)
+            
+        Returns:
+            One list of (document, score) tuples per query, in query order
+        """
+        self._check_search_mode(mode)
+        if mode == "keyword":
+            return [self.vector_store.keyword_search(query, k=k, filter=filter) for query in queries]
+        if mode == "hybrid":
+            return self.vector_store.batch_hybrid_search(queries, k=k, nprobe=nprobe, ef_search=ef_search,
+                                                         filter=filter)
+        return self.vector_store.batch_similarity_search(queries, k=k, nprobe=nprobe, ef_search=ef_search,
+                                                         filter=filter)
+    
+    @staticmethod
+    def _check_search_mode(mode: str) -> None:
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode '{mode}', expected one of: {', '.join(SEARCH_MODES)}")
+    
+    def load_existing_index(self, index_path: Optional[str] = None, mmap: bool = False) -> None:
         """
         Load existing vector index
         
         Args:
             index_path: Path to load index from
+            mmap: Memory-map the index instead of reading it into RAM
         """
-        self.vector_store.load_index(index_path)
+        if index_path and is_sharded_index(index_path) != isinstance(self.vector_store, ShardedVectorStore):
+            self.vector_store = self._create_vector_store(index_path)
+        self.vector_store.load_index(index_path, mmap=mmap)
         print("Existing index loaded successfully")
     
     def get_supported_formats(self) -> List[str]:
@@ -235,6 +703,18 @@ class RAGPipeline:
         """Get information about the current index"""
         return self.vector_store.get_index_info()
     
+    def reload_index_if_changed(self) -> bool:
+        """Switch to a newer saved index version, if one was published (returns True if reloaded)"""
+        return self.vector_store.reload_if_changed()
+    
+    def get_embedding_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get embedding cache hit-rate statistics (None if caching is disabled)"""
+        return self.embedding_manager.get_cache_stats()
+    
+    def get_query_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get query embedding cache statistics (None if query caching is disabled)"""
+        return self.embedding_manager.get_query_cache_stats()
+    
     def test_connection(self) -> bool:
         """Test Azure OpenAI connection"""
         return self.embedding_manager.test_connection()
\ No newline at end of file
@@ -0,0 +1,257 @@
+"""
+Long-running HTTP/JSON search server that keeps the index loaded in memory
+"""
+
+import json
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain.schema import Document
+
+from .rag_pipeline import SEARCH_MODES, RAGPipeline
+from .vectorstore.chunk_store import filter_clause
+
+# Largest request body accepted, in bytes
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class RequestError(Exception):
+    """Client error reported to the caller as HTTP 400"""
+
+
+class SearchServer:
+    """Serve /search, /batch_search and /info for a pipeline with a loaded index"""
+
+    def __init__(self,
+                 pipeline: RAGPipeline,
+                 host: str = "127.0.0.1",
+                 port: int = 8000,
+                 max_concurrency: int = 8,
+                 queue_timeout: float = 30.0,
+                 max_batch_queries: int = 256,
+                 reload_interval: float = 0.0):
+        """
+        Initialize search server
+
+        Args:
+            pipeline: Pipeline with an index already loaded
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            max_concurrency: Maximum number of searches executed at the same time
+            queue_timeout: Seconds a request waits for a free search slot before a 503
+            max_batch_queries: Maximum number of queries in one /batch_search request
+            reload_interval: Seconds between checks for a newly saved index version (0 disables hot reload)
+        """
+        self.pipeline = pipeline
+        self.queue_timeout = queue_timeout
+        self.max_batch_queries = max_batch_queries
+        self.reload_interval = reload_interval
+        self._stop_reload = threading.Event()
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "rejected": 0, "queries": 0, "search_seconds": 0.0,
+                      "reloads": 0}
+        self.started_at = time.time()
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        # Non-daemon handler threads are joined by server_close(), so shutdown waits for in-flight requests
+        self.httpd.daemon_threads = False
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Bound (host, port)"""
+        return self.httpd.server_address[:2]
+
+    @staticmethod
+    def _search_options(body: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate the search options shared by /search and /batch_search"""
+        options = {
+            "k": body.get("k", 5),
+            "score_threshold": body.get("score_threshold"),
+            "nprobe": body.get("nprobe"),
+            "ef_search": body.get("ef_search"),
+            "mode": body.get("mode", "vector"),
+            "filter": body.get("filter"),
+        }
+        if not isinstance(options["k"], int) or options["k"] < 1:
+            raise RequestError("'k' must be a positive integer")
+        for name in ("nprobe", "ef_search"):
+            if options[name] is not None and (not isinstance(options[name], int) or options[name] < 1):
+                raise RequestError(f"'{name}' must be a positive integer")
+        if options["score_threshold"] is not None and not isinstance(options["score_threshold"], (int, float)):
+            raise RequestError("'score_threshold' must be a number")
+        if options["mode"] not in SEARCH_MODES:
+            raise RequestError(f"'mode' must be one of: {', '.join(SEARCH_MODES)}")
+        if options["filter"] is not None:
+            try:
+                filter_clause(options["filter"])
+            except ValueError as e:
+                raise RequestError(f"Invalid 'filter': {e}")
+        return options
+
+    @staticmethod
+    def _format_results(results: List[Tuple[Document, float]],
+                        score_threshold: Optional[float]) -> List[Dict[str, Any]]:
+        if score_threshold is not None:
+            results = [(doc, score) for doc, score in results if score >= score_threshold]
+        return [{"content": doc.page_content, "metadata": doc.metadata, "score": score}
+                for doc, score in results]
+
+    def search(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer a /search request"""
+        query = body.get("query")
+        if not isinstance(query, str) or not query.strip():
+            raise RequestError("'query' must be a non-empty string")
+        options = self._search_options(body)
+
+        results = self.pipeline.search_documents(
+            query, k=options["k"], return_scores=True,
+            nprobe=options["nprobe"], ef_search=options["ef_search"], mode=options["mode"],
+            filter=options["filter"]
+        )
+        return {"query": query, "results": self._format_results(results, options["score_threshold"])}
+
+    def batch_search(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer a /batch_search request"""
+        queries = body.get("queries")
+        if (not isinstance(queries, list) or not queries
+                or not all(isinstance(q, str) and q.strip() for q in queries)):
+            raise RequestError("'queries' must be a non-empty list of non-empty strings")
+        if len(queries) > self.max_batch_queries:
+            raise RequestError(f"At most {self.max_batch_queries} queries per batch")
+        options = self._search_options(body)
+
+        results = self.pipeline.batch_search_documents(
+            queries, k=options["k"], nprobe=options["nprobe"], ef_search=options["ef_search"],
+            mode=options["mode"], filter=options["filter"]
+        )
+        return {"results": [{"query": query, "results": self._format_results(result, options["score_threshold"])}
+                            for query, result in zip(queries, results)]}
+
+    def info(self) -> Dict[str, Any]:
+        """Answer an /info request"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["uptime_seconds"] = time.time() - self.started_at
+        return {"index": self.pipeline.get_index_info(), "server": stats,
+                "query_cache": self.pipeline.get_query_cache_stats()}
+
+    def _record(self, key: str, amount: float = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _watch_index(self) -> None:
+        """Poll for newly published index versions and swap them in without blocking searches"""
+        while not self._stop_reload.wait(self.reload_interval):
+            try:
+                if self.pipeline.reload_index_if_changed():
+                    self._record("reloads")
+            except Exception as e:
+                print(f"⚠️  Index reload failed, keeping the current version: {str(e)}")
+
+    def _make_handler(self):
+        server = self
+
+        class SearchHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+                data = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _read_body(self) -> Dict[str, Any]:
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > MAX_BODY_BYTES:
+                    raise RequestError(f"Request body larger than {MAX_BODY_BYTES} bytes")
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                    raise RequestError(f"Invalid JSON: {e}")
+                if not isinstance(body, dict):
+                    raise RequestError("Request body must be a JSON object")
+                return body
+
+            def do_GET(self):
+                server._record("requests")
+                if self.path in ("/info", "/health"):
+                    self._send_json(200, server.info() if self.path == "/info" else {"status": "ok"})
+                else:
+                    self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+            def do_POST(self):
+                server._record("requests")
+                handlers = {"/search": server.search, "/batch_search": server.batch_search}
+                if self.path not in handlers:
+                    self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+                    return
+
+                try:
+                    body = self._read_body()
+                except RequestError as e:
+                    server._record("errors")
+                    self._send_json(400, {"error": str(e)})
+                    return
+
+                if not server._slots.acquire(timeout=server.queue_timeout):
+                    server._record("rejected")
+                    self._send_json(503, {"error": "Server busy, try again later"})
+                    return
+                start = time.monotonic()
+                try:
+                    payload = handlers[self.path](body)
+                except RequestError as e:
+                    server._record("errors")
+                    self._send_json(400, {"error": str(e)})
+                    return
+                except Exception as e:
+                    server._record("errors")
+                    self._send_json(500, {"error": str(e)})
+                    return
+                finally:
+                    server._slots.release()
+
+                elapsed = time.monotonic() - start
+                server._record("queries", len(body.get("queries", [])) if self.path == "/batch_search" else 1)
+                server._record("search_seconds", elapsed)
+                payload["elapsed_ms"] = elapsed * 1000
+                self._send_json(200, payload)
+
+        return SearchHandler
+
+    def serve_forever(self) -> None:
+        """Serve until SIGINT/SIGTERM, letting in-flight requests finish"""
+        def request_shutdown(signum, frame):
+            print(f"\n🔄 Received signal {signum}, shutting down after in-flight requests...")
+            # shutdown() blocks until serve_forever returns, so it cannot run on this thread
+            threading.Thread(target=self.httpd.shutdown, daemon=True).start()
+
+        previous = {}
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                previous[signum] = signal.signal(signum, request_shutdown)
+
+        if self.reload_interval > 0:
+            self._stop_reload.clear()
+            threading.Thread(target=self._watch_index, daemon=True).start()
+
+        host, port = self.address
+        print(f"✅ Serving on http://{host}:{port} (POST /search, POST /batch_search, GET /info)")
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self._stop_reload.set()
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+            self.httpd.server_close()
+            print("✅ Server stopped")
+
+    def shutdown(self) -> None:
+        """Stop a server running serve_forever() on another thread"""
+        self.httpd.shutdown()
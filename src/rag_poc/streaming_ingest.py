@@ -0,0 +1,310 @@
+"""
+Streaming ingest: convert, split, embed and index documents in overlapping stages
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain.embeddings.base import Embeddings
+from langchain.schema import Document
+
+from .document_processing.html_splitter import HTMLDocumentSplitter
+from .document_processing.parallel_conversion import run_in_worker_pool
+from .utils.memory import format_memory_usage, get_memory_usage
+from .vectorstore.faiss_store import FAISSVectorStore
+
+# Marks the end of a stage's output
+_END = object()
+
+# How often blocked queue operations re-check for cancellation
+_POLL_INTERVAL = 0.1
+
+
+class _Cancelled(Exception):
+    """Raised inside a stage when another stage has failed"""
+
+
+class StageStats:
+    """Item counts and busy time of one pipeline stage"""
+
+    def __init__(self, name: str, unit: str):
+        self.name = name
+        self.unit = unit
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.errors = 0
+        self.peak_queue_depth = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "unit": self.unit,
+            "busy_seconds": self.busy_seconds,
+            "items_per_second": self.items / self.busy_seconds if self.busy_seconds else 0.0,
+            "errors": self.errors,
+            "peak_queue_depth": self.peak_queue_depth,
+        }
+
+
+class StreamingIngestor:
+    """
+    Ingest documents through bounded queues so conversion, splitting, embedding
+    and index insertion overlap instead of running as whole-corpus steps
+    """
+
+    def __init__(self,
+                 document_converter,
+                 html_splitter: HTMLDocumentSplitter,
+                 embeddings: Embeddings,
+                 vector_store: FAISSVectorStore,
+                 queue_size: int = 8,
+                 embed_batch_size: int = 256,
+                 conversion_workers: int = 1,
+                 conversion_timeout: Optional[float] = None):
+        """
+        Initialize streaming ingestor
+
+        Args:
+            document_converter: Converter with convert_file() (and _init_kwargs() for worker processes)
+            html_splitter: Splitter for converted HTML files
+            embeddings: Embedding model for chunk batches
+            vector_store: Store that receives embedded batches
+            queue_size: Maximum items buffered between two stages (bounds peak memory)
+            embed_batch_size: Chunks per embedding call and index insertion
+            conversion_workers: Number of worker processes for document conversion
+            conversion_timeout: Per-file conversion timeout in seconds (optional)
+        """
+        self.document_converter = document_converter
+        self.html_splitter = html_splitter
+        self.embeddings = embeddings
+        self.vector_store = vector_store
+        self.queue_size = max(1, queue_size)
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.conversion_workers = conversion_workers
+        self.conversion_timeout = conversion_timeout
+
+        self._stop = threading.Event()
+        self._errors: List[BaseException] = []
+
+    def _put(self, q: queue.Queue, item: Any, stats: StageStats) -> None:
+        """Put with backpressure, giving up if the pipeline has been cancelled"""
+        while True:
+            if self._stop.is_set():
+                raise _Cancelled()
+            try:
+                q.put(item, timeout=_POLL_INTERVAL)
+                stats.peak_queue_depth = max(stats.peak_queue_depth, q.qsize())
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q: queue.Queue) -> Any:
+        """Get the next item, giving up if the pipeline has been cancelled"""
+        while True:
+            if self._stop.is_set():
+                raise _Cancelled()
+            try:
+                return q.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+    def _run_stage(self, body: Callable[[], None], output: Optional[queue.Queue], stats: StageStats) -> None:
+        """Run a stage body, signalling downstream on completion and cancelling everything on failure"""
+        try:
+            body()
+            if output is not None:
+                self._put(output, _END, stats)
+        except _Cancelled:
+            pass
+        except BaseException as e:
+            self._errors.append(e)
+            self._stop.set()
+
+    def run(self, file_paths: List[str], output_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Stream documents into the vector store
+
+        Args:
+            file_paths: List of document file paths
+            output_dir: Directory to save HTML files
+
+        Returns:
+            Dict with per-stage statistics, chunk count, elapsed time and peak memory
+        """
+        self._stop.clear()
+        self._errors = []
+
+        html_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        chunk_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        batch_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        convert_stats = StageStats("convert", "files")
+        split_stats = StageStats("split", "files")
+        embed_stats = StageStats("embed", "chunks")
+        index_stats = StageStats("index", "chunks")
+        peak_rss = {"mb": get_memory_usage()["rss_mb"]}
+        total = len(file_paths)
+
+        def sample_memory() -> None:
+            peak_rss["mb"] = max(peak_rss["mb"], get_memory_usage()["rss_mb"])
+
+        def convert() -> None:
+            def report(task_index: int, success: bool, value: Any) -> None:
+                file_path = file_paths[task_index]
+                if success:
+                    convert_stats.items += 1
+                    print(f"[{task_index + 1}/{total}] ✅ Converted: {file_path} -> {value}")
+                    self._put(html_queue, (file_path, value), convert_stats)
+                else:
+                    convert_stats.errors += 1
+                    print(f"[{task_index + 1}/{total}] ❌ Error converting {file_path}: {value}")
+
+            if self.conversion_workers > 1 or self.conversion_timeout is not None:
+                # Results are handed on as each worker finishes; a full queue stalls the pool
+                start = time.monotonic()
+                run_in_worker_pool(
+                    type(self.document_converter),
+                    self.document_converter._init_kwargs(),
+                    "convert_file",
+                    [(file_path, output_dir) for file_path in file_paths],
+                    workers=self.conversion_workers,
+                    timeout=self.conversion_timeout,
+                    on_result=report
+                )
+                convert_stats.busy_seconds = time.monotonic() - start
+                return
+
+            for i, file_path in enumerate(file_paths):
+                start = time.monotonic()
+                try:
+                    html_file = self.document_converter.convert_file(file_path, output_dir)
+                    success, value = True, html_file
+                except Exception as e:
+                    success, value = False, str(e)
+                convert_stats.busy_seconds += time.monotonic() - start
+                report(i, success, value)
+
+        def split() -> None:
+            while True:
+                item = self._get(html_queue)
+                if item is _END:
+                    return
+                file_path, html_file = item
+                start = time.monotonic()
+                try:
+                    # Chunks are keyed by the original document, as in the other ingest modes
+                    chunks = self.html_splitter.split_html_file(html_file, source_name=file_path)
+                except Exception as e:
+                    split_stats.errors += 1
+                    print(f"❌ Error splitting {html_file}: {str(e)}")
+                    continue
+                finally:
+                    split_stats.busy_seconds += time.monotonic() - start
+                split_stats.items += 1
+                if chunks:
+                    self._put(chunk_queue, chunks, split_stats)
+
+        def embed() -> None:
+            pending: List[Document] = []
+
+            def flush(batch: List[Document]) -> None:
+                start = time.monotonic()
+                vectors = self.embeddings.embed_documents([doc.page_content for doc in batch])
+                embed_stats.busy_seconds += time.monotonic() - start
+                embed_stats.items += len(batch)
+                self._put(batch_queue, (batch, vectors), embed_stats)
+
+            while True:
+                chunks = self._get(chunk_queue)
+                if chunks is _END:
+                    break
+                pending.extend(chunks)
+                while len(pending) >= self.embed_batch_size:
+                    flush(pending[:self.embed_batch_size])
+                    del pending[:self.embed_batch_size]
+            if pending:
+                flush(pending)
+
+        def insert() -> None:
+            # Index types that need training (IVF) cannot start from the first batch;
+            # without an existing index their vectors are held until the end
+            deferred = self.vector_store.index is None and self.vector_store.needs_training()
+            if deferred:
+                print(f"⚠️  Index spec '{self.vector_store.index_spec}' needs training: "
+                      "buffering embeddings until all batches are ready")
+            held_documents: List[Document] = []
+            held_vectors: List[List[float]] = []
+
+            while True:
+                batch = self._get(batch_queue)
+                if batch is _END:
+                    break
+                documents, vectors = batch
+                start = time.monotonic()
+                if deferred:
+                    held_documents.extend(documents)
+                    held_vectors.extend(vectors)
+                else:
+                    self.vector_store.add_embeddings(documents, vectors)
+                    index_stats.items += len(documents)
+                index_stats.busy_seconds += time.monotonic() - start
+                sample_memory()
+
+            if held_documents:
+                start = time.monotonic()
+                self.vector_store.add_embeddings(held_documents, held_vectors)
+                index_stats.items += len(held_documents)
+                index_stats.busy_seconds += time.monotonic() - start
+                sample_memory()
+
+        print(f"🔄 Streaming {total} documents (queue size {self.queue_size}, "
+              f"embedding batch {self.embed_batch_size})...")
+        start_time = time.monotonic()
+        stages = [
+            (convert, html_queue, convert_stats),
+            (split, chunk_queue, split_stats),
+            (embed, batch_queue, embed_stats),
+            (insert, None, index_stats),
+        ]
+        threads = [
+            threading.Thread(target=self._run_stage, args=stage, name=f"ingest-{stage[2].name}", daemon=True)
+            for stage in stages
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=_POLL_INTERVAL)
+        except KeyboardInterrupt:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            raise
+
+        if self._errors:
+            raise self._errors[0]
+
+        sample_memory()
+        return {
+            "stages": {s.name: s.as_dict() for s in (convert_stats, split_stats, embed_stats, index_stats)},
+            "files": total,
+            "chunks": index_stats.items,
+            "elapsed_seconds": time.monotonic() - start_time,
+            "peak_rss_mb": peak_rss["mb"],
+            "memory": format_memory_usage(get_memory_usage()),
+        }
+
+
+def print_ingest_stats(stats: Dict[str, Any]) -> None:
+    """Print a per-stage throughput report of a streaming ingest run"""
+    elapsed = stats["elapsed_seconds"]
+    print(f"\n📊 Streaming ingest: {stats['files']} files, {stats['chunks']} chunks in {elapsed:.1f}s")
+    print(f"  {'Stage':<8} {'Items':>8} {'Busy':>8} {'Rate':>18} {'Errors':>7} {'Peak queue':>11}")
+    for name, stage in stats["stages"].items():
+        rate = f"{stage['items_per_second']:.1f} {stage['unit']}/s"
+        print(f"  {name:<8} {stage['items']:>8} {stage['busy_seconds']:>7.1f}s {rate:>18} "
+              f"{stage['errors']:>7} {stage['peak_queue_depth']:>11}")
+    print(f"  Peak RSS: {stats['peak_rss_mb']:.1f} MB, now {stats['memory']}")
@@ -0,0 +1,41 @@
+"""
+Process memory reporting utilities
+"""
+
+import resource
+import sys
+from typing import Dict
+
+
+def get_memory_usage() -> Dict[str, float]:
+    """
+    Get resident memory of the current process in MB
+
+    On Linux the resident set is split into anonymous (private to this
+    process) and file-backed pages (e.g. a memory-mapped index, shareable
+    through the page cache). Other platforms only report peak RSS.
+
+    Returns:
+        Dict with "rss_mb" and, where available, "rss_anon_mb" and "rss_file_mb"
+    """
+    try:
+        with open("/proc/self/status") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        usage = {"rss_mb": int(fields["VmRSS"].split()[0]) / 1024}
+        if "RssAnon" in fields:
+            usage["rss_anon_mb"] = int(fields["RssAnon"].split()[0]) / 1024
+            usage["rss_file_mb"] = int(fields["RssFile"].split()[0]) / 1024
+        return usage
+    except (OSError, KeyError, ValueError):
+        # ru_maxrss is in bytes on macOS and kilobytes on Linux
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return {"rss_mb": max_rss / divisor}
+
+
+def format_memory_usage(usage: Dict[str, float]) -> str:
+    """Format a get_memory_usage() result for display"""
+    text = f"{usage['rss_mb']:.1f} MB RSS"
+    if "rss_anon_mb" in usage:
+        text += f" ({usage['rss_anon_mb']:.1f} MB private, {usage['rss_file_mb']:.1f} MB file-backed)"
+    return text
@@ -0,0 +1,30 @@
+"""
+Token counting with the embedding model's tokenizer
+"""
+
+from typing import Callable
+
+import tiktoken
+
+# text-embedding-ada-002 and text-embedding-3-* all use cl100k_base
+EMBEDDING_ENCODING = "cl100k_base"
+
+
+def get_token_counter(encoding_name: str = EMBEDDING_ENCODING) -> Callable[[str], int]:
+    """
+    Get a function counting the tokens of a text
+
+    Args:
+        encoding_name: tiktoken encoding name
+
+    Returns:
+        Callable mapping a text to its token count
+    """
+    try:
+        encoding = tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        # The BPE file is downloaded on first use; estimate tokens when offline
+        print(f"⚠️  tiktoken encoding unavailable, estimating token counts: {e}")
+        return lambda text: len(text) // 3 + 1
+
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
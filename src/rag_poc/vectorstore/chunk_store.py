@@ -0,0 +1,386 @@
+"""
+SQLite-backed store of chunk text and metadata keyed by FAISS id
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from langchain.schema import Document
+
+from .keyword_index import FTS_TOKENCHARS, match_query, tokenize
+
+# Comparison operators of metadata filters
+_FILTER_OPERATORS = {"$eq": "=", "$ne": "!=", "$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+
+
+def filter_clause(filter: Dict[str, Any]) -> Tuple[str, List[Any]]:
+    """
+    Translate a metadata filter into an SQL condition on the chunks table
+
+    Every key names a metadata field and all conditions must hold. A value
+    is matched for equality, a list for membership, and a dict of operators
+    ($eq, $ne, $gt, $gte, $lt, $lte, $in, $nin) for comparisons, e.g.
+    {"source": "a.html", "Header 1": ["Setup", "FAQ"], "date": {"$gte": "2024-01-01"}}.
+
+    Args:
+        filter: Metadata filter
+
+    Returns:
+        Tuple of (SQL condition, bound parameters)
+    """
+    if not isinstance(filter, dict) or not filter:
+        raise ValueError("Metadata filter must be a non-empty dict of field conditions")
+
+    conditions, params = [], []
+    for key, condition in filter.items():
+        if not isinstance(key, str) or not key or '"' in key:
+            raise ValueError(f"Invalid metadata filter field: {key!r}")
+        # The literal path lets SQLite use the chunks_source expression index
+        field = "json_extract(metadata, '$.source')" if key == "source" else "json_extract(metadata, ?)"
+        field_params = [] if key == "source" else [f'$."{key}"']
+
+        if isinstance(condition, list):
+            condition = {"$in": condition}
+        elif not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        for operator, value in condition.items():
+            if operator in ("$in", "$nin"):
+                if not isinstance(value, list) or not value:
+                    raise ValueError(f"'{operator}' of field '{key}' needs a non-empty list")
+                negate = "NOT " if operator == "$nin" else ""
+                conditions.append(f"{field} {negate}IN ({','.join('?' * len(value))})")
+                params.extend(field_params + value)
+            elif operator in _FILTER_OPERATORS:
+                conditions.append(f"{field} {_FILTER_OPERATORS[operator]} ?")
+                params.extend(field_params + [value])
+            else:
+                raise ValueError(f"Unknown metadata filter operator '{operator}' for field '{key}'")
+
+    return " AND ".join(conditions), params
+
+
+class ChunkStore:
+    """Chunk text and metadata in SQLite, hydrated on demand by FAISS id"""
+
+    # SQLite limits the number of bound parameters per statement
+    LOOKUP_BATCH_SIZE = 500
+
+    def __init__(self, path: str = ":memory:", work_dir: Optional[str] = None):
+        """
+        Initialize chunk store
+
+        Args:
+            path: Path of the SQLite database (":memory:" for a new, unsaved index)
+            work_dir: Treat the database as a published snapshot: the first write
+                copies it to a private working file in this directory
+        """
+        self.path = path
+        self._work_dir = work_dir
+        self._work_path: Optional[str] = None
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                id INTEGER PRIMARY KEY,
+                page_content TEXT NOT NULL,
+                metadata TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+        # Chunk ids by source document, for deleting/replacing one document
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS chunks_source ON chunks (json_extract(metadata, '$.source'))"
+        )
+        # Sync manifest: which chunk ids each source document produced
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sources (
+                path TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                chunk_ids TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+        # Indexes saved before keyword search get their BM25 table on first use
+        self._has_keyword_index = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'chunks_fts'"
+        ).fetchone() is not None
+
+    def _before_write(self) -> None:
+        """Detach from a published snapshot into a private copy before its first modification"""
+        if self._work_dir is None or self._work_path is not None:
+            return
+
+        fd, work_path = tempfile.mkstemp(prefix=".chunks-", suffix=".sqlite", dir=self._work_dir)
+        os.close(fd)
+        work_conn = sqlite3.connect(work_path, check_same_thread=False)
+        self._conn.backup(work_conn)
+        self._conn.close()
+        self._conn = work_conn
+        self._work_path = work_path
+        self.path = work_path
+
+    def _ensure_keyword_index(self) -> None:
+        """Create the BM25 full-text table and fill it from the stored chunks (caller holds the lock)"""
+        if self._has_keyword_index:
+            return
+
+        self._before_write()
+        self._conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(tokens, "
+            f"tokenize = \"unicode61 tokenchars '{FTS_TOKENCHARS}'\")"
+        )
+        total = self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+        if total:
+            print(f"🔄 Building keyword index for {total} chunks...")
+            last_id = -1
+            while True:
+                rows = self._conn.execute(
+                    "SELECT id, page_content FROM chunks WHERE id > ? ORDER BY id LIMIT 1000", (last_id,)
+                ).fetchall()
+                if not rows:
+                    break
+                self._conn.executemany(
+                    "INSERT INTO chunks_fts (rowid, tokens) VALUES (?, ?)",
+                    [(chunk_id, " ".join(tokenize(page_content))) for chunk_id, page_content in rows]
+                )
+                last_id = rows[-1][0]
+        self._conn.commit()
+        self._has_keyword_index = True
+
+    def add(self, ids: List[int], documents: List[Document]) -> None:
+        """
+        Store documents under their FAISS ids
+
+        Args:
+            ids: FAISS ids of the documents
+            documents: Documents to store
+        """
+        rows = [
+            (int(chunk_id), doc.page_content, json.dumps(doc.metadata, ensure_ascii=False, default=str))
+            for chunk_id, doc in zip(ids, documents)
+        ]
+        with self._lock:
+            self._before_write()
+            self._ensure_keyword_index()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO chunks (id, page_content, metadata) VALUES (?, ?, ?)", rows
+            )
+            self._conn.executemany("DELETE FROM chunks_fts WHERE rowid = ?", [(row[0],) for row in rows])
+            self._conn.executemany(
+                "INSERT INTO chunks_fts (rowid, tokens) VALUES (?, ?)",
+                [(int(chunk_id), " ".join(tokenize(doc.page_content))) for chunk_id, doc in zip(ids, documents)]
+            )
+            self._conn.commit()
+
+    def get(self, ids: List[int]) -> Dict[int, Document]:
+        """
+        Hydrate documents by FAISS id
+
+        Args:
+            ids: FAISS ids to look up
+
+        Returns:
+            Dict of id -> Document for the ids that exist
+        """
+        documents = {}
+        unique_ids = list(dict.fromkeys(int(i) for i in ids))
+
+        with self._lock:
+            for start in range(0, len(unique_ids), self.LOOKUP_BATCH_SIZE):
+                batch = unique_ids[start:start + self.LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT id, page_content, metadata FROM chunks WHERE id IN ({placeholders})", batch
+                ).fetchall()
+                for chunk_id, page_content, metadata in rows:
+                    documents[chunk_id] = Document(page_content=page_content, metadata=json.loads(metadata))
+
+        return documents
+
+    def delete(self, ids: List[int]) -> None:
+        """Delete documents by FAISS id"""
+        with self._lock:
+            self._before_write()
+            self._ensure_keyword_index()
+            self._conn.executemany("DELETE FROM chunks WHERE id = ?", [(int(i),) for i in ids])
+            self._conn.executemany("DELETE FROM chunks_fts WHERE rowid = ?", [(int(i),) for i in ids])
+            self._conn.commit()
+
+    def keyword_search(self,
+                       query: str,
+                       k: int = 5,
+                       filter: Optional[Dict[str, Any]] = None) -> List[Tuple[int, float]]:
+        """
+        Rank chunks against a query by BM25
+
+        Args:
+            query: Search query
+            k: Number of results to return
+            filter: Only rank chunks whose metadata matches (see filter_clause)
+
+        Returns:
+            List of (FAISS id, BM25 score) tuples, higher scores first
+        """
+        expression = match_query(query)
+        if not expression:
+            return []
+
+        restriction, params = "", []
+        if filter is not None:
+            condition, params = filter_clause(filter)
+            restriction = f"AND rowid IN (SELECT id FROM chunks WHERE {condition}) "
+
+        with self._lock:
+            self._ensure_keyword_index()
+            # FTS5's bm25() is negated so that ascending order ranks best first
+            rows = self._conn.execute(
+                f"SELECT rowid, bm25(chunks_fts) FROM chunks_fts WHERE chunks_fts MATCH ? {restriction}"
+                "ORDER BY bm25(chunks_fts) LIMIT ?",
+                [expression] + params + [k]
+            ).fetchall()
+        return [(chunk_id, -score) for chunk_id, score in rows]
+
+    def ids_for_source(self, source: str) -> List[int]:
+        """FAISS ids of the chunks whose metadata source is the given path"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM chunks WHERE json_extract(metadata, '$.source') = ?", (source,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def ids_matching(self, filter: Dict[str, Any]) -> List[int]:
+        """
+        FAISS ids of the chunks whose metadata matches a filter
+
+        Args:
+            filter: Metadata filter (see filter_clause)
+
+        Returns:
+            Matching ids in id order
+        """
+        condition, params = filter_clause(filter)
+        with self._lock:
+            rows = self._conn.execute(f"SELECT id FROM chunks WHERE {condition} ORDER BY id", params).fetchall()
+        return [row[0] for row in rows]
+
+    def iter_documents(self, batch_size: int = 1000) -> Iterator[Tuple[int, Document]]:
+        """Iterate over all (id, document) pairs in id order"""
+        last_id = -1
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, page_content, metadata FROM chunks WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for chunk_id, page_content, metadata in rows:
+                yield chunk_id, Document(page_content=page_content, metadata=json.loads(metadata))
+            last_id = rows[-1][0]
+
+    def count(self) -> int:
+        """Number of stored chunks"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def next_id(self) -> int:
+        """Next unused FAISS id"""
+        with self._lock:
+            max_id = self._conn.execute("SELECT MAX(id) FROM chunks").fetchone()[0]
+            stored = self.get_meta("next_id")
+        candidates = [0 if max_id is None else max_id + 1, int(stored) if stored else 0]
+        return max(candidates)
+
+    def reserve_ids(self, count: int) -> List[int]:
+        """Reserve a contiguous range of new FAISS ids (never reused after deletes)"""
+        with self._lock:
+            start = self.next_id()
+            self.set_meta("next_id", str(start + count))
+        return list(range(start, start + count))
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Read an index-level metadata value"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        """Write an index-level metadata value"""
+        with self._lock:
+            self._before_write()
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+            self._conn.commit()
+
+    def get_sources(self) -> Dict[str, Dict]:
+        """
+        Read the sync manifest
+        
+        Returns:
+            Dict of source path -> {"content_hash", "mtime", "size", "chunk_ids"}
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, content_hash, mtime, size, chunk_ids FROM sources"
+            ).fetchall()
+        return {
+            path: {"content_hash": content_hash, "mtime": mtime, "size": size, "chunk_ids": json.loads(chunk_ids)}
+            for path, content_hash, mtime, size, chunk_ids in rows
+        }
+    
+    def set_source(self, path: str, content_hash: str, mtime: float, size: int, chunk_ids: List[int]) -> None:
+        """Record (or replace) the manifest entry of a source document"""
+        with self._lock:
+            self._before_write()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sources (path, content_hash, mtime, size, chunk_ids) VALUES (?, ?, ?, ?, ?)",
+                (path, content_hash, mtime, size, json.dumps([int(i) for i in chunk_ids]))
+            )
+            self._conn.commit()
+    
+    def delete_source(self, path: str) -> None:
+        """Remove the manifest entry of a source document"""
+        with self._lock:
+            self._before_write()
+            self._conn.execute("DELETE FROM sources WHERE path = ?", (path,))
+            self._conn.commit()
+    
+    def save_to(self, path: str) -> None:
+        """
+        Persist the store to a database file
+
+        Args:
+            path: Target database path (a no-op commit if it is this store's own file)
+        """
+        with self._lock:
+            self._conn.commit()
+            if self.path != ":memory:" and os.path.abspath(self.path) == os.path.abspath(path):
+                return
+
+            tmp_path = f"{path}.tmp"
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            target = sqlite3.connect(tmp_path)
+            try:
+                self._conn.backup(target)
+            finally:
+                target.close()
+            os.replace(tmp_path, path)
+
+    def close(self) -> None:
+        """Close the underlying database connection (and drop a private working copy)"""
+        with self._lock:
+            self._conn.close()
+            if self._work_path is not None and os.path.exists(self._work_path):
+                os.remove(self._work_path)
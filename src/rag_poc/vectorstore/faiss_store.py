@@ -4,13 +4,46 @@ FAISS vector store implementation for document storage and retrieval
 
 import os
 import pickle
+import shutil
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict, Any
+from typing import List, NamedTuple, Optional, Tuple, Dict, Any
 import faiss
+import numpy as np
 from langchain.schema import Document
-from langchain_community.vectorstores import FAISS
 from langchain.embeddings.base import Embeddings
 
+from .chunk_store import ChunkStore
+from .keyword_index import DEFAULT_RRF_K, reciprocal_rank_fusion
+from .parallel_build import build_index_parallel
+from .raw_vectors import RAW_VECTORS_FILE, RawVectorStore, is_quantized_spec
+from .snapshots import CURRENT_FILE, VERSIONS_DIR, publish_snapshot, read_current, snapshot_path, write_snapshot
+from ..embedding.query_cache import embed_queries
+from ..utils.memory import get_memory_usage, format_memory_usage
+
+
+# Files of a saved index directory
+INDEX_FILE = "index.faiss"
+CHUNK_STORE_FILE = "chunks.sqlite"
+LEGACY_DOCSTORE_FILE = "index.pkl"
+
+# Results taken from each retriever before hybrid rank fusion
+HYBRID_CANDIDATES = 50
+
+# Filtered searches matching at most this many chunks score the whole subset
+# exhaustively (HNSW and IVF lose recall on highly selective filters)
+EXACT_FILTER_MAX = 4096
+
+# Quantised indexes shortlist this many times k candidates and re-rank them by
+# exact distance to the original vectors (RERANK_FACTOR; 1 disables re-ranking)
+DEFAULT_RERANK_FACTOR = 4
+
+
+class IndexState(NamedTuple):
+    """Index, chunk store and original vectors that belong together, swapped as one reference"""
+    index: Optional[faiss.Index]
+    chunk_store: Optional[ChunkStore]
+    raw_vectors: Optional[RawVectorStore]
+
 
 class FAISSVectorStore:
     """FAISS-based vector store for document embeddings"""
@@ -18,66 +51,283 @@ class FAISSVectorStore:
     def __init__(self, 
                  embeddings: Embeddings,
                  index_path: Optional[str] = None,
-                 embedding_dimension: int = 1536):
+                 embedding_dimension: int = 1536,
+                 index_spec: str = "Flat",
+                 keep_versions: Optional[int] = None,
+                 rerank_factor: Optional[int] = None):
         """
         Initialize FAISS vector store
         
+        Vectors live in a FAISS index addressed by stable int64 ids; chunk text and
+        metadata live in a SQLite chunk store keyed by the same ids, so a search
+        only reads the rows of its top-k hits.
+        
         Args:
             embeddings: Embedding model instance
             index_path: Path to save/load FAISS index
             embedding_dimension: Dimension of embedding vectors
+            index_spec: FAISS index factory string, e.g. "Flat", "HNSW32",
+                "IVF4096,Flat" or "IVF4096,PQ64"; quantised specs ("SQ8", "SQfp16",
+                "PQ64", ...) also keep the original vectors on disk for exact re-ranking
+            keep_versions: Saved snapshot versions to retain (default: INDEX_KEEP_VERSIONS or 3)
+            rerank_factor: Candidates per result re-ranked by exact distance on quantised
+                indexes (default: RERANK_FACTOR or 4; 1 disables re-ranking)
         """
         self.embeddings = embeddings
         self.embedding_dimension = embedding_dimension
         self.index_path = index_path or "data/output/faiss_index"
+        self.index_spec = index_spec
+        self.keep_versions = keep_versions
+        self.rerank_factor = rerank_factor if rerank_factor is not None else int(
+            os.getenv("RERANK_FACTOR", DEFAULT_RERANK_FACTOR))
+        
+        # Snapshot version the index was loaded from or last saved as
+        self.version: Optional[str] = None
         
-        # Initialize FAISS vector store
-        self.vectorstore: Optional[FAISS] = None
+        # FAISS index, chunk store and (for quantised indexes) the memory-mapped
+        # original vectors; searches read this reference once (see snapshot)
+        self._state = IndexState(None, None, None)
+        self.mmap_loaded = False
         
         # Ensure output directory exists
         os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        
+    @property
+    def index(self) -> Optional[faiss.Index]:
+        return self._state.index
+    
+    @index.setter
+    def index(self, index: Optional[faiss.Index]) -> None:
+        self._state = self._state._replace(index=index)
+    
+    @property
+    def chunk_store(self) -> Optional[ChunkStore]:
+        return self._state.chunk_store
+    
+    @chunk_store.setter
+    def chunk_store(self, chunk_store: Optional[ChunkStore]) -> None:
+        self._state = self._state._replace(chunk_store=chunk_store)
+    
+    @property
+    def raw_vectors(self) -> Optional[RawVectorStore]:
+        return self._state.raw_vectors
+    
+    @raw_vectors.setter
+    def raw_vectors(self, raw_vectors: Optional[RawVectorStore]) -> None:
+        self._state = self._state._replace(raw_vectors=raw_vectors)
+    
+    def snapshot(self) -> IndexState:
+        """
+        Get the current index, chunk store and original vectors as one consistent view
+        
+        A hot reload replaces the whole state at once, so a search that works on
+        one snapshot never pairs a new index with an old chunk store.
+        """
+        if self._state.index is None:
+            raise ValueError("Vector store not initialized. Create or load an index first.")
+        return self._state
+    
+    # Cap on vectors used to train IVF/PQ indexes (k-means cost grows with it)
+    MAX_TRAINING_VECTORS = 500_000
+    
+    def _new_index(self, dimension: int) -> faiss.Index:
+        """Create an empty index of the configured spec that stores vectors under explicit ids"""
+        try:
+            return faiss.index_factory(dimension, f"IDMap2,{self.index_spec}")
+        except RuntimeError as e:
+            raise ValueError(f"Invalid FAISS index spec '{self.index_spec}': {e}")
+    
+    def _train_index(self, index: faiss.Index, vectors: np.ndarray) -> None:
+        """Train IVF/PQ indexes on (a sample of) the vectors being indexed"""
+        if index.is_trained:
+            return
+            
+        ivf = faiss.try_extract_index_ivf(index)
+        if ivf is not None and len(vectors) < ivf.nlist:
+            raise ValueError(
+                f"Index spec '{self.index_spec}' needs at least {ivf.nlist} vectors to train "
+                f"its {ivf.nlist} clusters, got {len(vectors)}. Use fewer IVF lists or 'Flat'."
+            )
+            
+        training_vectors = vectors
+        if len(vectors) > self.MAX_TRAINING_VECTORS:
+            sample = np.random.default_rng(0).choice(len(vectors), self.MAX_TRAINING_VECTORS, replace=False)
+            training_vectors = vectors[sample]
+            
+        print(f"Training {self.index_spec} index on {len(training_vectors)} vectors...")
+        try:
+            index.train(training_vectors)
+        except RuntimeError as e:
+            raise ValueError(f"Training index spec '{self.index_spec}' failed: {e}")
     
-    def create_index(self, documents: List[Document]) -> None:
+    def _base_index(self, index: Optional[faiss.Index] = None) -> faiss.Index:
+        index = index if index is not None else self.index
+        return faiss.downcast_index(index.index) if hasattr(index, "id_map") else index
+    
+    def _search_parameters(self, 
+                           nprobe: Optional[int] = None,
+                           ef_search: Optional[int] = None,
+                           selector: Optional[faiss.IDSelector] = None,
+                           index: Optional[faiss.Index] = None) -> Optional[faiss.SearchParameters]:
+        """Build per-query search parameters for the underlying index type"""
+        base_index = self._base_index(index)
+        ivf = faiss.try_extract_index_ivf(base_index)
+        
+        # Parameter objects replace the index defaults, so carry those over when only a selector is given
+        if ivf is not None and (nprobe is not None or selector is not None):
+            return faiss.SearchParametersIVF(sel=selector, nprobe=nprobe or ivf.nprobe)
+        if isinstance(base_index, faiss.IndexHNSW) and (ef_search is not None or selector is not None):
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=ef_search or base_index.hnsw.efSearch)
+        if selector is not None:
+            return faiss.SearchParameters(sel=selector)
+        return None
+    
+    @staticmethod
+    def _as_matrix(vectors: List[List[float]]) -> np.ndarray:
+        return np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+    
+    def create_index(self, documents: List[Document]) -> List[int]:
         """
         Create FAISS index from documents
         
         Args:
             documents: List of Document objects to index
+            
+        Returns:
+            FAISS ids assigned to the documents
         """
         if not documents:
             raise ValueError("No documents provided for indexing")
-        
+            
         print(f"Creating FAISS index from {len(documents)} documents...")
         
-        # Create FAISS vector store from documents
-        self.vectorstore = FAISS.from_documents(
-            documents=documents,
-            embedding=self.embeddings
-        )
+        vectors = self._as_matrix(self.embeddings.embed_documents([doc.page_content for doc in documents]))
+        ids = self._create_from_vectors(documents, vectors)
+        
+        print("FAISS index created successfully")
+        return ids
+    
+    def create_index_parallel(self,
+                              documents: List[Document],
+                              workers: int,
+                              work_dir: Optional[str] = None,
+                              max_retries: int = 2) -> List[int]:
+        """
+        Create FAISS index from documents with partial indexes built by parallel workers
+        
+        Each worker embeds a slice of the documents into its own partial index;
+        the partials are merged at the end. Finished partials are checkpointed,
+        so rerunning a failed build only redoes the partials that failed.
         
+        Args:
+            documents: List of Document objects to index
+            workers: Number of worker threads
+            work_dir: Checkpoint directory (default: .build inside the index path)
+            max_retries: Extra attempts per failed partial
+            
+        Returns:
+            FAISS ids assigned to the documents
+        """
+        if not documents:
+            raise ValueError("No documents provided for indexing")
+        if workers <= 1:
+            return self.create_index(documents)
+            
+        print(f"Creating FAISS index from {len(documents)} documents with {workers} workers...")
+        chunk_store = ChunkStore()
+        chunk_store.set_meta("index_spec", self.index_spec)
+        ids = chunk_store.reserve_ids(len(documents))
+        try:
+            index, raw_vectors = build_index_parallel(self, documents, ids, workers,
+                                                      work_dir or os.path.join(self.index_path, ".build"),
+                                                      max_retries=max_retries,
+                                                      keep_raw_vectors=is_quantized_spec(self.index_spec))
+        except BaseException:
+            chunk_store.close()
+            raise
+        chunk_store.add(ids, documents)
+        
+        self.reset()
+        self._state = IndexState(index, chunk_store, raw_vectors)
         print("FAISS index created successfully")
+        return ids
+    
+    def _create_from_vectors(self, documents: List[Document], vectors: np.ndarray) -> List[int]:
+        """Replace the current index with a new one built from precomputed vectors"""
+        if self.chunk_store is not None:
+            self.chunk_store.close()
+        self.mmap_loaded = False
+        index = self._new_index(vectors.shape[1])
+        self._train_index(index, vectors)
+        self.index = index
+        self.chunk_store = ChunkStore()
+        self.chunk_store.set_meta("index_spec", self.index_spec)
+        self.raw_vectors = RawVectorStore(vectors.shape[1]) if is_quantized_spec(self.index_spec) else None
+        return self._add_vectors(documents, vectors)
+    
+    def needs_training(self) -> bool:
+        """Whether creating an index of the configured spec requires a training pass"""
+        return not self._new_index(self.embedding_dimension).is_trained
     
-    def add_documents(self, documents: List[Document]) -> None:
+    def _add_vectors(self, documents: List[Document], vectors: np.ndarray) -> List[int]:
+        """Add precomputed vectors and their documents under newly reserved ids"""
+        ids = self.chunk_store.reserve_ids(len(documents))
+        self.index.add_with_ids(vectors, np.asarray(ids, dtype=np.int64))
+        if self.raw_vectors is not None:
+            self.raw_vectors.add(ids, vectors)
+        self.chunk_store.add(ids, documents)
+        return ids
+    
+    def add_documents(self, documents: List[Document]) -> List[int]:
         """
         Add documents to existing index
         
         Args:
             documents: List of Document objects to add
+            
+        Returns:
+            FAISS ids assigned to the documents
         """
         if not documents:
-            return
+            return []
+            
+        if self.index is None:
+            return self.create_index(documents)
+            
+        print(f"Adding {len(documents)} documents to existing index...")
+        vectors = self.embeddings.embed_documents([doc.page_content for doc in documents])
+        ids = self.add_embeddings(documents, vectors)
+        print("Documents added successfully")
+        return ids
+    
+    def add_embeddings(self, documents: List[Document], vectors: List[List[float]]) -> List[int]:
+        """
+        Add documents with precomputed embeddings, creating the index if needed
         
-        if self.vectorstore is None:
-            self.create_index(documents)
-        else:
-            print(f"Adding {len(documents)} documents to existing index...")
-            self.vectorstore.add_documents(documents)
-            print("Documents added successfully")
+        Args:
+            documents: List of Document objects to add
+            vectors: Embedding vectors aligned with documents
+            
+        Returns:
+            FAISS ids assigned to the documents
+        """
+        if not documents:
+            return []
+            
+        vectors = self._as_matrix(vectors)
+        if self.index is None:
+            return self._create_from_vectors(documents, vectors)
+            
+        self._ensure_writable()
+        return self._add_vectors(documents, vectors)
     
     def similarity_search(self, 
                          query: str, 
                          k: int = 5,
-                         score_threshold: Optional[float] = None) -> List[Document]:
+                         score_threshold: Optional[float] = None,
+                         nprobe: Optional[int] = None,
+                         ef_search: Optional[int] = None,
+                         filter: Optional[Dict[str, Any]] = None) -> List[Document]:
         """
         Perform similarity search
         
@@ -85,83 +335,607 @@ class FAISSVectorStore:
             query: Search query
             k: Number of results to return
             score_threshold: Minimum similarity score (optional)
+            nprobe: IVF lists to visit per query (IVF indexes only)
+            ef_search: HNSW search beam width (HNSW indexes only)
+            filter: Only search chunks whose metadata matches, e.g. {"source": "a.html"}
+                (see chunk_store.filter_clause for operators)
             
         Returns:
             List of similar documents
         """
-        if self.vectorstore is None:
-            raise ValueError("Vector store not initialized. Create or load an index first.")
+        docs_and_scores = self.similarity_search_with_scores(query, k=k, nprobe=nprobe, ef_search=ef_search,
+                                                             filter=filter)
         
         if score_threshold is not None:
             # Use similarity search with score threshold
-            docs_and_scores = self.vectorstore.similarity_search_with_score(query, k=k)
             return [doc for doc, score in docs_and_scores if score >= score_threshold]
         else:
-            return self.vectorstore.similarity_search(query, k=k)
+            return [doc for doc, score in docs_and_scores]
     
     def similarity_search_with_scores(self, 
-                                    query: str, 
-                                    k: int = 5) -> List[Tuple[Document, float]]:
+                                    query: str,
+                                    k: int = 5,
+                                    nprobe: Optional[int] = None,
+                                    ef_search: Optional[int] = None,
+                                    filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
         """
         Perform similarity search with scores
         
         Args:
             query: Search query
             k: Number of results to return
+            nprobe: IVF lists to visit per query (IVF indexes only)
+            ef_search: HNSW search beam width (HNSW indexes only)
+            filter: Only search chunks whose metadata matches (see similarity_search)
+            
+        Returns:
+            List of (document, score) tuples, score being the L2 distance
+        """
+        if self.index is None:
+            raise ValueError("Vector store not initialized. Create or load an index first.")
+            
+        query_vector = self.embeddings.embed_query(query)
+        return self.similarity_search_by_vector_with_scores(query_vector, k=k, nprobe=nprobe, ef_search=ef_search,
+                                                            filter=filter)
+    
+    def similarity_search_by_vector_with_scores(self,
+                                               query_vector: List[float],
+                                               k: int = 5,
+                                               nprobe: Optional[int] = None,
+                                               ef_search: Optional[int] = None,
+                                               filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
+        """
+        Perform similarity search for an already embedded query
+        
+        Args:
+            query_vector: Query embedding
+            k: Number of results to return
+            nprobe: IVF lists to visit per query (IVF indexes only)
+            ef_search: HNSW search beam width (HNSW indexes only)
+            filter: Only search chunks whose metadata matches (see similarity_search)
+            
+        Returns:
+            List of (document, score) tuples, score being the L2 distance
+        """
+        if self.index is None:
+            raise ValueError("Vector store not initialized. Create or load an index first.")
+            
+        return self.batch_similarity_search_by_vectors([query_vector], k=k, nprobe=nprobe, ef_search=ef_search,
+                                                       filter=filter)[0]
+    
+    def batch_similarity_search(self,
+                                queries: List[str],
+                                k: int = 5,
+                                nprobe: Optional[int] = None,
+                                ef_search: Optional[int] = None,
+                                filter: Optional[Dict[str, Any]] = None) -> List[List[Tuple[Document, float]]]:
+        """
+        Perform similarity search for many queries at once
+        
+        All queries are embedded in one embedding call and searched with a
+        single index.search over the stacked query matrix.
+        
+        Args:
+            queries: Search queries
+            k: Number of results to return per query
+            nprobe: IVF lists to visit per query (IVF indexes only)
+            ef_search: HNSW search beam width (HNSW indexes only)
+            filter: Only search chunks whose metadata matches (see similarity_search)
+            
+        Returns:
+            One list of (document, score) tuples per query, in query order
+        """
+        if self.index is None:
+            raise ValueError("Vector store not initialized. Create or load an index first.")
+        if not queries:
+            return []
+            
+        query_vectors = embed_queries(self.embeddings, queries)
+        return self.batch_similarity_search_by_vectors(query_vectors, k=k, nprobe=nprobe, ef_search=ef_search,
+                                                       filter=filter)
+    
+    def batch_similarity_search_by_vectors(self,
+                                           query_vectors: List[List[float]],
+                                           k: int = 5,
+                                           nprobe: Optional[int] = None,
+                                           ef_search: Optional[int] = None,
+                                           filter: Optional[Dict[str, Any]] = None) -> List[List[Tuple[Document, float]]]:
+        """
+        Perform similarity search for already embedded queries
+        
+        Args:
+            query_vectors: Query embeddings
+            k: Number of results to return per query
+            nprobe: IVF lists to visit per query (IVF indexes only)
+            ef_search: HNSW search beam width (HNSW indexes only)
+            filter: Only search chunks whose metadata matches (see similarity_search)
+            
+        Returns:
+            One list of (document, score) tuples per query, score being the L2 distance
+        """
+        state = self.snapshot()
+        distances, ids = self.search_vectors(query_vectors, k=k, nprobe=nprobe, ef_search=ef_search, filter=filter,
+                                             state=state)
+        return self._hydrate(state, distances, ids)
+    
+    def search_vectors(self,
+                       query_vectors: List[List[float]],
+                       k: int = 5,
+                       nprobe: Optional[int] = None,
+                       ef_search: Optional[int] = None,
+                       filter: Optional[Dict[str, Any]] = None,
+                       state: Optional[IndexState] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Search the index for already embedded queries, returning ids instead of documents
+        
+        The filter is resolved to an id set in the chunk store and handed to
+        FAISS as an IDSelector, so only matching vectors are scored.
+        
+        Args:
+            query_vectors: Query embeddings
+            k: Number of results to return per query
+            nprobe: IVF lists to visit per query (IVF indexes only)
+            ef_search: HNSW search beam width (HNSW indexes only)
+            filter: Only search chunks whose metadata matches (see similarity_search)
+            state: Snapshot to search (default: the current one); pass the snapshot
+                whose chunk store will hydrate the ids
+            
+        Returns:
+            Distance and id matrices with one row per query, missing hits having id -1
+        """
+        if state is None:
+            state = self.snapshot()
+        query_matrix = self._as_matrix(query_vectors)
+        selector = None
+        if filter is not None:
+            ids = np.asarray(state.chunk_store.ids_matching(filter), dtype=np.int64)
+            if len(ids) == 0:
+                empty = np.full((len(query_matrix), k), -1, dtype=np.int64)
+                return empty.astype(np.float32), empty
+            if len(ids) <= EXACT_FILTER_MAX:
+                ivf = faiss.try_extract_index_ivf(self._base_index(state.index))
+                if ivf is None or state.raw_vectors is not None:
+                    vectors = (state.raw_vectors.get(ids) if state.raw_vectors is not None
+                               else state.index.reconstruct_batch(ids))
+                    distances, positions = faiss.knn(query_matrix, vectors, min(k, len(ids)))
+                    return distances, np.where(positions >= 0, ids[positions], -1)
+                # IVF cannot reconstruct by id without a direct map; probing every list
+                # instead only scores the selected entries and cannot miss any of them
+                nprobe = ivf.nlist
+            selector = faiss.IDSelectorBatch(ids)
+            
+        params = self._search_parameters(nprobe=nprobe, ef_search=ef_search, selector=selector, index=state.index)
+        if state.raw_vectors is None or self.rerank_factor <= 1:
+            return state.index.search(query_matrix, k, params=params)
+        _, candidate_ids = state.index.search(query_matrix, k * self.rerank_factor, params=params)
+        return self._rerank(state.raw_vectors, query_matrix, candidate_ids, k)
+    
+    @staticmethod
+    def _rerank(raw_vectors: RawVectorStore,
+                query_matrix: np.ndarray,
+                candidate_ids: np.ndarray,
+                k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Order a shortlist from the quantised index by exact L2 distance to the original vectors"""
+        unique_ids, rows = np.unique(candidate_ids, return_inverse=True)
+        # Padding ids (-1) read row 0 and are masked below
+        vectors = raw_vectors.get(np.maximum(unique_ids, 0))
+        differences = vectors[rows.reshape(candidate_ids.shape)] - query_matrix[:, None, :]
+        distances = np.einsum("qcd,qcd->qc", differences, differences)
+        distances[candidate_ids < 0] = np.inf
+        
+        order = np.argsort(distances, axis=1, kind="stable")[:, :k]
+        return np.take_along_axis(distances, order, 1), np.take_along_axis(candidate_ids, order, 1)
+    
+    def keyword_search(self,
+                       query: str,
+                       k: int = 5,
+                       filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
+        """
+        Perform BM25 keyword search over the chunk text
+        
+        Args:
+            query: Search query
+            k: Number of results to return
+            filter: Only search chunks whose metadata matches (see similarity_search)
+            
+        Returns:
+            List of (document, score) tuples, score being the BM25 score (higher is better)
+        """
+        chunk_store = self.snapshot().chunk_store
+        ranked = chunk_store.keyword_search(query, k=k, filter=filter)
+        documents = chunk_store.get([chunk_id for chunk_id, _ in ranked])
+        return [(documents[chunk_id], score) for chunk_id, score in ranked if chunk_id in documents]
+    
+    def hybrid_search(self,
+                      query: str,
+                      k: int = 5,
+                      nprobe: Optional[int] = None,
+                      ef_search: Optional[int] = None,
+                      candidates: int = HYBRID_CANDIDATES,
+                      rrf_k: int = DEFAULT_RRF_K,
+                      filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
+        """
+        Perform hybrid search fusing vector and BM25 keyword rankings
+        
+        Args:
+            query: Search query
+            k: Number of results to return
+            nprobe: IVF lists to visit per query (IVF indexes only)
+            ef_search: HNSW search beam width (HNSW indexes only)
+            candidates: Results taken from each retriever before fusion
+            rrf_k: Reciprocal rank fusion constant
+            filter: Only search chunks whose metadata matches (see similarity_search)
+            
+        Returns:
+            List of (document, score) tuples, score being the fused RRF score (higher is better)
+        """
+        if self.index is None:
+            raise ValueError("Vector store not initialized. Create or load an index first.")
+            
+        query_vector = self.embeddings.embed_query(query)
+        return self._fuse([query], [query_vector], k, nprobe, ef_search, candidates, rrf_k, filter)[0]
+    
+    def batch_hybrid_search(self,
+                            queries: List[str],
+                            k: int = 5,
+                            nprobe: Optional[int] = None,
+                            ef_search: Optional[int] = None,
+                            candidates: int = HYBRID_CANDIDATES,
+                            rrf_k: int = DEFAULT_RRF_K,
+                            filter: Optional[Dict[str, Any]] = None) -> List[List[Tuple[Document, float]]]:
+        """
+        Perform hybrid search for many queries, embedding and vector-searching them at once
+        
+        Args:
+            queries: Search queries
+            k: Number of results to return per query
+            nprobe: IVF lists to visit per query (IVF indexes only)
+            ef_search: HNSW search beam width (HNSW indexes only)
+            candidates: Results taken from each retriever before fusion
+            rrf_k: Reciprocal rank fusion constant
+            filter: Only search chunks whose metadata matches (see similarity_search)
             
         Returns:
-            List of (document, score) tuples
+            One list of (document, score) tuples per query, in query order
         """
-        if self.vectorstore is None:
+        if self.index is None:
             raise ValueError("Vector store not initialized. Create or load an index first.")
+        if not queries:
+            return []
+            
+        query_vectors = embed_queries(self.embeddings, queries)
+        return self._fuse(queries, query_vectors, k, nprobe, ef_search, candidates, rrf_k, filter)
+    
+    def _fuse(self,
+              queries: List[str],
+              query_vectors: List[List[float]],
+              k: int,
+              nprobe: Optional[int],
+              ef_search: Optional[int],
+              candidates: int,
+              rrf_k: int,
+              filter: Optional[Dict[str, Any]]) -> List[List[Tuple[Document, float]]]:
+        """Fuse the vector and keyword rankings of each query and hydrate the top k"""
+        state = self.snapshot()
+        candidates = max(candidates, k)
+        _, dense_ids = self.search_vectors(query_vectors, k=candidates, nprobe=nprobe, ef_search=ef_search,
+                                           filter=filter, state=state)
         
-        return self.vectorstore.similarity_search_with_score(query, k=k)
+        fused_rows = []
+        for query, row_ids in zip(queries, dense_ids):
+            vector_ranking = [int(i) for i in row_ids if i != -1]
+            keyword_hits = state.chunk_store.keyword_search(query, k=candidates, filter=filter)
+            keyword_ranking = [chunk_id for chunk_id, _ in keyword_hits]
+            fused = reciprocal_rank_fusion([vector_ranking, keyword_ranking], rrf_k=rrf_k)
+            fused_rows.append(list(fused.items())[:k])
+            
+        documents = state.chunk_store.get([chunk_id for row in fused_rows for chunk_id, _ in row])
+        return [[(documents[chunk_id], score) for chunk_id, score in row if chunk_id in documents]
+                for row in fused_rows]
     
-    def save_index(self, path: Optional[str] = None) -> None:
+    @staticmethod
+    def _hydrate(state: IndexState, distances: np.ndarray, ids: np.ndarray) -> List[List[Tuple[Document, float]]]:
+        """Load the documents of all result rows from the chunk store in one lookup"""
+        documents = state.chunk_store.get([int(i) for i in np.unique(ids) if i != -1])
+        return [
+            [(documents[int(i)], float(d)) for d, i in zip(row_distances, row_ids) if int(i) in documents]
+            for row_distances, row_ids in zip(distances, ids)
+        ]
+    
+    def save_index(self, path: Optional[str] = None, publish: bool = True) -> None:
         """
-        Save FAISS index to disk
+        Save FAISS index to disk as a new snapshot version
+        
+        The index and chunk store are written to a new versioned directory and
+        published by atomically replacing the CURRENT pointer, so readers never
+        see a half-written index and a crash leaves the previous version live.
         
         Args:
             path: Path to save index (optional, uses default if not provided)
+            publish: Make the new version live; False only writes it, for a caller
+                that publishes it by other means (self.version names it either way)
         """
-        if self.vectorstore is None:
+        if self.index is None:
             raise ValueError("No vector store to save")
-        
+            
         save_path = path or self.index_path
-        save_dir = os.path.dirname(save_path)
-        os.makedirs(save_dir, exist_ok=True)
+        os.makedirs(save_path, exist_ok=True)
         
         print(f"Saving FAISS index to {save_path}...")
-        self.vectorstore.save_local(save_path)
-        print("Index saved successfully")
+        self.chunk_store.set_meta("dimension", str(self.index.d))
+        
+        def write_files(snapshot_dir: str) -> None:
+            self.chunk_store.save_to(os.path.join(snapshot_dir, CHUNK_STORE_FILE))
+            faiss.write_index(self.index, os.path.join(snapshot_dir, INDEX_FILE))
+            if self.raw_vectors is not None:
+                self.raw_vectors.save_to(os.path.join(snapshot_dir, RAW_VECTORS_FILE))
+            
+        manifest = {"document_count": self.get_document_count(), "dimension": self.index.d,
+                    "index_spec": self.index_spec, "parent": self.version}
+        if publish:
+            version = publish_snapshot(save_path, write_files, manifest, keep_versions=self.keep_versions)
+        else:
+            version = write_snapshot(save_path, write_files, manifest)
+        self.version = version
+        if self.raw_vectors is not None:
+            # Page the saved vectors in on demand instead of holding them in RAM
+            self.raw_vectors.attach(os.path.join(snapshot_path(save_path, version), RAW_VECTORS_FILE))
+        
+        # Files of the flat (pre-snapshot) layout are superseded by the first version
+        for name in (INDEX_FILE, CHUNK_STORE_FILE):
+            flat_file = os.path.join(save_path, name)
+            if os.path.exists(flat_file):
+                os.remove(flat_file)
+        print(f"Index saved successfully (version {version})")
     
-    def load_index(self, path: Optional[str] = None) -> None:
+    def load_index(self, path: Optional[str] = None, mmap: bool = False, version: Optional[str] = None) -> None:
         """
         Load FAISS index from disk
         
         Args:
             path: Path to load index from (optional, uses default if not provided)
+            mmap: Memory-map the index file instead of reading it into RAM, so that
+                several processes on one host share the vectors through the page cache
+            version: Snapshot version to load (default: the live one named by CURRENT)
+        """
+        root = path or self.index_path
+        version = version or read_current(root)
+        
+        if version is None:
+            # Flat layout written before versioned snapshots
+            if not (os.path.exists(f"{root}.faiss") or 
+                    os.path.exists(os.path.join(root, INDEX_FILE))):
+                raise FileNotFoundError(f"FAISS index not found at {root}")
+                
+            if not os.path.exists(os.path.join(root, CHUNK_STORE_FILE)):
+                if not os.path.exists(os.path.join(root, LEGACY_DOCSTORE_FILE)):
+                    raise FileNotFoundError(f"Chunk store not found at {root}")
+                self._upgrade_legacy_index(root)
+                version = read_current(root)
+                
+        load_path = snapshot_path(root, version) if version else root
+        memory_before = get_memory_usage()
+        print(f"Loading FAISS index from {load_path}{' (memory-mapped)' if mmap else ''}...")
+        
+        if self.chunk_store is not None:
+            self.chunk_store.close()
+        index = faiss.read_index(os.path.join(load_path, INDEX_FILE), self._mmap_io_flags() if mmap else 0)
+        # Saved snapshots are immutable: modifications go to a private copy until the next save
+        chunk_store = ChunkStore(os.path.join(load_path, CHUNK_STORE_FILE), work_dir=root)
+        self._state = IndexState(index, chunk_store, self._open_raw_vectors(load_path, index.d))
+        self.index_spec = chunk_store.get_meta("index_spec") or "Flat"
+        self.mmap_loaded = mmap
+        self.version = version
+        
+        print(f"Index loaded successfully{f' (version {version})' if version else ''}")
+        print(f"  Memory before load: {format_memory_usage(memory_before)}")
+        print(f"  Memory after load:  {format_memory_usage(get_memory_usage())}")
+    
+    def _upgrade_legacy_index(self, load_path: str) -> None:
+        """
+        Convert an index saved by LangChain's FAISS wrapper (index.faiss + pickled
+        docstore) into the id-mapped index + SQLite chunk store layout
+        """
+        print(f"Upgrading legacy pickled index at {load_path}...")
+        
+        with open(os.path.join(load_path, LEGACY_DOCSTORE_FILE), "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+        legacy_index = faiss.read_index(os.path.join(load_path, INDEX_FILE))
+        
+        # Legacy positions become the FAISS ids
+        positions = sorted(index_to_docstore_id)
+        vectors = np.vstack([legacy_index.reconstruct(int(i)) for i in positions]) if positions else None
+        
+        self.index_spec = "Flat"
+        index = self._new_index(legacy_index.d)
+        chunk_store = ChunkStore()
+        chunk_store.set_meta("index_spec", self.index_spec)
+        if positions:
+            index.add_with_ids(vectors, np.asarray(positions, dtype=np.int64))
+            chunk_store.add(positions, [docstore.search(index_to_docstore_id[i]) for i in positions])
+            chunk_store.set_meta("next_id", str(positions[-1] + 1))
+            
+        self.index = index
+        self.chunk_store = chunk_store
+        self.save_index(load_path)
+        chunk_store.close()
+        self.index, self.chunk_store = None, None
+        
+        os.remove(os.path.join(load_path, LEGACY_DOCSTORE_FILE))
+        print(f"Upgraded {len(positions)} chunks to {CHUNK_STORE_FILE}")
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Switch to the live snapshot if another process published a newer version
+        
+        The new version is loaded completely before it replaces the current
+        index, so concurrent searches keep using the previous one meanwhile.
+        
+        Returns:
+            True if a new version was loaded
+        """
+        version = read_current(self.index_path)
+        if version is None or version == self.version:
+            return False
+            
+        load_path = snapshot_path(self.index_path, version)
+        index = faiss.read_index(os.path.join(load_path, INDEX_FILE),
+                                 self._mmap_io_flags() if self.mmap_loaded else 0)
+        chunk_store = ChunkStore(os.path.join(load_path, CHUNK_STORE_FILE), work_dir=self.index_path)
+        raw_vectors = self._open_raw_vectors(load_path, index.d)
+        
+        # One reference assignment, so searches see either the old or the new state; the
+        # previous chunk store is left to the garbage collector as in-flight searches may still read it
+        self._state = IndexState(index, chunk_store, raw_vectors)
+        self.index_spec = chunk_store.get_meta("index_spec") or "Flat"
+        previous, self.version = self.version, version
+        print(f"🔄 Reloaded index version {version} (was {previous})")
+        return True
+    
+    @staticmethod
+    def _open_raw_vectors(load_path: str, dimension: int) -> Optional[RawVectorStore]:
+        """Memory-map the original vectors saved with a quantised index, if any"""
+        raw_path = os.path.join(load_path, RAW_VECTORS_FILE)
+        if not os.path.exists(raw_path):
+            return None
+        return RawVectorStore(dimension, raw_path)
+    
+    @staticmethod
+    def _mmap_io_flags() -> int:
+        """FAISS IO flags for a read-only memory-mapped load"""
+        # IO_FLAG_MMAP_IFC (FAISS >= 1.8) maps flat vector storage in place;
+        # older versions only support IO_FLAG_MMAP for inverted lists
+        mmap_flag = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+        return mmap_flag | faiss.IO_FLAG_READ_ONLY
+    
+    def delete(self, ids: List[int]) -> int:
+        """
+        Delete vectors and their chunks by FAISS id
+        
+        Args:
+            ids: FAISS ids to delete
+            
+        Returns:
+            Number of vectors removed from the index
+        """
+        if self.index is None:
+            raise ValueError("Vector store not initialized. Create or load an index first.")
+        if not ids:
+            return 0
+            
+        self._ensure_writable()
+        id_array = np.asarray(sorted(set(int(i) for i in ids)), dtype=np.int64)
+        if faiss.try_extract_index_ivf(self._base_index()) is not None:
+            # IDMap2 compacts its id map on remove_ids but IVF keeps its inner labels,
+            # which would then point at the wrong ids: rebuild instead
+            removed = self._rebuild_without(id_array)
+        else:
+            try:
+                removed = self.index.remove_ids(faiss.IDSelectorBatch(id_array))
+            except RuntimeError:
+                # Graph indexes (HNSW) cannot remove entries: rebuild from the remaining vectors
+                removed = self._rebuild_without(id_array)
+        self.chunk_store.delete(id_array.tolist())
+        return int(removed)
+    
+    def delete_by_source(self, source: str) -> int:
         """
-        load_path = path or self.index_path
+        Delete all chunks of one source document
         
-        # Check for both possible file structures
-        if not (os.path.exists(f"{load_path}.faiss") or 
-                os.path.exists(os.path.join(load_path, "index.faiss"))):
-            raise FileNotFoundError(f"FAISS index not found at {load_path}")
+        Chunks are found by their "source" metadata (an indexed lookup in the
+        chunk store); a sync manifest entry for the path is dropped as well.
         
-        print(f"Loading FAISS index from {load_path}...")
-        self.vectorstore = FAISS.load_local(
-            load_path, 
-            embeddings=self.embeddings,
-            allow_dangerous_deserialization=True
-        )
-        print("Index loaded successfully")
+        Args:
+            source: Source path as stored in the chunks' metadata
+            
+        Returns:
+            Number of vectors removed from the index
+        """
+        if self.index is None:
+            raise ValueError("Vector store not initialized. Create or load an index first.")
+            
+        ids = self.chunk_store.ids_for_source(source)
+        manifest_entry = self.chunk_store.get_sources().get(os.path.abspath(source))
+        if manifest_entry is not None:
+            ids = list(dict.fromkeys(ids + manifest_entry["chunk_ids"]))
+            self.chunk_store.delete_source(os.path.abspath(source))
+        return self.delete(ids)
+    
+    def upsert_documents(self, documents: List[Document]) -> List[int]:
+        """
+        Replace the chunks of the documents' sources with the given chunks
+        
+        Only the given chunks are embedded (unchanged chunks come from the
+        embedding cache); the previous chunks of each source are deleted
+        once the new vectors are available.
+        
+        Args:
+            documents: New chunks, grouped into sources by their "source" metadata
+            
+        Returns:
+            FAISS ids assigned to the documents
+        """
+        if not documents:
+            return []
+        if self.index is None:
+            return self.create_index(documents)
+            
+        vectors = self.embeddings.embed_documents([doc.page_content for doc in documents])
+        sources = list(dict.fromkeys(doc.metadata.get("source") for doc in documents))
+        removed = sum(self.delete_by_source(source) for source in sources if source is not None)
+        ids = self.add_embeddings(documents, vectors)
+        print(f"Upserted {len(sources)} sources: -{removed} / +{len(ids)} chunks")
+        return ids
+    
+    def _rebuild_without(self, id_array: np.ndarray) -> int:
+        """Rebuild the index without the given ids, for index types whose remove_ids is unusable"""
+        all_ids = faiss.vector_to_array(self.index.id_map)
+        keep_ids = all_ids[~np.isin(all_ids, id_array)]
+        print(f"Rebuilding {self.index_spec} index without {len(all_ids) - len(keep_ids)} deleted vectors...")
+        
+        # Work on a copy, as searches may still be reading the current index
+        index = faiss.clone_index(self.index)
+        ivf = faiss.try_extract_index_ivf(self._base_index(index))
+        vectors = None
+        if len(keep_ids) and self.raw_vectors is not None:
+            vectors = self.raw_vectors.get(keep_ids)
+        elif len(keep_ids):
+            if ivf is not None:
+                # IVF can only reconstruct entries through a direct map
+                ivf.make_direct_map()
+            vectors = index.reconstruct_batch(keep_ids)
+            
+        # The emptied copy keeps its trained quantizer, so the rebuild skips training
+        index.reset()
+        if ivf is not None:
+            ivf.make_direct_map(False)
+        if vectors is not None:
+            index.add_with_ids(vectors, keep_ids)
+        self.index = index
+        return len(all_ids) - len(keep_ids)
+    
+    def _ensure_writable(self) -> None:
+        """Copy a memory-mapped index into RAM before it is modified"""
+        if self.mmap_loaded:
+            print("Copying memory-mapped index into memory for modification...")
+            # clone_index would keep viewing the mapping; a serialize round trip owns its data
+            self.index = faiss.deserialize_index(faiss.serialize_index(self.index))
+            self.mmap_loaded = False
     
     def get_document_count(self) -> int:
         """Get the number of documents in the index"""
-        if self.vectorstore is None:
+        if self.index is None:
             return 0
-        return self.vectorstore.index.ntotal
+        return self.index.ntotal
+    
+    def reset(self) -> None:
+        """Drop the in-memory index so the next insertion starts a new one (files on disk are kept)"""
+        if self.chunk_store is not None:
+            self.chunk_store.close()
+        self.index = None
+        self.chunk_store = None
+        self.raw_vectors = None
+        self.mmap_loaded = False
     
     def delete_index(self, path: Optional[str] = None) -> None:
         """
@@ -172,24 +946,41 @@ class FAISSVectorStore:
         """
         delete_path = path or self.index_path
         
+        if self.chunk_store is not None:
+            self.chunk_store.close()
+            
         # Delete FAISS index files
-        for ext in ['.faiss', '.pkl']:
-            file_path = f"{delete_path}{ext}"
+        file_paths = [f"{delete_path}{ext}" for ext in ['.faiss', '.pkl']]
+        file_paths += [os.path.join(delete_path, name)
+                       for name in [CURRENT_FILE, INDEX_FILE, CHUNK_STORE_FILE, LEGACY_DOCSTORE_FILE]]
+        for file_path in file_paths:
             if os.path.exists(file_path):
                 os.remove(file_path)
                 print(f"Deleted {file_path}")
-        
-        self.vectorstore = None
+                
+        versions_dir = os.path.join(delete_path, VERSIONS_DIR)
+        if os.path.isdir(versions_dir):
+            shutil.rmtree(versions_dir)
+            print(f"Deleted {versions_dir}")
+            
+        self.index = None
+        self.chunk_store = None
+        self.raw_vectors = None
+        self.version = None
         print("Index deleted successfully")
     
     def get_index_info(self) -> Dict[str, Any]:
         """Get information about the current index"""
-        if self.vectorstore is None:
+        if self.index is None:
             return {"status": "No index loaded", "document_count": 0}
-        
+            
         return {
             "status": "Index loaded",
             "document_count": self.get_document_count(),
             "embedding_dimension": self.embedding_dimension,
-            "index_path": self.index_path
+            "index_path": self.index_path,
+            "index_spec": self.index_spec,
+            "memory_mapped": self.mmap_loaded,
+            "rerank_factor": self.rerank_factor if self.raw_vectors is not None else None,
+            "version": self.version
         }
\ No newline at end of file
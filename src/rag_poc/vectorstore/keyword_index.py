@@ -0,0 +1,92 @@
+"""
+Keyword (BM25) retrieval helpers: CJK/English tokenisation and reciprocal rank fusion
+
+Chunks are tokenised in Python and stored as space-separated tokens in an
+SQLite FTS5 table of the chunk store, which ranks matches with BM25. Doing the
+tokenisation here rather than in an FTS5 tokenizer keeps CJK handling and
+identifier splitting identical at index and query time.
+"""
+
+import re
+from typing import Dict, Iterable, List, Sequence
+
+# Hiragana, Katakana, CJK ideographs (incl. extension A and compatibility) and Hangul
+_CJK_CHARS = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+
+# A CJK run, or an alphanumeric word that may contain inner joiners, so that
+# product codes and version strings ("RX-100", "v2.3.1", "a_b/c") stay whole
+_TOKEN_RE = re.compile(
+    rf"(?P<cjk>[{_CJK_CHARS}]+)"
+    rf"|(?P<word>[^\W_{_CJK_CHARS}]+(?:[._\-/][^\W_{_CJK_CHARS}]+)*)"
+)
+_JOINER_RE = re.compile(r"[._\-/]")
+
+# Characters FTS5 must treat as part of a token (matching the joiners above)
+FTS_TOKENCHARS = "._-/"
+
+# Constant of reciprocal rank fusion (Cormack et al.): dampens the weight of top ranks
+DEFAULT_RRF_K = 60
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into search tokens
+
+    English words are case-folded; compound identifiers are kept whole and
+    also split into their parts (single characters dropped). CJK text has no word boundaries, so runs are
+    indexed as overlapping character bigrams (a lone character as itself).
+
+    Args:
+        text: Text to tokenise
+
+    Returns:
+        Tokens in text order
+    """
+    tokens = []
+    for match in _TOKEN_RE.finditer(text):
+        cjk = match.group("cjk")
+        if cjk:
+            if len(cjk) == 1:
+                tokens.append(cjk)
+            else:
+                tokens.extend(cjk[i:i + 2] for i in range(len(cjk) - 1))
+            continue
+
+        word = match.group("word").casefold()
+        tokens.append(word)
+        if _JOINER_RE.search(word):
+            tokens.extend(part for part in _JOINER_RE.split(word) if len(part) > 1)
+    return tokens
+
+
+def match_query(query: str) -> str:
+    """
+    Build an FTS5 MATCH expression that matches chunks containing any query token
+
+    Returns:
+        MATCH expression, empty if the query has no searchable tokens
+    """
+    terms = dict.fromkeys(tokenize(query))
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[int]], rrf_k: int = DEFAULT_RRF_K) -> Dict[int, float]:
+    """
+    Fuse several rankings of chunk ids by reciprocal rank fusion
+
+    Each ranking contributes 1 / (rrf_k + rank) for every id it contains, so
+    ids ranked highly by several retrievers come first without having to
+    calibrate their incomparable scores.
+
+    Args:
+        rankings: Chunk ids per retriever, best first
+        rrf_k: Fusion constant
+
+    Returns:
+        Dict of id -> fused score, best first
+    """
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, chunk_id in enumerate(ranking, 1):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (rrf_k + rank)
+    return dict(sorted(scores.items(), key=lambda item: item[1], reverse=True))
@@ -0,0 +1,227 @@
+"""
+Bulk index build from partial indexes built in parallel
+
+The chunk list is split into partials. Worker threads embed their partials
+(embedding is network-bound) and build one partial FAISS index each (FAISS
+releases the GIL while adding). The partials are then merged into the final
+index with merge_from, which for IVF indexes moves the inverted lists.
+Graph indexes (HNSW) cannot be merged; for them only the embedding runs in
+parallel and the final index is built once.
+
+Trained index types (IVF, PQ) are trained once on a sample of all vectors,
+so every partial shares the same quantizer. The embeddings of every slice,
+the trained empty index and every finished partial are checkpointed in a
+work directory, keyed by a fingerprint of their chunks, so a rerun after a
+failure only redoes the embeddings and partials that did not finish.
+"""
+
+import hashlib
+import math
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import faiss
+import numpy as np
+from langchain.schema import Document
+
+from .raw_vectors import RawVectorStore
+
+if TYPE_CHECKING:
+    from .faiss_store import FAISSVectorStore
+
+# Upper bound of chunks per partial: more, smaller partials make a retry cheaper
+MAX_PARTIAL_SIZE = 50_000
+
+
+def _fingerprint(parts: List[str]) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def _write_index(index: faiss.Index, path: str) -> None:
+    faiss.write_index(index, f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+
+
+def _can_merge(template: faiss.IndexIDMap2) -> bool:
+    """Whether indexes cloned from a trained template support merge_from (graph indexes do not)"""
+    target, partial = faiss.clone_index(template), faiss.clone_index(template)
+    try:
+        faiss.downcast_index(target.index).merge_from(faiss.downcast_index(partial.index), 0)
+        return True
+    except RuntimeError:
+        return False
+
+
+def _merge(target: faiss.IndexIDMap2, partial: faiss.IndexIDMap2) -> None:
+    """Merge a partial into the target index"""
+    ids = faiss.vector_to_array(partial.id_map)
+    if not len(ids):
+        return
+    # IndexIDMap2.merge_from restarts the inner ids of every partial at 0, so merge the inner
+    # indexes directly: IVF lists take the running offset, flat codes only append in order
+    inner, other = faiss.downcast_index(target.index), faiss.downcast_index(partial.index)
+    try:
+        inner.merge_from(other, inner.ntotal)
+    except RuntimeError:
+        inner.merge_from(other, 0)
+    faiss.copy_array_to_vector(np.concatenate([faiss.vector_to_array(target.id_map), ids]), target.id_map)
+    target.ntotal = inner.ntotal
+    target.construct_rev_map()
+
+
+def build_index_parallel(store: "FAISSVectorStore",
+                         documents: List[Document],
+                         ids: List[int],
+                         workers: int,
+                         work_dir: str,
+                         max_retries: int = 2,
+                         keep_raw_vectors: bool = False) -> Tuple[faiss.Index, Optional[RawVectorStore]]:
+    """
+    Build one index of the store's spec from partials built in parallel
+
+    Args:
+        store: Vector store providing the embeddings and index spec
+        documents: Chunks to index
+        ids: FAISS ids of the chunks
+        workers: Worker threads embedding and building partials
+        work_dir: Directory for checkpoints of the trained index and finished partials
+        max_retries: Extra attempts per failed partial before giving up
+        keep_raw_vectors: Also collect the original vectors (for quantised indexes)
+
+    Returns:
+        Tuple of (merged index holding every chunk, original vectors if kept)
+    """
+    num_partials = max(workers, math.ceil(len(documents) / MAX_PARTIAL_SIZE))
+    partial_size = math.ceil(len(documents) / num_partials)
+    bounds = [(start, min(start + partial_size, len(documents)))
+              for start in range(0, len(documents), partial_size)]
+
+    # Embeddings do not depend on the index spec; partial indexes and the trained template do
+    spec = store.index_spec
+    chunk_fingerprints = [_fingerprint([str(ids[start])] + [doc.page_content for doc in documents[start:end]])
+                          for start, end in bounds]
+    vector_files = [os.path.join(work_dir, f"vectors-{i:04d}-{fp}.f32") for i, fp in enumerate(chunk_fingerprints)]
+    partial_files = [os.path.join(work_dir, f"partial-{i:04d}-{_fingerprint([spec, fp])}.faiss")
+                     for i, fp in enumerate(chunk_fingerprints)]
+    trained_file = os.path.join(work_dir, f"trained-{_fingerprint([spec] + chunk_fingerprints)}.faiss")
+    os.makedirs(work_dir, exist_ok=True)
+
+    def with_retries(task, items: List[int], label: str) -> Tuple[Dict[int, object], List[int]]:
+        results: Dict[int, object] = {}
+        failed = list(items)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="build") as executor:
+            for attempt in range(max_retries + 1):
+                if not failed:
+                    break
+                futures = {i: executor.submit(task, i) for i in failed}
+                failed = []
+                for i, future in futures.items():
+                    try:
+                        results[i] = future.result()
+                    except Exception as e:
+                        print(f"⚠️  {label} of partial {i} failed (attempt {attempt + 1}): {e!r}")
+                        failed.append(i)
+        return results, failed
+
+    # Phase 1: embed the slices not checkpointed yet; each is written as soon as it is embedded
+    to_embed = [i for i, path in enumerate(vector_files) if not os.path.exists(path)]
+    if len(to_embed) < len(bounds):
+        print(f"♻️  Reusing the embeddings of {len(bounds) - len(to_embed)} of {len(bounds)} partials from {work_dir}")
+    print(f"Embedding {len(to_embed)} partials with {workers} workers...")
+    start_time = time.monotonic()
+
+    def embed(i: int) -> np.ndarray:
+        start, end = bounds[i]
+        vectors = store._as_matrix(store.embeddings.embed_documents([doc.page_content for doc in documents[start:end]]))
+        vectors.tofile(f"{vector_files[i]}.tmp")
+        os.replace(f"{vector_files[i]}.tmp", vector_files[i])
+        return vectors
+
+    embedded, failed = with_retries(embed, to_embed, "Embedding")
+    print(f"  - Embedded {sum(len(v) for v in embedded.values())} chunks in {time.monotonic() - start_time:.1f}s")
+    available = [i for i in range(len(bounds)) if i not in failed]
+
+    def partial_vectors(i: int) -> np.ndarray:
+        if i in embedded:
+            return embedded[i]
+        start, end = bounds[i]
+        return np.fromfile(vector_files[i], dtype=np.float32).reshape(end - start, -1)
+
+    # Phase 2: train once so that all partials share one quantizer
+    if not os.path.exists(trained_file):
+        if not available or (failed and store.needs_training()):
+            raise RuntimeError(f"Embedding of {len(failed)} partials failed; cannot create the {spec} index. "
+                               f"Finished embeddings are kept in {work_dir}; rerun the build to retry only the rest.")
+        template = store._new_index(partial_vectors(available[0]).shape[1])
+        if not template.is_trained:
+            # Sample before stacking so training never holds a second copy of every vector
+            keep = min(1.0, store.MAX_TRAINING_VECTORS / len(documents))
+            rng = np.random.default_rng(0)
+            sample = []
+            for i in available:
+                vectors = partial_vectors(i)
+                sample.append(vectors if keep == 1.0 else vectors[rng.random(len(vectors)) < keep])
+            store._train_index(template, np.vstack(sample))
+        _write_index(template, trained_file)
+    # Always use the template as read back: the round trip normalises index types (IndexFlat
+    # becomes IndexFlatL2), so its clones can be merged with partials read from disk
+    template = faiss.read_index(trained_file)
+
+    raw_vectors = RawVectorStore(template.d) if keep_raw_vectors else None
+    if not _can_merge(template):
+        # Graph indexes (HNSW) cannot be merged: building partial graphs would be wasted work,
+        # so the final index is built once from the embeddings (FAISS parallelises the adds)
+        if failed:
+            raise RuntimeError(f"Embedding of {len(failed)} of {len(bounds)} partials failed (partials "
+                               f"{sorted(failed)}). Finished embeddings are kept in {work_dir}; "
+                               f"rerun the build to retry only the rest.")
+        start_time = time.monotonic()
+        index = faiss.clone_index(template)
+        for i, (start, end) in enumerate(bounds):
+            vectors = partial_vectors(i)
+            index.add_with_ids(vectors, np.asarray(ids[start:end], dtype=np.int64))
+            if raw_vectors is not None:
+                raw_vectors.add(ids[start:end], vectors)
+        print(f"  - Indexed {index.ntotal} vectors in {time.monotonic() - start_time:.1f}s")
+        shutil.rmtree(work_dir, ignore_errors=True)
+        return index, raw_vectors
+
+    # Phase 3: fill one partial index per slice
+    to_build = [i for i in available if not os.path.exists(partial_files[i])]
+    if len(available) - len(to_build):
+        print(f"♻️  Reusing {len(available) - len(to_build)} of {len(bounds)} partial indexes from {work_dir}")
+    start_time = time.monotonic()
+
+    def build(i: int) -> None:
+        start, end = bounds[i]
+        partial = faiss.clone_index(template)
+        partial.add_with_ids(partial_vectors(i), np.asarray(ids[start:end], dtype=np.int64))
+        _write_index(partial, partial_files[i])
+
+    _, build_failed = with_retries(build, to_build, "Indexing")
+    failed += build_failed
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(bounds)} partials failed (partials {sorted(failed)}). "
+                           f"Finished partials are kept in {work_dir}; rerun the build to retry only the rest.")
+    print(f"  - Built {len(to_build)} partial indexes in {time.monotonic() - start_time:.1f}s")
+
+    # Merge in id order
+    start_time = time.monotonic()
+    index = faiss.clone_index(template)
+    for i, path in enumerate(partial_files):
+        _merge(index, faiss.read_index(path))
+        if raw_vectors is not None:
+            start, end = bounds[i]
+            raw_vectors.add(ids[start:end], partial_vectors(i))
+    print(f"  - Merged {len(partial_files)} partials into {index.ntotal} vectors "
+          f"in {time.monotonic() - start_time:.1f}s")
+
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return index, raw_vectors
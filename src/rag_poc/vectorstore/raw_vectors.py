@@ -0,0 +1,123 @@
+"""
+Full-precision copy of the indexed vectors on disk, for exact re-ranking
+
+Quantised indexes (SQ8, SQfp16, PQ, ...) only keep compressed codes in RAM.
+The original float32 vectors are saved next to the index in a flat file
+whose row i holds the vector of FAISS id i, and read through a memory map,
+so re-ranking a shortlist only pages in the rows of its candidates.
+"""
+
+import os
+import re
+import shutil
+from typing import List, Optional
+
+import numpy as np
+
+# File of a saved index directory holding the original vectors
+RAW_VECTORS_FILE = "vectors.f32"
+
+# Index factory components that store lossy codes instead of the vectors
+_LOSSY_COMPONENT_RE = re.compile(r"(?:^|[,_])(?:O?PQ|SQ|P?RQ|P?LSQ|PCA)", re.IGNORECASE)
+
+
+def is_quantized_spec(index_spec: str) -> bool:
+    """Whether an index factory string compresses the vectors (SQ, PQ, ...) rather than storing them"""
+    return _LOSSY_COMPONENT_RE.search(index_spec) is not None
+
+
+class RawVectorStore:
+    """Float32 vectors by FAISS id: a memory-mapped saved file plus the rows added since"""
+
+    def __init__(self, dimension: int, path: Optional[str] = None):
+        """
+        Initialize raw vector store
+
+        Args:
+            dimension: Vector dimension
+            path: Saved vector file to memory-map (None for a new, unsaved index)
+        """
+        self.dimension = dimension
+        self.path: Optional[str] = None
+        self._saved = np.empty((0, dimension), dtype=np.float32)
+        self._added: List[np.ndarray] = []
+        if path is not None:
+            self.attach(path)
+
+    @property
+    def rows(self) -> int:
+        return len(self._saved) + sum(len(block) for block in self._added)
+
+    def attach(self, path: str) -> None:
+        """Switch to a saved file holding every current row, dropping the in-memory rows"""
+        rows = os.path.getsize(path) // (self.dimension * 4)
+        if self._added and rows != self.rows:
+            raise ValueError(f"{path} holds {rows} vectors, expected {self.rows}")
+        self._saved = (np.memmap(path, dtype=np.float32, mode="r", shape=(rows, self.dimension))
+                       if rows else np.empty((0, self.dimension), dtype=np.float32))
+        self._added = []
+        self.path = path
+
+    def add(self, ids: List[int], vectors: np.ndarray) -> None:
+        """
+        Append the vectors of newly reserved ids
+
+        Args:
+            ids: Consecutive FAISS ids, above every id stored so far
+            vectors: Vectors aligned with ids
+        """
+        if len(ids) == 0:
+            return
+        start = self.rows
+        if ids[0] < start or ids[-1] - ids[0] != len(ids) - 1:
+            raise ValueError("Raw vectors must be added under new, consecutive ids")
+        if ids[0] > start:
+            # Ids reserved without vectors (none are searched) keep their rows
+            self._added.append(np.zeros((ids[0] - start, self.dimension), dtype=np.float32))
+        self._added.append(np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(ids), self.dimension))
+
+    def get(self, ids: np.ndarray) -> np.ndarray:
+        """
+        Read the vectors of the given ids
+
+        Args:
+            ids: FAISS ids
+
+        Returns:
+            Matrix with one row per id
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = np.empty((len(ids), self.dimension), dtype=np.float32)
+        in_saved = ids < len(self._saved)
+        if in_saved.any():
+            vectors[in_saved] = self._saved[ids[in_saved]]
+        if not in_saved.all():
+            if len(self._added) > 1:
+                self._added = [np.concatenate(self._added)]
+            vectors[~in_saved] = self._added[0][ids[~in_saved] - len(self._saved)]
+        return vectors
+
+    def save_to(self, path: str) -> None:
+        """
+        Write all rows to a vector file
+
+        Args:
+            path: Target file path
+        """
+        if self.path is not None and not self._added:
+            # Saved files are never modified, so an unchanged one can be shared
+            try:
+                os.link(self.path, path)
+                return
+            except OSError:
+                pass
+
+        tmp_path = f"{path}.tmp"
+        if self.path is not None and len(self._saved):
+            shutil.copyfile(self.path, tmp_path)
+        else:
+            open(tmp_path, "wb").close()
+        with open(tmp_path, "ab") as f:
+            for block in self._added:
+                block.tofile(f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,650 @@
+"""
+Vector store partitioned across several FAISS indexes, searched in parallel
+
+Each shard is a complete FAISSVectorStore (index, chunk store, keyword index
+and versioned snapshots) in its own subdirectory, so shards stay small enough
+to build, load and save independently. Chunks are assigned to a shard by a
+hash of their source document, which keeps all chunks of a document together
+for deletes and upserts.
+
+Searches fan out to all shards on a thread pool (FAISS releases the GIL while
+searching) and the per-shard top-k lists are merged. Chunk ids are global:
+local_id * num_shards + shard.
+
+Shards write their snapshot versions without publishing them; a save then
+publishes all of them at once by atomically replacing SHARDS.json, which
+lists the live version of every shard. Readers resolve the shard versions
+from that one file, so they never combine shards from different saves.
+"""
+
+import heapq
+import json
+import os
+import shutil
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain.schema import Document
+from langchain.embeddings.base import Embeddings
+
+from .faiss_store import HYBRID_CANDIDATES, FAISSVectorStore, IndexState
+from .keyword_index import DEFAULT_RRF_K, reciprocal_rank_fusion
+from .snapshots import CURRENT_FILE, prune_versions, write_file_atomic
+from ..embedding.query_cache import embed_queries
+
+# Layout of a sharded index directory
+SHARDS_FILE = "SHARDS.json"
+
+
+def is_sharded_index(path: str) -> bool:
+    """Check whether an index directory holds a sharded index"""
+    return os.path.exists(os.path.join(path, SHARDS_FILE))
+
+
+def read_shard_config(path: str) -> Optional[Dict[str, Any]]:
+    """Read the shard configuration of an index directory (None if it is not sharded)"""
+    try:
+        with open(os.path.join(path, SHARDS_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def shard_for_source(source: str, num_shards: int) -> int:
+    """Shard of a source document (stable across processes, unlike hash())"""
+    return zlib.crc32(source.encode("utf-8")) % num_shards
+
+
+class ShardedVectorStore:
+    """FAISS vector store split into shards that are searched concurrently"""
+
+    def __init__(self,
+                 embeddings: Embeddings,
+                 index_path: Optional[str] = None,
+                 embedding_dimension: int = 1536,
+                 index_spec: str = "Flat",
+                 num_shards: Optional[int] = None,
+                 keep_versions: Optional[int] = None,
+                 rerank_factor: Optional[int] = None):
+        """
+        Initialize sharded vector store
+
+        Args:
+            embeddings: Embedding model instance
+            index_path: Directory of the sharded index
+            embedding_dimension: Dimension of embedding vectors
+            index_spec: FAISS index factory string used by every shard
+            num_shards: Number of shards (default: taken from an existing index)
+            keep_versions: Saved snapshot versions to retain per shard
+            rerank_factor: Candidates per result re-ranked by exact distance on quantised
+                indexes (each shard re-ranks its own shortlist)
+        """
+        self.embeddings = embeddings
+        self.embedding_dimension = embedding_dimension
+        self.index_path = index_path or "data/output/faiss_index"
+        self.index_spec = index_spec
+        self.keep_versions = keep_versions
+        self.rerank_factor = rerank_factor
+
+        if num_shards is None:
+            config = read_shard_config(self.index_path)
+            if config is None:
+                raise ValueError(f"No sharded index at {self.index_path}; specify the number of shards")
+            num_shards = config["num_shards"]
+            self.index_spec = config.get("index_spec", index_spec)
+        if num_shards < 1:
+            raise ValueError("Number of shards must be at least 1")
+        self.num_shards = num_shards
+
+        self.shards = [self._new_shard(self.index_path, shard) for shard in range(num_shards)]
+        # Shards modified since they were loaded or saved
+        self._dirty = set()
+        # Published version of SHARDS.json that the shards were loaded from or saved as
+        self.version: Optional[int] = None
+        self.mmap_loaded = False
+        self._executor = ThreadPoolExecutor(max_workers=num_shards, thread_name_prefix="shard")
+
+    def _new_shard(self, root: str, shard: int) -> FAISSVectorStore:
+        return FAISSVectorStore(
+            embeddings=self.embeddings,
+            index_path=self.shard_path(root, shard),
+            embedding_dimension=self.embedding_dimension,
+            index_spec=self.index_spec,
+            keep_versions=self.keep_versions,
+            rerank_factor=self.rerank_factor
+        )
+
+    @staticmethod
+    def shard_path(root: str, shard: int) -> str:
+        """Directory of one shard"""
+        return os.path.join(root, f"shard-{shard:03d}")
+
+    def _map(self, fn: Callable, items: List) -> List:
+        """Run fn over items on the shard thread pool, preserving order"""
+        if len(items) == 1:
+            return [fn(items[0])]
+        return list(self._executor.map(fn, items))
+
+    def _global_id(self, shard: int, local_id: int) -> int:
+        return int(local_id) * self.num_shards + shard
+
+    def _local_id(self, global_id: int) -> Tuple[int, int]:
+        return int(global_id) % self.num_shards, int(global_id) // self.num_shards
+
+    def _shard_of(self, document: Document) -> int:
+        source = document.metadata.get("source")
+        return shard_for_source(str(source) if source is not None else document.page_content, self.num_shards)
+
+    def _loaded_shards(self, shards: Optional[List[FAISSVectorStore]] = None) -> List[int]:
+        return [shard for shard, store in enumerate(self.shards if shards is None else shards) if store.index is not None]
+
+    @property
+    def index(self):
+        """Index of the first non-empty shard (None if every shard is empty)"""
+        loaded = self._loaded_shards()
+        return self.shards[loaded[0]].index if loaded else None
+
+    def needs_training(self) -> bool:
+        """Whether creating a shard of the configured spec requires a training pass"""
+        return self.shards[0].needs_training()
+
+    def create_index(self, documents: List[Document]) -> List[int]:
+        """
+        Create all shards from documents, building them in parallel
+
+        Args:
+            documents: List of Document objects to index
+
+        Returns:
+            Global ids assigned to the documents
+        """
+        if not documents:
+            raise ValueError("No documents provided for indexing")
+
+        print(f"Creating {self.num_shards}-shard FAISS index from {len(documents)} documents...")
+        vectors = self.embeddings.embed_documents([doc.page_content for doc in documents])
+        self.reset()
+        ids = self.add_embeddings(documents, vectors)
+        print("FAISS index created successfully")
+        return ids
+
+    def add_documents(self, documents: List[Document]) -> List[int]:
+        """
+        Add documents to their shards
+
+        Args:
+            documents: List of Document objects to add
+
+        Returns:
+            Global ids assigned to the documents
+        """
+        if not documents:
+            return []
+
+        print(f"Adding {len(documents)} documents to {self.num_shards}-shard index...")
+        vectors = self.embeddings.embed_documents([doc.page_content for doc in documents])
+        ids = self.add_embeddings(documents, vectors)
+        print("Documents added successfully")
+        return ids
+
+    def add_embeddings(self, documents: List[Document], vectors: List[List[float]]) -> List[int]:
+        """
+        Add documents with precomputed embeddings, creating shards as needed
+
+        Args:
+            documents: List of Document objects to add
+            vectors: Embedding vectors aligned with documents
+
+        Returns:
+            Global ids assigned to the documents
+        """
+        if not documents:
+            return []
+
+        # Positions of the documents of each shard, in input order
+        positions: Dict[int, List[int]] = {}
+        for position, doc in enumerate(documents):
+            positions.setdefault(self._shard_of(doc), []).append(position)
+
+        def add_to_shard(shard: int) -> List[int]:
+            shard_positions = positions[shard]
+            return self.shards[shard].add_embeddings([documents[p] for p in shard_positions],
+                                                     [vectors[p] for p in shard_positions])
+
+        shards = sorted(positions)
+        ids = [0] * len(documents)
+        for shard, local_ids in zip(shards, self._map(add_to_shard, shards)):
+            for position, local_id in zip(positions[shard], local_ids):
+                ids[position] = self._global_id(shard, local_id)
+        self._dirty.update(shards)
+        return ids
+
+    def delete(self, ids: List[int]) -> int:
+        """
+        Delete vectors and their chunks by global id
+
+        Args:
+            ids: Global ids to delete
+
+        Returns:
+            Number of vectors removed
+        """
+        by_shard: Dict[int, List[int]] = {}
+        for global_id in ids:
+            shard, local_id = self._local_id(global_id)
+            by_shard.setdefault(shard, []).append(local_id)
+
+        removed = 0
+        for shard, local_ids in by_shard.items():
+            if self.shards[shard].index is not None:
+                removed += self.shards[shard].delete(local_ids)
+                self._dirty.add(shard)
+        return removed
+
+    def delete_by_source(self, source: str) -> int:
+        """
+        Delete all chunks of one source document (only its shard is touched)
+
+        Args:
+            source: Source path as stored in the chunks' metadata
+
+        Returns:
+            Number of vectors removed
+        """
+        shard = shard_for_source(source, self.num_shards)
+        if self.shards[shard].index is None:
+            return 0
+        removed = self.shards[shard].delete_by_source(source)
+        if removed:
+            self._dirty.add(shard)
+        return removed
+
+    def upsert_documents(self, documents: List[Document]) -> List[int]:
+        """
+        Replace the chunks of the documents' sources with the given chunks
+
+        Args:
+            documents: New chunks, grouped into sources by their "source" metadata
+
+        Returns:
+            Global ids assigned to the documents
+        """
+        if not documents:
+            return []
+
+        vectors = self.embeddings.embed_documents([doc.page_content for doc in documents])
+        sources = list(dict.fromkeys(doc.metadata.get("source") for doc in documents))
+        removed = sum(self.delete_by_source(source) for source in sources if source is not None)
+        ids = self.add_embeddings(documents, vectors)
+        print(f"Upserted {len(sources)} sources: -{removed} / +{len(ids)} chunks")
+        return ids
+
+    def similarity_search(self,
+                          query: str,
+                          k: int = 5,
+                          score_threshold: Optional[float] = None,
+                          nprobe: Optional[int] = None,
+                          ef_search: Optional[int] = None,
+                          filter: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """
+        Perform similarity search over all shards
+
+        Args:
+            query: Search query
+            k: Number of results to return
+            score_threshold: Minimum similarity score (optional)
+            nprobe: IVF lists to visit per query (IVF indexes only)
+            ef_search: HNSW search beam width (HNSW indexes only)
+            filter: Only search chunks whose metadata matches (see FAISSVectorStore.similarity_search)
+
+        Returns:
+            List of similar documents
+        """
+        docs_and_scores = self.similarity_search_with_scores(query, k=k, nprobe=nprobe, ef_search=ef_search,
+                                                             filter=filter)
+        return [doc for doc, score in docs_and_scores if score_threshold is None or score >= score_threshold]
+
+    def similarity_search_with_scores(self,
+                                      query: str,
+                                      k: int = 5,
+                                      nprobe: Optional[int] = None,
+                                      ef_search: Optional[int] = None,
+                                      filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
+        """
+        Perform similarity search over all shards with scores
+
+        Returns:
+            List of (document, score) tuples, score being the L2 distance
+        """
+        query_vector = self.embeddings.embed_query(query)
+        return self.batch_similarity_search_by_vectors([query_vector], k=k, nprobe=nprobe, ef_search=ef_search,
+                                                       filter=filter)[0]
+
+    def batch_similarity_search(self,
+                                queries: List[str],
+                                k: int = 5,
+                                nprobe: Optional[int] = None,
+                                ef_search: Optional[int] = None,
+                                filter: Optional[Dict[str, Any]] = None) -> List[List[Tuple[Document, float]]]:
+        """
+        Perform similarity search for many queries over all shards
+
+        Returns:
+            One list of (document, score) tuples per query, in query order
+        """
+        if not queries:
+            return []
+        query_vectors = embed_queries(self.embeddings, queries)
+        return self.batch_similarity_search_by_vectors(query_vectors, k=k, nprobe=nprobe, ef_search=ef_search,
+                                                       filter=filter)
+
+    def batch_similarity_search_by_vectors(self,
+                                           query_vectors: List[List[float]],
+                                           k: int = 5,
+                                           nprobe: Optional[int] = None,
+                                           ef_search: Optional[int] = None,
+                                           filter: Optional[Dict[str, Any]] = None
+                                           ) -> List[List[Tuple[Document, float]]]:
+        """
+        Search every shard for already embedded queries and merge the top k
+
+        Returns:
+            One list of (document, score) tuples per query, score being the L2 distance
+        """
+        self._check_loaded()
+        # Read once: a reload swaps in a new shard list meanwhile
+        shards = self.shards
+
+        def search_shard(shard: int) -> List[List[Tuple[Document, float]]]:
+            return shards[shard].batch_similarity_search_by_vectors(
+                query_vectors, k=k, nprobe=nprobe, ef_search=ef_search, filter=filter
+            )
+
+        per_shard = self._map(search_shard, self._loaded_shards(shards))
+        # Smallest distances first across shards
+        return [heapq.nsmallest(k, (hit for shard_rows in per_shard for hit in shard_rows[row]),
+                                key=lambda hit: hit[1])
+                for row in range(len(query_vectors))]
+
+    def keyword_search(self,
+                       query: str,
+                       k: int = 5,
+                       filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
+        """
+        Perform BM25 keyword search over all shards
+
+        BM25 statistics are per shard; with sources spread evenly by hash they
+        are close enough for the scores to be merged directly.
+
+        Returns:
+            List of (document, score) tuples, score being the BM25 score (higher is better)
+        """
+        self._check_loaded()
+        shards = self.shards
+        per_shard = self._map(lambda shard: shards[shard].keyword_search(query, k=k, filter=filter),
+                              self._loaded_shards(shards))
+        return heapq.nlargest(k, (hit for hits in per_shard for hit in hits), key=lambda hit: hit[1])
+
+    def hybrid_search(self,
+                      query: str,
+                      k: int = 5,
+                      nprobe: Optional[int] = None,
+                      ef_search: Optional[int] = None,
+                      candidates: int = HYBRID_CANDIDATES,
+                      rrf_k: int = DEFAULT_RRF_K,
+                      filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
+        """
+        Perform hybrid search over all shards (see FAISSVectorStore.hybrid_search)
+
+        Returns:
+            List of (document, score) tuples, score being the fused RRF score (higher is better)
+        """
+        query_vector = self.embeddings.embed_query(query)
+        return self._fuse([query], [query_vector], k, nprobe, ef_search, candidates, rrf_k, filter)[0]
+
+    def batch_hybrid_search(self,
+                            queries: List[str],
+                            k: int = 5,
+                            nprobe: Optional[int] = None,
+                            ef_search: Optional[int] = None,
+                            candidates: int = HYBRID_CANDIDATES,
+                            rrf_k: int = DEFAULT_RRF_K,
+                            filter: Optional[Dict[str, Any]] = None) -> List[List[Tuple[Document, float]]]:
+        """
+        Perform hybrid search for many queries over all shards
+
+        Returns:
+            One list of (document, score) tuples per query, in query order
+        """
+        if not queries:
+            return []
+        query_vectors = embed_queries(self.embeddings, queries)
+        return self._fuse(queries, query_vectors, k, nprobe, ef_search, candidates, rrf_k, filter)
+
+    def _fuse(self,
+              queries: List[str],
+              query_vectors: List[List[float]],
+              k: int,
+              nprobe: Optional[int],
+              ef_search: Optional[int],
+              candidates: int,
+              rrf_k: int,
+              filter: Optional[Dict[str, Any]]) -> List[List[Tuple[Document, float]]]:
+        """Merge each retriever's candidates across shards, then fuse the global rankings"""
+        self._check_loaded()
+        candidates = max(candidates, k)
+        query_matrix = np.asarray(query_vectors, dtype=np.float32).reshape(len(query_vectors), -1)
+
+        # Search and hydrate each shard from one snapshot, even if it is reloaded meanwhile
+        shards = self.shards
+        states = {shard: shards[shard].snapshot() for shard in self._loaded_shards(shards)}
+
+        def search_shard(shard: int) -> Tuple[np.ndarray, np.ndarray, List[List[Tuple[int, float]]]]:
+            state = states[shard]
+            distances, ids = shards[shard].search_vectors(query_matrix, k=candidates, nprobe=nprobe,
+                                                          ef_search=ef_search, filter=filter, state=state)
+            keyword_hits = [state.chunk_store.keyword_search(query, k=candidates, filter=filter)
+                            for query in queries]
+            return distances, ids, keyword_hits
+
+        per_shard = dict(zip(states, self._map(search_shard, list(states))))
+
+        fused_rows = []
+        for row, query in enumerate(queries):
+            vector_hits = [(float(d), self._global_id(shard, i))
+                           for shard, (distances, ids, _) in per_shard.items()
+                           for d, i in zip(distances[row], ids[row]) if i != -1]
+            keyword_hits = [(score, self._global_id(shard, i))
+                            for shard, (_, _, hits) in per_shard.items() for i, score in hits[row]]
+            vector_ranking = [global_id for _, global_id in heapq.nsmallest(candidates, vector_hits)]
+            keyword_ranking = [global_id for _, global_id in heapq.nlargest(candidates, keyword_hits)]
+            fused = reciprocal_rank_fusion([vector_ranking, keyword_ranking], rrf_k=rrf_k)
+            fused_rows.append(list(fused.items())[:k])
+
+        documents = self._get([global_id for row in fused_rows for global_id, _ in row], states)
+        return [[(documents[global_id], score) for global_id, score in row if global_id in documents]
+                for row in fused_rows]
+
+    def _get(self, ids: List[int], states: Dict[int, IndexState]) -> Dict[int, Document]:
+        """Hydrate documents by global id from the chunk stores of their shards' snapshots"""
+        by_shard: Dict[int, List[int]] = {}
+        for global_id in ids:
+            shard, local_id = self._local_id(global_id)
+            by_shard.setdefault(shard, []).append(local_id)
+
+        documents = {}
+        for shard, local_ids in by_shard.items():
+            for local_id, doc in states[shard].chunk_store.get(local_ids).items():
+                documents[self._global_id(shard, local_id)] = doc
+        return documents
+
+    def _check_loaded(self) -> None:
+        if not self._loaded_shards():
+            raise ValueError("Vector store not initialized. Create or load an index first.")
+
+    def save_index(self, path: Optional[str] = None) -> None:
+        """
+        Save the shards modified since they were loaded or last saved
+
+        Each modified shard writes a new snapshot version, so an update that
+        touches a few sources only rewrites the shards holding them. The new
+        versions go live together when SHARDS.json, listing the version of
+        every shard, is replaced in one atomic rename.
+
+        Args:
+            path: Directory to save to (optional, uses default if not provided;
+                a different directory receives every shard)
+        """
+        self._check_loaded()
+        save_path = path or self.index_path
+        os.makedirs(save_path, exist_ok=True)
+
+        same_path = os.path.abspath(save_path) == os.path.abspath(self.index_path)
+        shards = [shard for shard in self._loaded_shards() if not same_path or shard in self._dirty]
+        print(f"Saving {len(shards)} of {self.num_shards} shards to {save_path}...")
+        self._map(lambda shard: self.shards[shard].save_index(self.shard_path(save_path, shard), publish=False),
+                  shards)
+
+        # Publish all shard versions at once
+        previous = read_shard_config(save_path) or {}
+        version = max(previous.get("version") or 0, self.version or 0) + 1
+        shard_versions = [store.version if store.index is not None else None for store in self.shards]
+        write_file_atomic(os.path.join(save_path, SHARDS_FILE),
+                          json.dumps({"num_shards": self.num_shards, "partition": "source-crc32",
+                                      "index_spec": self.index_spec, "version": version,
+                                      "shard_versions": shard_versions}, indent=2))
+        self.version = version
+
+        for shard in shards:
+            shard_root = self.shard_path(save_path, shard)
+            # Shard CURRENT files of the layout before SHARDS.json listed the versions are superseded
+            if os.path.exists(os.path.join(shard_root, CURRENT_FILE)):
+                os.remove(os.path.join(shard_root, CURRENT_FILE))
+            prune_versions(shard_root, self.keep_versions, pinned=[shard_versions[shard]])
+        # Shards emptied by a rebuild must not resurface from their old files on the next load
+        for shard in range(self.num_shards):
+            if self.shards[shard].index is None and (not same_path or shard in self._dirty):
+                shutil.rmtree(self.shard_path(save_path, shard), ignore_errors=True)
+        if same_path:
+            self._dirty.clear()
+        print(f"Sharded index saved successfully (version {version})")
+
+    def load_index(self, path: Optional[str] = None, mmap: bool = False) -> None:
+        """
+        Load all shards in parallel
+
+        Args:
+            path: Directory of the sharded index (optional, uses default if not provided)
+            mmap: Memory-map the shard indexes instead of reading them into RAM
+        """
+        load_path = path or self.index_path
+        config = read_shard_config(load_path)
+        if config is None:
+            raise FileNotFoundError(f"Sharded index not found at {load_path}")
+        if config["num_shards"] != self.num_shards:
+            raise ValueError(f"Index at {load_path} has {config['num_shards']} shards, "
+                             f"this store was opened with {self.num_shards}")
+
+        self.reset()
+        self.index_path = load_path
+        self.index_spec = config.get("index_spec", self.index_spec)
+        self.shards = [self._new_shard(load_path, shard) for shard in range(self.num_shards)]
+        shard_versions = config.get("shard_versions")
+
+        def load_shard(shard: int) -> None:
+            if shard_versions is None:
+                # Layout before SHARDS.json listed the versions: each shard has its own CURRENT
+                if os.path.isdir(self.shard_path(load_path, shard)):
+                    self.shards[shard].load_index(mmap=mmap)
+            elif shard_versions[shard] is not None:
+                # Shards that never received a chunk have nothing saved
+                self.shards[shard].load_index(mmap=mmap, version=shard_versions[shard])
+
+        self._map(load_shard, list(range(self.num_shards)))
+        self._dirty.clear()
+        self.version = config.get("version")
+        self.mmap_loaded = mmap
+        print(f"Loaded {len(self._loaded_shards())} of {self.num_shards} shards"
+              f"{f' (version {self.version})' if self.version else ''}")
+
+    def reload_if_changed(self) -> bool:
+        """
+        Switch to the shard versions of a newer published SHARDS.json
+
+        The changed shards are loaded completely, then the whole shard list is
+        replaced at once, so concurrent searches see either every old or every
+        new shard version.
+
+        Returns:
+            True if a new version was loaded
+        """
+        config = read_shard_config(self.index_path)
+        if config is None or config.get("version") is None or config["version"] == self.version:
+            return False
+        if config["num_shards"] != self.num_shards:
+            raise ValueError(f"Index at {self.index_path} now has {config['num_shards']} shards, "
+                             f"this store was opened with {self.num_shards}")
+
+        shard_versions = config["shard_versions"]
+        shards = list(self.shards)
+        changed = [shard for shard in range(self.num_shards) if shard_versions[shard] != shards[shard].version]
+
+        def load_shard(shard: int) -> FAISSVectorStore:
+            store = self._new_shard(self.index_path, shard)
+            if shard_versions[shard] is not None:
+                store.load_index(mmap=self.mmap_loaded, version=shard_versions[shard])
+            return store
+
+        for shard, store in zip(changed, self._map(load_shard, changed)):
+            shards[shard] = store
+        # One reference assignment; replaced shards' chunk stores are left to in-flight searches
+        self.shards = shards
+        previous, self.version = self.version, config["version"]
+        print(f"🔄 Reloaded {len(changed)} of {self.num_shards} shards (version {self.version}, was {previous})")
+        return True
+
+    def get_document_count(self) -> int:
+        """Get the number of documents across all shards"""
+        return sum(store.get_document_count() for store in self.shards)
+
+    def reset(self) -> None:
+        """Drop every in-memory shard (files on disk are kept)"""
+        for store in self.shards:
+            store.reset()
+        self._dirty = set(range(self.num_shards))
+
+    def delete_index(self, path: Optional[str] = None) -> None:
+        """
+        Delete all shard directories and the shard configuration
+
+        Args:
+            path: Directory of the sharded index (optional, uses default if not provided)
+        """
+        delete_path = path or self.index_path
+        for shard, store in enumerate(self.shards):
+            store.delete_index(self.shard_path(delete_path, shard))
+            shutil.rmtree(self.shard_path(delete_path, shard), ignore_errors=True)
+        config_file = os.path.join(delete_path, SHARDS_FILE)
+        if os.path.exists(config_file):
+            os.remove(config_file)
+        self.version = None
+        print("Sharded index deleted successfully")
+
+    def get_index_info(self) -> Dict[str, Any]:
+        """Get information about the sharded index"""
+        loaded = self._loaded_shards()
+        return {
+            "status": "Index loaded" if loaded else "No index loaded",
+            "document_count": self.get_document_count(),
+            "embedding_dimension": self.shards[loaded[0]].index.d if loaded else self.embedding_dimension,
+            "index_path": self.index_path,
+            "index_spec": self.index_spec,
+            "memory_mapped": any(store.mmap_loaded for store in self.shards),
+            "rerank_factor": self.shards[loaded[0]].get_index_info()["rerank_factor"] if loaded else None,
+            "version": self.version,
+            "num_shards": self.num_shards,
+            "shards": [{"document_count": store.get_document_count(), "version": store.version}
+                       for store in self.shards],
+        }
@@ -0,0 +1,194 @@
+"""
+Versioned, atomically published index snapshots
+
+An index directory holds immutable snapshot directories and a CURRENT file
+naming the live one:
+
+    faiss_index/
+        CURRENT                  "v000042"
+        versions/v000041/        index.faiss, chunks.sqlite, MANIFEST.json
+        versions/v000042/
+
+A snapshot is written completely into a temporary directory, fsynced and
+renamed into versions/; only then is CURRENT replaced by an atomic rename.
+Readers that resolve CURRENT therefore always see a complete index/chunk
+store pair, and a crash mid-save leaves the previous version live.
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+CURRENT_FILE = "CURRENT"
+VERSIONS_DIR = "versions"
+MANIFEST_FILE = "MANIFEST.json"
+
+# Most recent snapshots retained on disk (INDEX_KEEP_VERSIONS)
+DEFAULT_KEEP_VERSIONS = 3
+
+# Leftover temporary directories older than this are from crashed saves
+STALE_TMP_SECONDS = 60 * 60
+
+_VERSION_RE = re.compile(r"^v(\d+)$")
+
+
+def _fsync_path(path: str) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def read_current(root: str) -> Optional[str]:
+    """Return the live version name of an index directory, or None for the flat (unversioned) layout"""
+    try:
+        with open(os.path.join(root, CURRENT_FILE), "r", encoding="utf-8") as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return version or None
+
+
+def snapshot_path(root: str, version: str) -> str:
+    """Directory of one snapshot version"""
+    return os.path.join(root, VERSIONS_DIR, version)
+
+
+def list_versions(root: str) -> List[str]:
+    """Snapshot version names of an index directory, oldest first"""
+    versions_dir = os.path.join(root, VERSIONS_DIR)
+    if not os.path.isdir(versions_dir):
+        return []
+    names = [name for name in os.listdir(versions_dir) if _VERSION_RE.match(name)]
+    return sorted(names, key=lambda name: int(_VERSION_RE.match(name).group(1)))
+
+
+def write_file_atomic(path: str, content: str) -> None:
+    """Replace a small file in one atomic rename, durable once this returns"""
+    directory, name = os.path.split(os.path.abspath(path))
+    tmp_path = os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_path(directory)
+
+
+def read_manifest(root: str, version: str) -> Dict[str, Any]:
+    """Read the manifest of a snapshot version"""
+    with open(os.path.join(snapshot_path(root, version), MANIFEST_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_snapshot(root: str, write_files: Callable[[str], None], manifest: Dict[str, Any]) -> str:
+    """
+    Write a new, complete snapshot version without making it live
+
+    Args:
+        root: Index directory
+        write_files: Writes the snapshot's files into the directory it is given
+        manifest: Descriptive fields stored in MANIFEST.json
+
+    Returns:
+        Name of the written version
+    """
+    versions_dir = os.path.join(root, VERSIONS_DIR)
+    os.makedirs(versions_dir, exist_ok=True)
+
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=versions_dir)
+    try:
+        write_files(tmp_dir)
+        files = {name: os.path.getsize(os.path.join(tmp_dir, name)) for name in sorted(os.listdir(tmp_dir))}
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(dict(manifest, created_at=time.time(), files=files), f, indent=2)
+        for name in os.listdir(tmp_dir):
+            _fsync_path(os.path.join(tmp_dir, name))
+        _fsync_path(tmp_dir)
+
+        # Claim the next version number; a concurrent writer may take it first
+        existing = list_versions(root)
+        number = int(_VERSION_RE.match(existing[-1]).group(1)) + 1 if existing else 1
+        while True:
+            version = f"v{number:06d}"
+            try:
+                os.rename(tmp_dir, os.path.join(versions_dir, version))
+                break
+            except OSError:
+                if not os.path.exists(os.path.join(versions_dir, version)):
+                    raise
+                number += 1
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    _fsync_path(versions_dir)
+    return version
+
+
+def publish_snapshot(root: str,
+                     write_files: Callable[[str], None],
+                     manifest: Dict[str, Any],
+                     keep_versions: Optional[int] = None) -> str:
+    """
+    Write a new snapshot and make it the live version
+
+    Args:
+        root: Index directory
+        write_files: Writes the snapshot's files into the directory it is given
+        manifest: Descriptive fields stored in MANIFEST.json
+        keep_versions: Snapshots to retain (default: INDEX_KEEP_VERSIONS or 3)
+
+    Returns:
+        Name of the published version
+    """
+    version = write_snapshot(root, write_files, manifest)
+    # Atomic pointer swap
+    write_file_atomic(os.path.join(root, CURRENT_FILE), version + "\n")
+    prune_versions(root, keep_versions)
+    return version
+
+
+def prune_versions(root: str,
+                   keep_versions: Optional[int] = None,
+                   pinned: Iterable[str] = ()) -> List[str]:
+    """
+    Delete old snapshots beyond the retention count and leftovers of crashed saves
+
+    The live version is never deleted. Readers that still have an older
+    snapshot open keep working: its files stay readable until closed.
+
+    Args:
+        root: Index directory
+        keep_versions: Snapshots to retain (default: INDEX_KEEP_VERSIONS or 3)
+        pinned: Versions live elsewhere (e.g. in a sharded index's SHARDS.json), never deleted
+
+    Returns:
+        Names of the deleted versions
+    """
+    if keep_versions is None:
+        keep_versions = int(os.getenv("INDEX_KEEP_VERSIONS", DEFAULT_KEEP_VERSIONS))
+    keep_versions = max(1, keep_versions)
+
+    current = read_current(root)
+    versions = list_versions(root)
+    retained = set(versions[-keep_versions:]) | set(pinned)
+    if current:
+        retained.add(current)
+
+    deleted = []
+    for version in versions:
+        if version not in retained:
+            shutil.rmtree(snapshot_path(root, version), ignore_errors=True)
+            deleted.append(version)
+
+    versions_dir = os.path.join(root, VERSIONS_DIR)
+    for name in os.listdir(versions_dir) if os.path.isdir(versions_dir) else []:
+        path = os.path.join(versions_dir, name)
+        if name.startswith(".tmp-") and time.time() - os.path.getmtime(path) > STALE_TMP_SECONDS:
+            shutil.rmtree(path, ignore_errors=True)
+    return deleted
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test the async embedding engine against a local stub Azure OpenAI server
+
+The stub answers the embeddings endpoint with deterministic vectors and
+enforces its own requests-per-second limit, returning 429 with Retry-After
+when it is exceeded, so throttling and backoff can be exercised offline.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from rag_poc.embedding.async_embedding_engine import AsyncEmbeddingEngine
+
+DIMENSION = 8
+
+
+def fake_vector(text: str) -> list:
+    """Deterministic vector derived from the text"""
+    return [float((hash(text) >> shift) & 0xFF) for shift in range(0, DIMENSION * 8, 8)]
+
+
+class StubState:
+    """Shared counters of the stub server"""
+
+    def __init__(self, requests_per_second: int, latency: float):
+        self.requests_per_second = requests_per_second
+        self.latency = latency
+        self.recent = deque()
+        self.lock = threading.Lock()
+        self.served = 0
+        self.throttled = 0
+        self.max_in_flight = 0
+        self.in_flight = 0
+
+
+def make_handler(state: StubState):
+    class StubHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            now = time.monotonic()
+
+            with state.lock:
+                while state.recent and now - state.recent[0] >= 1.0:
+                    state.recent.popleft()
+                if len(state.recent) >= state.requests_per_second:
+                    state.throttled += 1
+                    retry_after = 1.0 - (now - state.recent[0])
+                    self.send_response(429)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('retry-after-ms', str(int(retry_after * 1000) + 1))
+                    self.end_headers()
+                    self.wfile.write(b'{"error": {"code": "429", "message": "Rate limit exceeded"}}')
+                    return
+                state.recent.append(now)
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+
+            time.sleep(state.latency)
+            inputs = body['input']
+            payload = {
+                "object": "list",
+                "model": body.get('model', 'stub'),
+                "data": [{"object": "embedding", "index": i, "embedding": fake_vector(text)}
+                         for i, text in enumerate(inputs)],
+                "usage": {"prompt_tokens": 0, "total_tokens": 0},
+            }
+
+            with state.lock:
+                state.in_flight -= 1
+                state.served += 1
+
+            data = json.dumps(payload).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return StubHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exercise AsyncEmbeddingEngine against a rate-limited stub")
+    parser.add_argument('--texts', type=int, default=2000, help='Number of texts to embed (default: 2000)')
+    parser.add_argument('--concurrency', type=int, default=16, help='Engine concurrency (default: 16)')
+    parser.add_argument('--batch-tokens', type=int, default=2000, help='Token budget per request (default: 2000)')
+    parser.add_argument('--server-rps', type=int, default=20, help='Stub requests/second before 429 (default: 20)')
+    parser.add_argument('--latency', type=float, default=0.05, help='Stub latency per request (default: 0.05s)')
+    args = parser.parse_args()
+
+    state = StubState(args.server_rps, args.latency)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"🧪 Stub Azure OpenAI server on {endpoint} ({args.server_rps} req/s limit)")
+
+    texts = [f"chunk {i}: " + "delivery pipeline maturity " * (i % 40 + 1) for i in range(args.texts)]
+    engine = AsyncEmbeddingEngine(
+        api_key="stub-key",
+        azure_endpoint=endpoint,
+        api_version="2024-02-15-preview",
+        deployment_name="stub-embedding",
+        max_concurrency=args.concurrency,
+        max_batch_tokens=args.batch_tokens,
+    )
+
+    try:
+        vectors = engine.embed(texts)
+    finally:
+        server.shutdown()
+
+    stats = engine.get_stats()
+    ordered = all(vector == fake_vector(text) for text, vector in zip(texts, vectors))
+
+    print(f"  Texts embedded:    {len(vectors)} ({'✅ in order' if ordered else '❌ order mismatch'})")
+    print(f"  Requests:          {stats['requests']} ok, {state.throttled} throttled (429)")
+    print(f"  Retries:           {stats['retries']}")
+    print(f"  Max in flight:     {state.max_in_flight}")
+    print(f"  Elapsed:           {stats['elapsed_seconds']:.2f}s "
+          f"({stats['requests'] / max(stats['elapsed_seconds'], 1e-9):.1f} req/s)")
+
+    if not ordered or len(vectors) != len(texts):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
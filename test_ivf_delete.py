@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test deletes on IVF indexes
+
+Chunks are deleted from IVF indexes one or more times and the top-k ids of
+searches are compared with an exhaustive search over the remaining vectors,
+in the same session and after save and reload. IVF lists are all probed,
+so an IVF,Flat index must return exactly the exhaustive top k and quantised
+IVF indexes must at least find each query's own vector first.
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from langchain.schema import Document
+
+from rag_poc.vectorstore.faiss_store import FAISSVectorStore
+
+
+def check_searches(store: FAISSVectorStore, vectors: np.ndarray, alive: np.ndarray, k: int,
+                   nlist: int, exact: bool) -> int:
+    """Search every remaining vector and count the queries whose top k is wrong"""
+    rows = np.flatnonzero(alive)
+    queries = vectors[rows]
+    results = store.batch_similarity_search_by_vectors(queries, k=k, nprobe=nlist)
+    _, positions = faiss.knn(queries, vectors[rows], k)
+
+    wrong = 0
+    for row, hits, true_positions in zip(rows, results, positions):
+        found = [doc.metadata["row"] for doc, _ in hits]
+        if any(not alive[r] for r in found) or not found or found[0] != row:
+            wrong += 1
+        elif exact and set(found) != set(rows[true_positions].tolist()):
+            wrong += 1
+    return wrong
+
+
+def run_spec(spec: str, vectors: np.ndarray, deletes: int, k: int) -> bool:
+    """Delete from an index of one spec several times, checking searches after each step"""
+    nlist = faiss.try_extract_index_ivf(faiss.index_factory(vectors.shape[1], spec)).nlist
+    exact = spec.endswith(",Flat")
+    work_dir = tempfile.mkdtemp(prefix="ivf-delete-")
+    index_path = str(Path(work_dir) / "index")
+    documents = [Document(page_content=f"row {i}", metadata={"row": i, "source": f"doc-{i % 20}"})
+                 for i in range(len(vectors))]
+    alive = np.ones(len(vectors), dtype=bool)
+    ok = True
+
+    try:
+        store = FAISSVectorStore(embeddings=None, index_path=index_path, index_spec=spec)
+        ids = np.asarray(store.add_embeddings(documents, vectors))
+        rng = np.random.default_rng(0)
+
+        for step in range(1, deletes + 1):
+            victims = rng.choice(np.flatnonzero(alive), len(vectors) // 10, replace=False)
+            removed = store.delete(ids[victims].tolist())
+            alive[victims] = False
+
+            wrong = check_searches(store, vectors, alive, k, nlist, exact)
+            store.save_index()
+            reloaded = FAISSVectorStore(embeddings=None, index_path=index_path)
+            reloaded.load_index()
+            wrong_reloaded = check_searches(reloaded, vectors, alive, k, nlist, exact)
+
+            passed = removed == len(victims) and wrong == 0 and wrong_reloaded == 0
+            ok = ok and passed
+            print(f"  {'✅' if passed else '❌'} {spec} delete {step}: removed {removed}/{len(victims)}, "
+                  f"wrong top-{k} {wrong} (reloaded: {wrong_reloaded}) of {alive.sum()} queries")
+            reloaded.reset()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check search results after deletes on IVF indexes")
+    parser.add_argument('-n', '--count', type=int, default=2000, help='Vectors (default: 2000)')
+    parser.add_argument('-d', '--dimension', type=int, default=32, help='Dimension (default: 32)')
+    parser.add_argument('--deletes', type=int, default=2, help='Successive deletes (default: 2)')
+    parser.add_argument('-k', type=int, default=5, help='Results per query (default: 5)')
+    parser.add_argument('--specs', default="IVF16,Flat;IVF16,PQ8",
+                        help='Index types separated by ";" (default: "IVF16,Flat;IVF16,PQ8")')
+    args = parser.parse_args()
+
+    vectors = np.random.default_rng(1).standard_normal((args.count, args.dimension)).astype(np.float32)
+    print(f"🧪 Deleting 10% of {args.count} vectors {args.deletes} times")
+    results = [run_spec(spec, vectors, args.deletes, args.k) for spec in args.specs.split(";")]
+
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()